@@ -89,6 +89,7 @@ from .results.bench_result import BenchResult
 from .results.video_result import VideoResult
 from .results.holoview_results.holoview_result import ReduceType, HoloviewResult
 from .bench_report import BenchReport, GithubPagesCfg
-from .job import Executors
+from .job import Executors, ExecutorPool
+from .cache_backend import CacheBackends
 from .video_writer import VideoWriter, add_image
 from .class_enum import ClassEnum, ExampleEnum
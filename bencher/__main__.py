@@ -0,0 +1,3 @@
+from bencher.storage_manager import main
+
+main()
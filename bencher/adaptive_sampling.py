@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import List
+
+import numpy as np
+import xarray as xr
+
+
+def interval_scores(data: np.ndarray) -> np.ndarray:
+    """Score how much the results change across each interval between adjacent samples.
+
+    The score of an interval is the change of the result across it plus the largest change of
+    slope at either end, both relative to the range of the result.  The scores of the other
+    dimensions are combined by taking the maximum.
+
+    Args:
+        data (np.ndarray): The results, with the refined dimension as the first axis
+
+    Returns:
+        np.ndarray: The score of each of the len(data) - 1 intervals
+    """
+    data = data.reshape(len(data), -1)
+    span = np.nanmax(data) - np.nanmin(data) if np.isfinite(data).any() else 0.0
+    if len(data) < 2 or not span > 0:
+        return np.zeros(max(len(data) - 1, 0))
+    change = np.diff(data, axis=0) / span
+    curvature = np.zeros_like(change)
+    if len(change) > 1:
+        bend = np.abs(np.diff(change, axis=0))
+        curvature[:-1] = bend
+        curvature[1:] = np.fmax(curvature[1:], bend)
+    scores = np.nan_to_num(np.abs(change) + curvature)
+    return scores.max(axis=1)
+
+
+def refine_values(
+    ds: xr.Dataset,
+    dim: str,
+    result_names: List[str],
+    max_samples: int,
+    tolerance: float,
+) -> List[float] | None:
+    """Bisect the intervals of a float dimension where the results change the most.
+
+    Up to half of the intervals are bisected, highest score first, as long as their score is above
+    tolerance and the dimension has fewer than max_samples values.
+
+    Args:
+        ds (xr.Dataset): The results of the current sweep
+        dim (str): The name of the dimension to refine
+        result_names (List[str]): The result variables used to score the intervals
+        max_samples (int): The maximum number of values of the dimension
+        tolerance (float): Intervals scoring at or below this are not bisected
+
+    Returns:
+        List[float] | None: The refined values of the dimension, or None if none were added
+    """
+    values = np.asarray(ds.coords[dim].values, dtype=float)
+    budget = min(max_samples - len(values), max(1, (len(values) - 1) // 2))
+    if budget <= 0 or len(values) < 2:
+        return None
+    scores = np.zeros(len(values) - 1)
+    for name in result_names:
+        data = ds[name]
+        if "repeat" in data.dims:
+            data = data.mean("repeat")
+        data = data.transpose(dim, ...).values.astype(float)
+        scores = np.fmax(scores, interval_scores(data))
+    chosen = [i for i in np.argsort(-scores, kind="stable")[:budget] if scores[i] > tolerance]
+    if not chosen:
+        return None
+    midpoints = [(values[i] + values[i + 1]) / 2 for i in chosen]
+    return sorted(values.tolist() + midpoints)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+from collections import Counter
+from contextlib import suppress
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List
+import logging
+import os
+import shutil
+
+import numpy as np
+import xarray as xr
+
+from bencher.result_store import StoredDataset, StoredResult
+
+# the artifacts are stored next to the caches in cachedir
+ARTIFACT_DIR = "cachedir/artifacts"
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hash the contents of a file.
+
+    Args:
+        path (str): The path of the file
+        chunk_size (int, optional): The number of bytes read at a time. Defaults to 1MB.
+
+    Returns:
+        str: The hex digest of the contents
+    """
+    digest = blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """A content addressed store for the files that workers return as ResultPath, ResultImage and
+    ResultVideo results.
+
+    Each file is moved to a path named after the hash of its contents, so identical outputs of
+    different repeats and runs are stored once and the path that is cached for a result stays
+    valid for as long as a cached result refers to it.  Artifacts are reference counted by
+    scanning the values of the caches, and collect() deletes the artifacts that no cached result
+    refers to any more, for example after the caches evicted old results to stay within their size
+    limits.
+
+    Only the files that workers write next to the store, such as the files of gen_path in
+    cachedir, are moved into it.  Other files, for example a static asset a worker returns on every
+    call, are left where they are.
+
+    Attributes:
+        directory (str): The absolute path of the directory the artifacts are stored in
+        root (str): The absolute path of the directory whose files are moved into the store
+    """
+
+    def __init__(self, directory: str = ARTIFACT_DIR) -> None:
+        self.directory = Path(directory).absolute().as_posix()
+        self.root = Path(directory).absolute().parent.as_posix()
+
+    def artifact_path(self, digest: str, suffix: str) -> str:
+        """Get the path an artifact with the given contents is stored at.
+
+        Args:
+            digest (str): The hash of the contents
+            suffix (str): The file extension, such as ".png"
+
+        Returns:
+            str: The absolute path of the artifact
+        """
+        return f"{self.directory}/{digest[:2]}/{digest}{suffix}"
+
+    def put(self, path: str) -> str:
+        """Move a file into the store, or delete it if the store already has the same contents.
+
+        Args:
+            path (str): The path of the file written by a worker
+
+        Returns:
+            str: The path of the stored artifact, or path if the file is not under root
+        """
+        absolute = Path(path).absolute().as_posix()
+        if (
+            not os.path.isfile(path)
+            or not absolute.startswith(self.root + "/")
+            or absolute.startswith(self.directory + "/")
+        ):
+            return path
+        stored = self.artifact_path(hash_file(path), Path(path).suffix)
+        if os.path.exists(stored):
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(stored), exist_ok=True)
+            shutil.move(path, stored)
+        return stored
+
+    def put_results(self, results: dict, names: Iterable[str]) -> dict:
+        """Move the files of the named results of a worker into the store.
+
+        Args:
+            results (dict): The results returned by a worker
+            names (Iterable[str]): The names of the results that are paths to files
+
+        Returns:
+            dict: The results with the paths replaced by the paths of the stored artifacts
+        """
+        for name in names:
+            if isinstance(results.get(name), str):
+                results[name] = self.put(results[name])
+        return results
+
+    def paths(self) -> Iterator[str]:
+        """Iterate over the stored artifacts.
+
+        Yields:
+            str: The absolute path of each artifact
+        """
+        if os.path.isdir(self.directory):
+            for entry in sorted(Path(self.directory).glob("*/*")):
+                yield entry.as_posix()
+
+    def volume(self) -> int:
+        """Get the total size of the stored artifacts.
+
+        Returns:
+            int: The size in bytes
+        """
+        return sum(os.path.getsize(path) for path in self.paths())
+
+    def count_references(self, values: Iterable[Any], directories: List[str] = None) -> Counter:
+        """Count the references to stored artifacts in cached values.
+
+        Strings, containers, numpy arrays, datasets, and results and datasets stored by
+        result_store are searched.
+
+        Args:
+            values (Iterable[Any]): The cached values
+            directories (List[str], optional): Count the references to the files in these
+                directories instead of the artifacts. Defaults to None.
+
+        Returns:
+            Counter: The number of references to each file, by absolute path
+        """
+        references = Counter()
+        if directories is None:
+            directories = [self.directory]
+        prefixes = tuple(Path(d).absolute().as_posix() + "/" for d in directories)
+
+        def visit(value: Any) -> None:
+            if isinstance(value, str):
+                if value.startswith(prefixes):
+                    references[value] += 1
+            elif isinstance(value, dict):
+                for item in value.values():
+                    visit(item)
+            elif isinstance(value, (list, tuple, set)):
+                for item in value:
+                    visit(item)
+            elif isinstance(value, np.ndarray):
+                if value.dtype.kind in "OU":
+                    for item in value.flat:
+                        visit(item)
+            elif isinstance(value, xr.Dataset):
+                for var in value.data_vars.values():
+                    if var.dtype.kind in "OU":
+                        visit(var.values)
+            elif isinstance(value, StoredResult):
+                visit(value.dataset)
+            elif isinstance(value, StoredDataset):
+                visit(Path(value.path).absolute().as_posix())
+                ds = value.load()
+                if ds is not None:
+                    visit(ds)
+                    ds.close()
+            elif isinstance(getattr(value, "ds", None), xr.Dataset):
+                visit(value.ds)
+
+        for value in values:
+            visit(value)
+        return references
+
+    def collect(self, references: Counter) -> int:
+        """Delete the artifacts that are not referred to.
+
+        Args:
+            references (Counter): The number of references to each artifact path
+
+        Returns:
+            int: The number of bytes that were freed
+        """
+        freed = 0
+        for path in self.paths():
+            if references[path] == 0:
+                freed += os.path.getsize(path)
+                with suppress(FileNotFoundError):
+                    os.remove(path)
+        logging.info(f"deleted {freed} bytes of unreferenced artifacts")
+        return freed
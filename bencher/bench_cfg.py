@@ -14,6 +14,7 @@ from bencher.variables.sweep_base import hash_sha1, describe_variable
 from bencher.variables.time import TimeSnapshot, TimeEvent
 from bencher.variables.results import OptDir
 from bencher.job import Executors
+from bencher.cache_backend import CacheBackends
 from bencher.results.laxtex_result import to_latex
 
 T = TypeVar("T")  # Generic type variable
@@ -60,6 +61,7 @@ class BenchRunCfg(BenchPlotSrvCfg):
         print_bench_results (bool): Print the results of the benchmark function
                                    every time it is called
         clear_history (bool): Clear historical results
+        history_max_runs (int): Maximum number of runs kept in the over_time history
         print_pandas (bool): Print a pandas summary of the results to the console
         print_xarray (bool): Print an xarray summary of the results to the console
         serve_pandas (bool): Serve a pandas summary on the results webpage
@@ -83,6 +85,24 @@ class BenchRunCfg(BenchPlotSrvCfg):
         run_tag (str): Tag for isolating cached results
         run_date (datetime): Date the benchmark run was performed
         executor (Executors): Executor for running the benchmark
+        max_workers (int): Number of workers used by the thread and process pool executors, or the
+            number of concurrent calls of the asyncio executor
+        max_in_flight (int): Maximum number of pending jobs when using a parallel executor
+        chunk_size (int): Number of jobs sent to a parallel worker in a single task
+        call_batch_size (int): Maximum number of points passed to a vectorised __call_batch__ worker
+        deepcopy_worker_inputs (bool): Whether each call of the worker gets a deep copy of its inputs
+        dedupe_artifacts (bool): Store the files of path, image and video results once per content
+        cache_write_batch_size (int): Number of results written to the sample cache in one transaction,
+            and so the number of finished samples that can be lost if the process is killed
+        checkpoint_interval (float): Seconds between checkpoints of the partial results of a sweep
+        reuse_sweep_results (bool): Fill points shared with an earlier sweep of the same Bench from its results
+        adaptive_samples (int): Maximum number of samples of each float input of an adaptive sweep
+        adaptive_tolerance (float): Smallest relative change of the results that an adaptive sweep refines
+        repeats_tolerance (float): Standard error of the mean at which a point stops being repeated
+        min_repeats (int): Number of repeats of each point before repeats_tolerance is checked
+        cache_backend (CacheBackends): Where the sample, result and history caches are stored
+        cache_memory_size_limit (int): Maximum size in bytes of each in-memory cache
+        cache_memory_max_items (int): Maximum number of entries in each in-memory cache
         plot_size (int): Sets both width and height of the plot
         plot_width (int): Sets width of the plots
         plot_height (int): Sets height of the plot
@@ -111,6 +131,13 @@ class BenchRunCfg(BenchPlotSrvCfg):
 
     clear_history: bool = param.Boolean(False, doc="Clear historical results")
 
+    history_max_runs: int = param.Integer(
+        None,
+        bounds=[1, None],
+        allow_None=True,
+        doc="The maximum number of runs kept in the over_time history.  The oldest runs are removed first.  If None every run is kept",
+    )
+
     print_pandas: bool = param.Boolean(
         False, doc="Print a pandas summary of the results to the console."
     )
@@ -217,6 +244,104 @@ class BenchRunCfg(BenchPlotSrvCfg):
         doc="The function can be run serially or in parallel with different futures executors",
     )
 
+    max_workers: Optional[int] = param.Integer(
+        default=None,
+        bounds=[1, None],
+        doc="The number of workers used by the THREADS and MULTIPROCESSING executors, or the number of sweep points the ASYNCIO executor runs concurrently.  If None, the executor picks its own default",
+    )
+
+    max_in_flight: Optional[int] = param.Integer(
+        default=None,
+        bounds=[1, None],
+        doc="The maximum number of jobs that are pending in a parallel executor at any one time. Results are stored as soon as each job completes and new jobs are only submitted when there is space, so large sweeps run with flat memory.  If None, all jobs are submitted up front",
+    )
+
+    chunk_size: int = param.Integer(
+        default=1,
+        bounds=[0, None],
+        doc="The number of jobs that are sent to a parallel worker in a single task.  When each call of the worker is fast the per-task communication overhead dominates, so sending chunks of jobs amortises it.  Set to 0 to pick the chunk size automatically from the measured latency of each call",
+    )
+
+    call_batch_size: int = param.Integer(
+        default=4096,
+        bounds=[1, None],
+        doc="If the worker class defines a vectorised __call_batch__ method, this is the maximum number of sweep points that are passed to it in a single call",
+    )
+
+    deepcopy_worker_inputs: bool = param.Boolean(
+        False,
+        doc="Pass a deep copy of the inputs to each call of the worker.  Only needed for workers that modify their inputs, for example a list passed in as a constant, because the inputs are otherwise shared between calls",
+    )
+
+    dedupe_artifacts: bool = param.Boolean(
+        False,
+        doc="Move the files returned as ResultPath, ResultImage and ResultVideo results into a content addressed store in cachedir/artifacts, so that identical files are stored once.  The results then hold the path of the stored file.  Use Bench.collect_artifacts() to delete the stored files that no cached result refers to",
+    )
+
+    cache_write_batch_size: int = param.Integer(
+        default=256,
+        bounds=[1, None],
+        doc="The number of results that are buffered and then written to the sample cache in a single transaction.  Buffered results are written when the sweep finishes or raises an error and before each checkpoint, but up to this many finished samples are lost if the process is killed, so set checkpoint_interval to bound the loss in time, or set this to 1 to write each result as soon as it is available",
+    )
+
+    checkpoint_interval: float = param.Number(
+        default=None,
+        bounds=[0, None],
+        allow_None=True,
+        doc="The minimum number of seconds between checkpoints of the partial results of a sweep.  If a sweep is interrupted, running it again resumes from its last checkpoint and only runs the missing points.  If None, sweeps are not checkpointed",
+    )
+
+    reuse_sweep_results: bool = param.Boolean(
+        False,
+        doc="Copy the results of points that an earlier sweep of the same inputs on the same Bench already calculated, for example the points of the previous level when the level is increased, instead of looking them up in the sample cache.  Only used when cache_samples is on and the sample cache is not being cleared or overwritten, because the sample cache would return the same values.  BenchRunner turns this on when it caches results",
+    )
+
+    adaptive_samples: int = param.Integer(
+        default=None,
+        bounds=[2, None],
+        allow_None=True,
+        doc="If set, float inputs are sampled adaptively.  Sweeps start with 3 samples of each float input and repeatedly bisect the intervals where the results change or bend the most, up to this many samples of each float input.  If None, float inputs are sampled uniformly",
+    )
+
+    adaptive_tolerance: float = param.Number(
+        default=0.01,
+        bounds=[0, None],
+        doc="Adaptive sweeps stop refining an interval once the change of the results across it, relative to the range of the results, is at most this value",
+    )
+
+    repeats_tolerance: float = param.Number(
+        default=None,
+        bounds=[0, None],
+        allow_None=True,
+        doc="If set, points are repeated until the standard error of the mean of every ResultVar is below this value, up to repeats times.  Repeats that are not needed are left as NaN and the number of repeats of each point is stored in the repeat_count variable of the dataset.  If None, every point is repeated repeats times",
+    )
+
+    min_repeats: int = param.Integer(
+        default=3,
+        bounds=[2, None],
+        doc="The number of times each point is repeated before its standard error is compared to repeats_tolerance",
+    )
+
+    cache_backend = param.Selector(
+        objects=list(CacheBackends),
+        default=CacheBackends.DISK,
+        doc="Where the sample, result and history caches are stored.  DISK persists between runs, MEMORY keeps everything in the process so nothing touches the disk, and TIERED keeps an in-memory copy of the disk cache to avoid disk reads",
+    )
+
+    cache_memory_size_limit: Optional[int] = param.Integer(
+        default=int(1e9),
+        allow_None=True,
+        bounds=[0, None],
+        doc="The maximum size in bytes of each in-memory cache used by the MEMORY and TIERED backends.  The least recently used entries are evicted first.  If None, the size is not limited",
+    )
+
+    cache_memory_max_items: Optional[int] = param.Integer(
+        default=None,
+        allow_None=True,
+        bounds=[1, None],
+        doc="The maximum number of entries in each in-memory cache used by the MEMORY and TIERED backends.  If None, the number of entries is not limited",
+    )
+
     plot_size: Optional[int] = param.Integer(
         default=None, doc="Sets the width and height of the plot"
     )
@@ -429,6 +554,9 @@ class BenchCfg(BenchRunCfg):
         if include_repeats:
             # needed so that the historical xarray arrays are the same size
             repeats_hash = hash_sha1(self.repeats)
+            if self.repeats_tolerance is not None:
+                # a sweep that stops repeating points early does not have the results of every repeat
+                repeats_hash = hash_sha1((repeats_hash, self.repeats_tolerance, self.min_repeats))
         else:
             repeats_hash = 0
 
@@ -446,7 +574,7 @@ class BenchCfg(BenchRunCfg):
             hash_val = hash_sha1((hash_val, v.hash_persistent()))
 
         for v in self.const_vars:
-            hash_val = hash_sha1((v[0].hash_persistent(), hash_sha1(v[1])))
+            hash_val = hash_sha1((hash_val, v[0].hash_persistent(), hash_sha1(v[1])))
 
         return hash_val
 
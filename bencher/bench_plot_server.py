@@ -9,6 +9,7 @@ import panel as pn
 from diskcache import Cache
 
 from bencher.bench_cfg import BenchCfg, BenchPlotSrvCfg
+from bencher.result_store import StoredResult
 
 logging.basicConfig(level=logging.INFO)
 
@@ -63,6 +64,12 @@ class BenchPlotServer:
                     if bench_cfg_hash in cache:
                         logging.info(f"loading cached results from key: {bench_cfg_hash}")
                         bench_res = cache[bench_cfg_hash]
+                        if isinstance(bench_res, StoredResult):
+                            bench_res = bench_res.load()
+                        if bench_res is None:
+                            raise FileNotFoundError(
+                                f"The dataset of the results with key {bench_cfg_hash} is missing"
+                            )
                         logging.info(f"loaded: {bench_res.bench_cfg.title}")
 
                         plots_instance = bench_res.to_auto_plots()
@@ -4,6 +4,8 @@ from bencher.bench_cfg import BenchRunCfg, BenchCfg
 from bencher.variables.parametrised_sweep import ParametrizedSweep
 from bencher.bencher import Bench
 from bencher.bench_report import BenchReport, GithubPagesCfg
+from bencher.job import ExecutorPool
+from bencher.sweep_grid import ResultIndex
 from copy import deepcopy
 
 
@@ -18,6 +20,9 @@ class BenchRunner:
     BenchRunner provides a framework for organizing, configuring, and executing multiple
     benchmark runs with different parameters. It supports progressive refinement of benchmark
     resolution, caching of results, and publication of results to various formats.
+
+    The runner owns an ExecutorPool that is shared by the benchmarks it creates, so a parallel
+    executor is started once and reused for every benchmark and level until shutdown() is called.
     """
 
     def __init__(
@@ -43,6 +48,7 @@ class BenchRunner:
             self.add_bench(bench_class)
         self.results = []
         self.servers = []
+        self.executor_pool = ExecutorPool()
 
     @staticmethod
     def setup_run_cfg(
@@ -63,6 +69,7 @@ class BenchRunner:
         """
         run_cfg_out = deepcopy(run_cfg)
         run_cfg_out.cache_samples = cache_results
+        run_cfg_out.reuse_sweep_results = cache_results
         run_cfg_out.only_hash_tag = cache_results
         run_cfg_out.level = level
         return run_cfg_out
@@ -72,6 +79,7 @@ class BenchRunner:
         class_instance: ParametrizedSweep,
         run_cfg: BenchRunCfg = BenchRunCfg(),
         report: BenchReport = BenchReport(),
+        executor_pool: ExecutorPool = None,
     ) -> Bench:
         """Create a Bench instance from a ParametrizedSweep class.
 
@@ -79,6 +87,7 @@ class BenchRunner:
             class_instance (ParametrizedSweep): The parametrized sweep class instance to benchmark
             run_cfg (BenchRunCfg, optional): Configuration for benchmark execution. Defaults to BenchRunCfg().
             report (BenchReport, optional): Report to store benchmark results. Defaults to BenchReport().
+            executor_pool (ExecutorPool, optional): Pool that owns a persistent parallel executor. Defaults to None.
 
         Returns:
             Bench: A configured Bench instance ready to run the benchmark
@@ -88,6 +97,7 @@ class BenchRunner:
             class_instance,
             run_cfg=run_cfg,
             report=report,
+            executor_pool=executor_pool,
         )
 
     def add_run(self, bench_fn: Benchable) -> None:
@@ -102,16 +112,21 @@ class BenchRunner:
         """Add a parametrized sweep class instance as a benchmark.
 
         Creates and adds a function that will create a Bench instance from the
-        provided parametrized sweep class when executed.
+        provided parametrized sweep class when executed.  The sweeps of every run share an index
+        of results so that higher levels only calculate the points that the lower levels did not.
 
         Args:
             class_instance (ParametrizedSweep): The parametrized sweep to benchmark
         """
 
+        result_index = ResultIndex()
+
         def cb(run_cfg: BenchRunCfg, report: BenchReport) -> BenchCfg:
             bench = BenchRunner.from_parametrized_sweep(
-                class_instance, run_cfg=run_cfg, report=report
+                class_instance, run_cfg=run_cfg, report=report, executor_pool=self.executor_pool
             )
+            # each run gets a new Bench so that the sample cache follows its run_cfg, but the results of earlier levels are kept
+            bench.result_index = result_index
             return bench.plot_sweep(f"bench_{class_instance.name}")
 
         self.add_run(cb)
@@ -230,13 +245,14 @@ class BenchRunner:
         self.show_publish(report=report, show=show, publish=publish, save=save, debug=debug)
 
     def shutdown(self) -> None:
-        """Stop all running panel servers launched by this benchmark runner.
+        """Stop all running panel servers and the executor pool of this benchmark runner.
 
         This method ensures that any web servers started to display benchmark results
-        are properly shut down.
+        are properly shut down and that the worker processes are released.
         """
         while self.servers:
             self.servers.pop().stop()
+        self.executor_pool.shutdown()
 
     def __del__(self) -> None:
         """Destructor that ensures proper cleanup of resources.
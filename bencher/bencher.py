@@ -1,25 +1,28 @@
 import logging
+import inspect
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from itertools import product, combinations
+from itertools import combinations, islice
 
 from param import Parameter
-from typing import Callable, List, Optional, Tuple, Any
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple, Any
 from copy import deepcopy
 import numpy as np
 import param
 import xarray as xr
-from diskcache import Cache
 from contextlib import suppress
 from functools import partial
 import panel as pn
 
-from bencher.worker_job import WorkerJob
+from bencher.worker_job import WorkerJob, JobKeys, JobTable
 
 from bencher.bench_cfg import BenchCfg, BenchRunCfg, DimsCfg
 from bencher.bench_plot_server import BenchPlotServer
 from bencher.bench_report import BenchReport
 
-from bencher.variables.inputs import IntSweep
+from bencher.variables.inputs import IntSweep, FloatSweep
 from bencher.variables.time import TimeSnapshot, TimeEvent
 from bencher.variables.results import (
     ResultVar,
@@ -35,8 +38,17 @@ from bencher.variables.results import (
 )
 from bencher.results.bench_result import BenchResult
 from bencher.variables.parametrised_sweep import ParametrizedSweep
-from bencher.job import Job, FutureCache, JobFuture, Executors
-from bencher.utils import params_to_str
+from bencher.cache_backend import CacheBackend, CacheBackends, open_cache
+from bencher.history_store import HistoryResult, HistoryStore
+from bencher.sweep_checkpoint import SweepCheckpoint
+from bencher.sequential_repeats import REPEAT_COUNT, SequentialRepeats
+from bencher.sweep_grid import ResultIndex, SweepGrid
+from bencher.adaptive_sampling import refine_values
+from bencher.artifact_store import ARTIFACT_DIR, ArtifactStore
+from bencher.storage_manager import StorageManager
+from bencher.result_store import StoredResult, dataset_path, delete_dataset, save_dataset
+from bencher.job import Job, FutureCache, JobFuture, Executors, ExecutorPool
+from bencher.utils import hash_sha1, params_to_str
 
 # Customize the formatter
 formatter = logging.Formatter("%(levelname)s: %(message)s")
@@ -54,6 +66,8 @@ def set_xarray_multidim(
 
     This function sets a value in an N-dimensional xarray using explicit matching on the
     tuple length since direct indexing with variable length index tuples is not supported.
+    It supports at most 9 dimensions.  Sweeps no longer use it, they write results into numpy
+    buffers (see Bench.store_result_value) which have no dimension limit and are much faster.
 
     Args:
         data_array (xr.DataArray): The data array to modify
@@ -179,6 +193,162 @@ def worker_kwargs_wrapper(worker: Callable, bench_cfg: BenchCfg, **kwargs) -> di
     return worker(**function_input_deep)
 
 
+def reuses_sample_cache(run_cfg: BenchRunCfg) -> bool:
+    """Check whether a run returns the values in the sample cache instead of calculating them again.
+
+    Args:
+        run_cfg (BenchRunCfg): Configuration for how the benchmark is executed
+
+    Returns:
+        bool: True if samples are cached and the cache is not being cleared or overwritten
+    """
+    return (
+        run_cfg.cache_samples
+        and not run_cfg.overwrite_sample_cache
+        and not run_cfg.clear_sample_cache
+    )
+
+
+def repeats_key(bench_cfg_sample_hash: str) -> str:
+    """Get the result cache key of the latest result of a sweep with any number of repeats.
+
+    Args:
+        bench_cfg_sample_hash (str): Hash of the benchmark configuration without repeats
+
+    Returns:
+        str: The key that the hash of the latest cached result is stored under
+    """
+    return f"repeats:{bench_cfg_sample_hash}"
+
+
+class WorkerKwargsFilter:
+    """Filter out metadata parameters and pass the remaining keyword arguments to a worker.
+
+    This does the same as worker_kwargs_wrapper, but works out which parameters to remove once
+    per sweep and does not copy the inputs.  The values are passed to the worker as they are,
+    so large constant inputs are not copied for every call.  Workers that modify their inputs
+    can set deepcopy_inputs so that each call gets its own copy.
+
+    Attributes:
+        worker (Callable): The worker function to call
+        drop (Tuple[str, ...]): The names of the metadata parameters that are not passed on
+        deepcopy_inputs (bool): Whether the inputs are deep copied before each call
+        artifact_names (List[str]): The results whose files are moved into the artifact store
+        artifacts (ArtifactStore): The store for the files of the results, or None
+    """
+
+    def __init__(self, worker: Callable, bench_cfg: BenchCfg) -> None:
+        """Work out which parameters to filter out for a sweep.
+
+        Args:
+            worker (Callable): The worker function to call
+            bench_cfg (BenchCfg): Benchmark configuration with parameters like pass_repeat
+        """
+        self.worker = worker
+        self.drop = ("over_time", "time_event")
+        if not bench_cfg.pass_repeat:
+            self.drop = ("repeat",) + self.drop
+        self.deepcopy_inputs = bench_cfg.deepcopy_worker_inputs
+        self.artifact_names = []
+        if bench_cfg.dedupe_artifacts:
+            self.artifact_names = [
+                rv.name
+                for rv in bench_cfg.result_vars
+                if isinstance(rv, (ResultPath, ResultImage, ResultVideo))
+            ]
+        self.artifacts = ArtifactStore() if self.artifact_names else None
+
+    def __call__(self, **kwargs) -> dict:
+        # kwargs is a new dict for every call, so removing entries does not affect the caller
+        for name in self.drop:
+            kwargs.pop(name, None)
+        if self.deepcopy_inputs:
+            kwargs = deepcopy(kwargs)
+        results = self.worker(**kwargs)
+        if self.artifacts is not None:
+            # the coroutine of an async worker is awaited by the executor before the files exist
+            if inspect.isawaitable(results):
+                return self.put_artifacts_async(results)
+            # the files are stored before the sample cache records their paths
+            if isinstance(results, dict):
+                results = self.artifacts.put_results(results, self.artifact_names)
+        return results
+
+    async def put_artifacts_async(self, results: Awaitable[dict]) -> dict:
+        """Await the results of an async worker and move their files into the artifact store.
+
+        Args:
+            results (Awaitable[dict]): The coroutine returned by the worker
+
+        Returns:
+            dict: The results with the paths of the stored files
+        """
+        return self.artifacts.put_results(await results, self.artifact_names)
+
+
+def worker_batch_kwargs_wrapper(worker_batch: Callable, bench_cfg: BenchCfg, **kwargs) -> dict:
+    """Filter out metadata columns and pass the input columns to a vectorised worker function.
+
+    This is the vectorised counterpart of worker_kwargs_wrapper.  Each keyword argument is an
+    array with one entry per sweep point.
+
+    Args:
+        worker_batch (Callable): The vectorised worker function to call
+        bench_cfg (BenchCfg): Benchmark configuration with parameters like pass_repeat
+        **kwargs: The input columns to filter and pass to the worker
+
+    Returns:
+        dict: The result columns from the worker function
+    """
+    if not bench_cfg.pass_repeat:
+        kwargs.pop("repeat")
+    kwargs.pop("over_time", None)
+    kwargs.pop("time_event", None)
+    return worker_batch(**kwargs)
+
+
+class ThreadLocalWorker:
+    """Call a ParametrizedSweep worker through a separate copy of the instance for each thread.
+
+    ParametrizedSweep.__call__ usually updates the params of the instance before computing the
+    results, so calling a single shared instance from several threads at once would mix up the
+    inputs of different jobs.  Each thread of the executor lazily makes its own deep copy instead.
+    """
+
+    def __init__(self, worker_class_instance: ParametrizedSweep) -> None:
+        self.worker_class_instance = worker_class_instance
+        self.local = threading.local()
+
+    def __call__(self, **kwargs) -> dict:
+        if not hasattr(self.local, "instance"):
+            self.local.instance = deepcopy(self.worker_class_instance)
+        return self.local.instance(**kwargs)
+
+
+class TaskLocalWorker:
+    """Call a ParametrizedSweep worker through a separate copy of the instance for each asyncio task.
+
+    An async __call__ usually updates the params of the instance and then awaits, so other calls
+    running concurrently on the same event loop would mix up the inputs of different jobs.  Each
+    call borrows an idle copy of the instance instead, and a new deep copy is only made when all
+    the existing copies are busy.
+    """
+
+    def __init__(self, worker_class_instance: ParametrizedSweep) -> None:
+        self.worker_class_instance = worker_class_instance
+        self.idle = []
+
+    async def __call__(self, **kwargs) -> dict:
+        instance = self.idle.pop() if self.idle else deepcopy(self.worker_class_instance)
+        try:
+            result = instance(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        finally:
+            self.idle.append(instance)
+
+
 class Bench(BenchPlotServer):
     def __init__(
         self,
@@ -187,6 +357,7 @@ class Bench(BenchPlotServer):
         worker_input_cfg: ParametrizedSweep = None,
         run_cfg: BenchRunCfg = None,
         report: BenchReport = None,
+        executor_pool: ExecutorPool = None,
     ) -> None:
         """Create a new Bench object for benchmarking a worker function with parametrized inputs.
 
@@ -207,6 +378,10 @@ class Bench(BenchPlotServer):
                 such as caching settings, execution mode, etc. Defaults to None.
             report (BenchReport, optional): An existing report to append benchmark results to.
                 If None, a new report will be created. Defaults to None.
+            executor_pool (ExecutorPool, optional): A pool that owns the parallel executor so that
+                worker processes persist across sweeps.  The caller is responsible for shutting it
+                down.  If None, an executor is created and shut down for every sweep.
+                Defaults to None.
 
         Raises:
             AssertionError: If bench_name is not a string.
@@ -218,6 +393,7 @@ class Bench(BenchPlotServer):
         self.worker_class_instance = None
         self.worker_input_cfg = None
         self.worker_class_instance = None
+        self.executor_pool = executor_pool
         self.set_worker(worker, worker_input_cfg)
         self.run_cfg = run_cfg
         if report is None:
@@ -232,6 +408,8 @@ class Bench(BenchPlotServer):
         self.last_run_cfg = None  # cached run_cfg used to pass to the plotting function
         self.sample_cache = None  # store the results of each benchmark function call in a cache
         self.ds_dynamic = {}  # A dictionary to store unstructured vector datasets
+        # the completed sweeps, used to fill the shared points of later sweeps such as the next level
+        self.result_index = ResultIndex()
 
         self.cache_size = int(100e9)  # default to 100gb
 
@@ -296,6 +474,12 @@ class Bench(BenchPlotServer):
             logging.info(f"setting worker {worker}")
         self.worker_input_cfg = worker_input_cfg
 
+        if self.executor_pool is not None:
+            # import the modules that define the worker when each worker process starts
+            for obj in (worker, worker_input_cfg):
+                if obj is not None:
+                    self.executor_pool.add_module(getattr(obj, "__module__", None))
+
     def sweep_sequential(
         self,
         title: str = "",
@@ -407,7 +591,65 @@ class Bench(BenchPlotServer):
             TypeError: If variable parameters are not of the correct type
             FileNotFoundError: If only_plot=True and no cached results exist
         """
+        bench_cfg, run_cfg = self.sweep_cfg(
+            title,
+            input_vars,
+            result_vars,
+            const_vars,
+            description,
+            post_description,
+            pass_repeat,
+            tag,
+            run_cfg,
+            plot_callbacks,
+        )
+        self.last_run_cfg = run_cfg
+
+        if run_cfg.level > 0:
+            print(bench_cfg.input_vars)
+            bench_cfg.input_vars = [i.with_level(run_cfg.level) for i in bench_cfg.input_vars]
+
+        if run_cfg.adaptive_samples is not None:
+            return self.run_adaptive_sweep(bench_cfg, run_cfg, time_src)
+        return self.run_sweep(bench_cfg, run_cfg, time_src)
 
+    def sweep_cfg(
+        self,
+        title: str = None,
+        input_vars: List[ParametrizedSweep] = None,
+        result_vars: List[ParametrizedSweep] = None,
+        const_vars: List[ParametrizedSweep] = None,
+        description: str = None,
+        post_description: str = None,
+        pass_repeat: bool = False,
+        tag: str = "",
+        run_cfg: BenchRunCfg = None,
+        plot_callbacks: List[Callable] | bool = None,
+    ) -> Tuple[BenchCfg, BenchRunCfg]:
+        """Build the configuration of a sweep from the arguments of plot_sweep.
+
+        The input variables are kept at their full resolution, plot_sweep reduces them to the
+        level of the run configuration.  The configuration can be passed to warmup to load the
+        cached results of the sweep before plot_sweep is called.
+
+        Args:
+            title (str, optional): The title of the benchmark. Defaults to None.
+            input_vars (List[ParametrizedSweep], optional): Variables to sweep through. Defaults to None.
+            result_vars (List[ParametrizedSweep], optional): Variables to collect results for.
+                Defaults to None.
+            const_vars (List[ParametrizedSweep], optional): Variables to keep constant. Defaults to None.
+            description (str, optional): A description displayed before the plots. Defaults to None.
+            post_description (str, optional): A description displayed after the plots. Defaults to None.
+            pass_repeat (bool, optional): Whether to pass the repeat to the worker. Defaults to False.
+            tag (str, optional): Tag to group different benchmarks together. Defaults to "".
+            run_cfg (BenchRunCfg, optional): Configuration for how the benchmarks are run.
+                Defaults to None.
+            plot_callbacks (List[Callable] | bool, optional): Callbacks for plotting results.
+                Defaults to None.
+
+        Returns:
+            Tuple[BenchCfg, BenchRunCfg]: The configuration of the sweep and of how it is run
+        """
         input_vars_in = deepcopy(input_vars)
         result_vars_in = deepcopy(result_vars)
         const_vars_in = deepcopy(const_vars)
@@ -456,8 +698,6 @@ class Bench(BenchPlotServer):
         if run_cfg.only_plot:
             run_cfg.cache_results = True
 
-        self.last_run_cfg = run_cfg
-
         if isinstance(input_vars_in, dict):
             input_lists = []
             for k, v in input_vars_in.items():
@@ -500,14 +740,6 @@ class Bench(BenchPlotServer):
             else:
                 title = "Recording: " + ", ".join([i.name for i in result_vars_in])
 
-        if run_cfg.level > 0:
-            inputs = []
-            print(input_vars_in)
-            if len(input_vars_in) > 0:
-                for i in input_vars_in:
-                    inputs.append(i.with_level(run_cfg.level))
-                input_vars_in = inputs
-
         # if any of the inputs have been include as constants, remove those variables from the list of constants
         with suppress(ValueError, AttributeError):
             for i in input_vars_in:
@@ -551,10 +783,109 @@ class Bench(BenchPlotServer):
             tag=run_cfg.run_tag + tag,
             plot_callbacks=plot_callbacks,
         )
-        return self.run_sweep(bench_cfg, run_cfg, time_src)
+        return bench_cfg, run_cfg
 
-    def run_sweep(
+    def run_adaptive_sweep(
         self, bench_cfg: BenchCfg, run_cfg: BenchRunCfg, time_src: datetime = None
+    ) -> BenchResult:
+        """Execute a benchmark sweep that places the samples of float inputs where the results change.
+
+        The float inputs start with 3 samples across their range.  After each step the intervals
+        where the results change the most or bend the most are bisected (see refine_values) and
+        only the new points are calculated, until no interval scores above adaptive_tolerance or
+        each float input has adaptive_samples values.  The result of the final step is a regular
+        dataset with unevenly spaced coordinates, so it can be plotted like any other sweep.  Only
+        the final step is stored in the result cache, together with the values of its float
+        inputs so that running the sweep again loads it without running the steps.
+
+        Args:
+            bench_cfg (BenchCfg): Configuration defining inputs, results, and other benchmark parameters
+            run_cfg (BenchRunCfg): Configuration for how the benchmark should be executed
+            time_src (datetime, optional): The timestamp for the benchmark. Defaults to None.
+
+        Returns:
+            BenchResult: The result of the final step of the sweep
+        """
+        float_dims = [i for i, iv in enumerate(bench_cfg.input_vars) if isinstance(iv, FloatSweep)]
+        if not float_dims or run_cfg.over_time:
+            return self.run_sweep(bench_cfg, run_cfg, time_src)
+
+        key_cfg = deepcopy(bench_cfg)
+        key_cfg.param.update(run_cfg.param.values())
+        adaptive_key = hash_sha1(
+            (
+                "adaptive",
+                key_cfg.hash_persistent(True),
+                run_cfg.adaptive_samples,
+                run_cfg.adaptive_tolerance,
+            )
+        )
+        if run_cfg.cache_results and not run_cfg.clear_cache:
+            with self.open_cache("benchmark_inputs", run_cfg) as c:
+                final_values = c.get(adaptive_key)
+            if final_values is not None:
+                logging.info(f"loading the final step of the adaptive sweep {adaptive_key}")
+                final_cfg = deepcopy(bench_cfg)
+                final_cfg.input_vars = [
+                    iv.with_sample_values(final_values[i]) if i in final_values else iv
+                    for i, iv in enumerate(bench_cfg.input_vars)
+                ]
+                return self.run_sweep(final_cfg, run_cfg, time_src)
+            if run_cfg.only_plot:
+                raise FileNotFoundError("Was not able to load the results to plot!")
+
+        result_names = [rv.name for rv in bench_cfg.result_vars if type(rv) is ResultVar]
+        step_cfg = deepcopy(run_cfg)
+        step_cfg.auto_plot = False
+        step_cfg.reuse_sweep_results = True
+        result_index = self.result_index.copy()
+        results_count = len(self.results)
+
+        input_vars = list(bench_cfg.input_vars)
+        for i in float_dims:
+            values = input_vars[i].values()
+            start = np.linspace(min(values), max(values), min(3, run_cfg.adaptive_samples))
+            input_vars[i] = input_vars[i].with_sample_values(start.tolist())
+
+        refined = True
+        while refined:
+            step_bench_cfg = deepcopy(bench_cfg)
+            step_bench_cfg.input_vars = input_vars
+            # the steps before the final one are thrown away, so they are not cached
+            bench_res = self.run_sweep(step_bench_cfg, step_cfg, time_src, cache=False)
+            refined = False
+            for i in float_dims:
+                values = refine_values(
+                    bench_res.ds,
+                    input_vars[i].name,
+                    result_names,
+                    run_cfg.adaptive_samples,
+                    run_cfg.adaptive_tolerance,
+                )
+                if values is not None:
+                    input_vars[i] = input_vars[i].with_sample_values(values)
+                    refined = True
+            logging.info(f"finished adaptive sweep step of shape {dict(bench_res.ds.sizes)}")
+
+        # only the final step is kept as the result of the sweep
+        del self.results[results_count:-1]
+        if not reuses_sample_cache(run_cfg):
+            # the steps of this sweep were not cached, so later sweeps must not reuse them
+            self.result_index = result_index
+        bench_res.bench_cfg.auto_plot = run_cfg.auto_plot
+        self.cache_results(bench_res, bench_res.bench_cfg.hash_value)
+        with self.open_cache("benchmark_inputs", run_cfg) as c:
+            c[adaptive_key] = {i: list(input_vars[i].values()) for i in float_dims}
+        if run_cfg.auto_plot:
+            self.report.append_result(bench_res)
+        return bench_res
+
+    def run_sweep(
+        self,
+        bench_cfg: BenchCfg,
+        run_cfg: BenchRunCfg,
+        time_src: datetime = None,
+        cache: bool = True,
     ) -> BenchResult:
         """Execute a benchmark sweep based on the provided configuration.
 
@@ -567,6 +898,7 @@ class Bench(BenchPlotServer):
             run_cfg (BenchRunCfg): Configuration for how the benchmark should be executed
             time_src (datetime, optional): The timestamp for the benchmark. Used for time-series benchmarks.
                 Defaults to None, which will use the current time.
+            cache (bool, optional): Whether to store the result in the result cache. Defaults to True.
 
         Returns:
             BenchResult: An object containing all benchmark data, results, and visualization
@@ -589,17 +921,22 @@ class Bench(BenchPlotServer):
             self.clear_tag_from_sample_cache(bench_cfg.tag, run_cfg)
 
         calculate_results = True
-        with Cache("cachedir/benchmark_inputs", size_limit=self.cache_size) as c:
+        with self.open_cache("benchmark_inputs", run_cfg) as c:
             if run_cfg.clear_cache:
                 c.delete(bench_cfg_hash)
+                delete_dataset(bench_cfg_hash)
                 logging.info("cleared cache")
             elif run_cfg.cache_results:
                 logging.info(
                     f"checking for previously calculated results with key: {bench_cfg_hash}"
                 )
+                bench_res = None
                 if bench_cfg_hash in c:
                     logging.info(f"loading cached results from key: {bench_cfg_hash}")
                     bench_res = c[bench_cfg_hash]
+                    if isinstance(bench_res, StoredResult):
+                        bench_res = bench_res.load()
+                if bench_res is not None:
                     # if not over_time:  # if over time we always want to calculate results
                     calculate_results = False
                 else:
@@ -615,13 +952,16 @@ class Bench(BenchPlotServer):
             )
 
             # use the hash of the inputs to look up historical values in the cache
+            run_ds = None
             if run_cfg.over_time:
+                run_ds = bench_res.ds
                 bench_res.ds = self.load_history_cache(
-                    bench_res.ds, bench_cfg_hash, run_cfg.clear_history
+                    bench_res.ds, bench_cfg_hash, run_cfg.clear_history, run_cfg
                 )
 
             self.report_results(bench_res, run_cfg.print_xarray, run_cfg.print_pandas)
-            self.cache_results(bench_res, bench_cfg_hash)
+            if cache:
+                self.cache_results(bench_res, bench_cfg_hash, run_ds)
 
         logging.info(self.sample_cache.stats())
         self.sample_cache.close()
@@ -681,28 +1021,55 @@ class Bench(BenchPlotServer):
             )
         return variable
 
-    def cache_results(self, bench_res: BenchResult, bench_cfg_hash: str) -> None:
+    def cache_results(
+        self, bench_res: BenchResult, bench_cfg_hash: str, run_ds: xr.Dataset = None
+    ) -> None:
         """Cache benchmark results for future retrieval.
 
         This method stores benchmark results in the disk cache using the benchmark
         configuration hash as the key. It temporarily removes non-pickleable objects
-        from the benchmark result before caching.
+        from the benchmark result before caching.  The dataset is saved to its own NetCDF file
+        when possible so that loading the result later only reads the data that is plotted.
+        The dataset of an over_time result holds its whole history, so only the dataset of the
+        run is saved, with a reference to the runs of the history (see HistoryResult).
 
         Args:
             bench_res (BenchResult): The benchmark result to cache
             bench_cfg_hash (str): The hash value to use as the cache key
+            run_ds (xr.Dataset, optional): The dataset of the run if bench_res.ds holds the
+                over_time history it was added to. Defaults to None.
         """
-        with Cache("cachedir/benchmark_inputs", size_limit=self.cache_size) as c:
+        with self.open_cache("benchmark_inputs", bench_res.bench_cfg) as c:
             logging.info(f"saving results with key: {bench_cfg_hash}")
             self.bench_cfg_hashes.append(bench_cfg_hash)
             # object index may not be pickleable so remove before caching
             obj_index_tmp = bench_res.object_index
             bench_res.object_index = []
 
-            c[bench_cfg_hash] = bench_res
+            # the dataset is stored separately so that it can be loaded lazily
+            ds_tmp = bench_res.ds
+            path = dataset_path(bench_cfg_hash)
+            use_files = bench_res.bench_cfg.cache_backend != CacheBackends.MEMORY
+            if use_files and save_dataset(ds_tmp if run_ds is None else run_ds, path):
+                bench_res.ds = xr.Dataset()
+                if run_ds is None:
+                    record = StoredResult(bench_res, path, ds_tmp)
+                else:
+                    with self.open_cache("history", bench_res.bench_cfg) as history:
+                        runs = HistoryStore(history).runs(bench_cfg_hash)
+                    record = HistoryResult(bench_res, path, run_ds, bench_cfg_hash, runs)
+                c.set(bench_cfg_hash, record, tag=bench_res.bench_cfg.tag)
+            else:
+                delete_dataset(bench_cfg_hash)
+                c.set(bench_cfg_hash, bench_res, tag=bench_res.bench_cfg.tag)
 
-            # restore object index
+            # restore object index and dataset
             bench_res.object_index = obj_index_tmp
+            bench_res.ds = ds_tmp
+
+            # sweeps with a different number of repeats can reuse the repeats of this result, unless some of its repeats were not run because it stopped repeating points early
+            if REPEAT_COUNT not in bench_res.ds:
+                c[repeats_key(bench_res.bench_cfg.hash_persistent(False))] = bench_cfg_hash
 
             logging.info(f"saving benchmark: {self.bench_name}")
             c[self.bench_name] = self.bench_cfg_hashes
@@ -732,42 +1099,48 @@ class Bench(BenchPlotServer):
     #     return BenchPlotServer().plot_server(self.bench_name, run_cfg, pane)
 
     def load_history_cache(
-        self, dataset: xr.Dataset, bench_cfg_hash: str, clear_history: bool
+        self,
+        dataset: xr.Dataset,
+        bench_cfg_hash: str,
+        clear_history: bool,
+        run_cfg: BenchRunCfg = None,
     ) -> xr.Dataset:
         """Load historical data from a cache if over_time is enabled.
 
         This method is used to retrieve and concatenate historical benchmark data from the cache
         when tracking performance over time. If clear_history is True, it will clear any existing
-        historical data instead of loading it.
+        historical data instead of loading it.  The history is stored one run at a time (see
+        HistoryStore), so only the new run is written, and the runs that this process loaded
+        before are kept in memory, so only the new run is read.
 
         Args:
             dataset (xr.Dataset): Freshly calculated benchmark data for the current run
             bench_cfg_hash (str): Hash of the input variables used to identify cached data
             clear_history (bool): If True, clears historical data instead of loading it
+            run_cfg (BenchRunCfg, optional): Selects the cache backend and how many runs to keep.
+                If None, the history is stored on disk and every run is kept. Defaults to None.
 
         Returns:
             xr.Dataset: Combined dataset with both historical and current benchmark data,
                 or just the current data if no history exists or history is cleared
         """
-        with Cache("cachedir/history", size_limit=self.cache_size) as c:
+        with self.open_cache("history", run_cfg) as c:
+            use_files = run_cfg is None or run_cfg.cache_backend != CacheBackends.MEMORY
+            history = HistoryStore(c, use_files=use_files)
             if clear_history:
                 logging.info("clearing history")
-            else:
-                logging.info(f"checking historical key: {bench_cfg_hash}")
-                if bench_cfg_hash in c:
-                    logging.info("loading historical data from cache")
-                    ds_old = c[bench_cfg_hash]
-                    dataset = xr.concat([ds_old, dataset], "over_time")
-                else:
-                    logging.info("did not detect any historical data")
+                history.clear(bench_cfg_hash)
 
             logging.info("saving data to history cache")
-            c[bench_cfg_hash] = dataset
-        return dataset
+            max_runs = None if run_cfg is None else run_cfg.history_max_runs
+            history.append(bench_cfg_hash, dataset, max_runs)
+
+            logging.info(f"loading historical data from key: {bench_cfg_hash}")
+            return history.load(bench_cfg_hash)
 
     def setup_dataset(
         self, bench_cfg: BenchCfg, time_src: datetime | str
-    ) -> tuple[BenchResult, List[tuple], List[str]]:
+    ) -> tuple[BenchResult, JobTable, List[str]]:
         """Initialize an n-dimensional xarray dataset from benchmark configuration parameters.
 
         This function creates the data structures needed to store benchmark results based on
@@ -779,9 +1152,9 @@ class Bench(BenchPlotServer):
             time_src (datetime | str): Timestamp or event name for the benchmark run
 
         Returns:
-            tuple[BenchResult, List[tuple], List[str]]:
-                - A BenchResult object with the initialized dataset
-                - A list of function input tuples (index, value pairs)
+            tuple[BenchResult, JobTable, List[str]]:
+                - A BenchResult object with the dataset coordinates and empty result buffers
+                - A table of the sweep points, which iterates over (index, value) tuples
                 - A list of dimension names for the dataset
         """
         if time_src is None:
@@ -796,38 +1169,33 @@ class Bench(BenchPlotServer):
             logging.info(i.sampling_str())
 
         dims_cfg = DimsCfg(bench_cfg)
-        function_inputs = list(
-            zip(product(*dims_cfg.dim_ranges_index), product(*dims_cfg.dim_ranges))
-        )
-        # xarray stores K N-dimensional arrays of data.  Each array is named and in this case we have an ND array for each result variable
-        data_vars = {}
+        job_table = JobTable(dims_cfg.dims_name, dims_cfg.dim_ranges)
+        # xarray stores K N-dimensional arrays of data.  Each array is named and in this case we have an ND array for each result variable.  Results are written straight into these numpy buffers and only wrapped in an xarray dataset once all the results are in
+        result_buffers = {}
         dataset_list = []
 
         for rv in bench_cfg.result_vars:
             if isinstance(rv, ResultVar):
-                result_data = np.full(dims_cfg.dims_size, np.nan, dtype=float)
-                data_vars[rv.name] = (dims_cfg.dims_name, result_data)
+                result_buffers[rv.name] = np.full(dims_cfg.dims_size, np.nan, dtype=float)
             if isinstance(rv, (ResultReference, ResultDataSet)):
-                result_data = np.full(dims_cfg.dims_size, -1, dtype=int)
-                data_vars[rv.name] = (dims_cfg.dims_name, result_data)
+                result_buffers[rv.name] = np.full(dims_cfg.dims_size, -1, dtype=int)
             if isinstance(
                 rv, (ResultPath, ResultVideo, ResultImage, ResultString, ResultContainer)
             ):
-                result_data = np.full(dims_cfg.dims_size, "NAN", dtype=object)
-                data_vars[rv.name] = (dims_cfg.dims_name, result_data)
+                result_buffers[rv.name] = np.full(dims_cfg.dims_size, "NAN", dtype=object)
 
             elif type(rv) is ResultVec:
                 for i in range(rv.size):
-                    result_data = np.full(dims_cfg.dims_size, np.nan)
-                    data_vars[rv.index_name(i)] = (dims_cfg.dims_name, result_data)
+                    result_buffers[rv.index_name(i)] = np.full(dims_cfg.dims_size, np.nan)
 
         bench_res = BenchResult(bench_cfg)
-        bench_res.ds = xr.Dataset(data_vars=data_vars, coords=dims_cfg.coords)
+        bench_res.ds = xr.Dataset(coords=dims_cfg.coords)
+        bench_res.result_buffers = result_buffers
         bench_res.ds_dynamic = self.ds_dynamic
         bench_res.dataset_list = dataset_list
         bench_res.setup_object_index()
 
-        return bench_res, function_inputs, dims_cfg.dims_name
+        return bench_res, job_table, dims_cfg.dims_name
 
     def define_const_inputs(self, const_vars: List[Tuple[param.Parameter, Any]]) -> Optional[dict]:
         """Convert constant variable tuples into a dictionary of name-value pairs.
@@ -910,51 +1278,267 @@ class Bench(BenchPlotServer):
         Returns:
             BenchResult: An object containing all the benchmark data and results
         """
-        bench_res, func_inputs, dims_name = self.setup_dataset(bench_cfg, time_src)
+        bench_res, job_table, dims_name = self.setup_dataset(bench_cfg, time_src)
         bench_res.bench_cfg.hmap_kdims = sorted(dims_name)
         constant_inputs = self.define_const_inputs(bench_res.bench_cfg.const_vars)
-        callcount = 1
+        if self.worker_class_instance is None:
+            worker = self.worker
+        elif self.sample_cache.executor_type == Executors.THREADS:
+            worker = ThreadLocalWorker(self.worker_class_instance)
+        elif self.sample_cache.executor_type == Executors.ASYNCIO:
+            worker = TaskLocalWorker(self.worker_class_instance)
+        else:
+            worker = self.worker
+        worker = WorkerKwargsFilter(worker, bench_res.bench_cfg)
 
-        results_list = []
-        jobs = []
+        job_table.setup_keys(
+            JobKeys(dims_name, constant_inputs, bench_res.bench_cfg.tag),
+            constant_inputs,
+            bench_cfg_sample_hash,
+        )
 
-        for idx_tuple, function_input_vars in func_inputs:
-            job = WorkerJob(
-                function_input_vars,
-                idx_tuple,
-                dims_name,
-                constant_inputs,
-                bench_cfg_sample_hash,
-                bench_res.bench_cfg.tag,
+        checkpoint = None
+        if bench_run_cfg.checkpoint_interval is not None:
+            checkpoint = SweepCheckpoint(
+                self.open_cache("checkpoints", bench_run_cfg),
+                bench_res.bench_cfg.hash_value,
+                bench_run_cfg.checkpoint_interval,
+                self.sample_cache.flush,
             )
-            job.setup_hashes()
-            jobs.append(job)
+            checkpoint.restore(bench_res, job_table)
 
-            jid = f"{bench_res.bench_cfg.title}:call {callcount}/{len(func_inputs)}"
-            worker = partial(worker_kwargs_wrapper, self.worker, bench_res.bench_cfg)
-            cache_job = Job(
-                job_id=jid,
+        grid_key = self.sweep_grid_key(
+            bench_res.bench_cfg, dims_name, constant_inputs, bench_run_cfg
+        )
+        sweep_consts = self.sweep_consts(constant_inputs, dims_name)
+        tag = bench_res.bench_cfg.tag
+        if grid_key is not None:
+            if grid_key not in self.result_index and bench_run_cfg.cache_results:
+                cached_grid = self.load_cached_sweep_grid(
+                    bench_cfg_sample_hash,
+                    dims_name,
+                    bench_res.result_buffers.keys(),
+                    sweep_consts,
+                    tag,
+                    bench_run_cfg,
+                )
+                if cached_grid is not None:
+                    self.result_index.add(grid_key, cached_grid)
+            reused = self.result_index.prefill(
+                bench_res.result_buffers, job_table, sweep_consts, grid_key, tag
+            )
+            logging.info(f"reused the results of {reused} points from earlier sweeps")
+            logging.info(self.result_index.stats())
+
+        def worker_jobs(rows):
+            # jobs are only created from the table as they are dispatched, points restored from a checkpoint are skipped
+            for row in rows:
+                if job_table.status[row] != JobTable.DONE:
+                    yield job_table.view(row)
+
+        def mark_done(worker_job: WorkerJob) -> None:
+            job_table.mark_done(worker_job.index_tuple)
+            if checkpoint is not None:
+                checkpoint.update(bench_res, job_table)
+
+        def cache_job(job: WorkerJob, callcount: int) -> Job:
+            return Job(
+                job_id=f"{bench_res.bench_cfg.title}:call {callcount}/{len(job_table)}",
                 function=worker,
                 job_args=job.function_input,
                 job_key=job.function_input_signature_pure,
                 tag=job.tag,
             )
-            result = self.sample_cache.submit(cache_job)
-            results_list.append(result)
-            callcount += 1
 
-            if bench_run_cfg.executor == Executors.SERIAL:
-                self.store_results(result, bench_res, job, bench_run_cfg)
+        def dispatch(rows) -> None:
+            if self.worker_class_instance is not None and hasattr(
+                self.worker_class_instance, "__call_batch__"
+            ):
+                call_batch = partial(
+                    worker_batch_kwargs_wrapper,
+                    self.worker_class_instance.__call_batch__,
+                    bench_res.bench_cfg,
+                )
+                jobs_iter = enumerate(worker_jobs(rows), 1)
+                while block := list(islice(jobs_iter, bench_run_cfg.call_batch_size)):
+                    results = self.sample_cache.submit_batch_call(
+                        [cache_job(job, callcount) for callcount, job in block], call_batch
+                    )
+                    self.store_results_block(results, bench_res, [job for _, job in block])
+                    for _, job in block:
+                        mark_done(job)
+            else:
+                # map each submitted cache job back to the worker job that describes where to store its result.  Entries are removed as results are stored so only the jobs that are in flight are kept alive
+                jobs_in_flight = {}
+
+                def cache_jobs():
+                    for callcount, job in enumerate(worker_jobs(rows), 1):
+                        c_job = cache_job(job, callcount)
+                        jobs_in_flight[c_job] = job
+                        yield c_job
+
+                for result in self.sample_cache.submit_many(
+                    cache_jobs(), bench_run_cfg.max_in_flight, bench_run_cfg.chunk_size
+                ):
+                    worker_job = jobs_in_flight.pop(result.job)
+                    self.store_results(result, bench_res, worker_job, bench_run_cfg)
+                    mark_done(worker_job)
+
+        sequential = None
+        if bench_run_cfg.repeats_tolerance is not None and bench_res.bench_cfg.repeats > 1:
+            sequential = SequentialRepeats(
+                job_table, bench_run_cfg.repeats_tolerance, bench_run_cfg.min_repeats
+            )
 
-        if bench_run_cfg.executor != Executors.SERIAL:
-            for job, res in zip(jobs, results_list):
-                self.store_results(res, bench_res, job, bench_run_cfg)
+        completed = False
+        try:
+            if sequential is None:
+                dispatch(range(len(job_table)))
+            else:
+                result_names = [
+                    rv.name for rv in bench_res.bench_cfg.result_vars if type(rv) is ResultVar
+                ]
+                for rows in sequential.rounds(bench_res.result_buffers, result_names):
+                    dispatch(rows)
+            completed = True
+        finally:
+            # write the results that are still buffered, so that they are not lost if the worker crashed
+            self.sample_cache.flush()
+            if checkpoint is not None:
+                if completed:
+                    checkpoint.clear()
+                else:
+                    checkpoint.save(bench_res, job_table)
+                checkpoint.cache.close()
+
+        # the repeats that a sweep with a tolerance did not run are left as NaN, so its results are not shared
+        if grid_key is not None and sequential is None:
+            self.result_index.add(
+                grid_key,
+                SweepGrid(
+                    dims_name, job_table.dim_ranges, bench_res.result_buffers, sweep_consts, tag
+                ),
+            )
 
+        self.buffers_to_dataset(bench_res, dims_name)
+        if sequential is not None:
+            bench_res.ds[REPEAT_COUNT] = (
+                [d for d in dims_name if d != "repeat"],
+                sequential.counts(),
+            )
         for inp in bench_res.bench_cfg.all_vars:
             self.add_metadata_to_dataset(bench_res, inp)
 
         return bench_res
 
+    def sweep_grid_key(
+        self,
+        bench_cfg: BenchCfg,
+        dims_name: List[str],
+        constant_inputs: dict,
+        bench_run_cfg: BenchRunCfg,
+    ) -> str | None:
+        """Get the key that the results of a sweep are stored under in the result index.
+
+        Runs of a sweep with the same title, tag, dimensions, result variables and constant inputs
+        have the same key, so the index keeps the largest of them, whatever its repeats.  Results
+        are only shared when the sample cache would return the same values or between the steps
+        of an adaptive sweep, and not for results that are stored outside the result buffers.
+
+        Args:
+            bench_cfg (BenchCfg): The configuration of the sweep
+            dims_name (List[str]): The names of the dimensions of the sweep
+            constant_inputs (dict): The inputs that are the same for every point
+            bench_run_cfg (BenchRunCfg): Configuration for how the benchmark is executed
+
+        Returns:
+            str | None: The key, or None if the sweep can not share results
+        """
+        # the steps of an adaptive sweep are parts of the same sweep, so they always share results
+        shared = reuses_sample_cache(bench_run_cfg) or bench_run_cfg.adaptive_samples is not None
+        if not (bench_run_cfg.reuse_sweep_results and shared) or bench_cfg.over_time:
+            return None
+        if bench_cfg.result_hmaps or any(
+            isinstance(rv, (ResultReference, ResultDataSet)) for rv in bench_cfg.result_vars
+        ):
+            return None
+        return hash_sha1(
+            (
+                bench_cfg.title,
+                bench_cfg.tag,
+                dims_name,
+                [rv.name for rv in bench_cfg.result_vars],
+                constant_inputs or {},
+            )
+        )
+
+    def sweep_consts(self, constant_inputs: dict | None, dims_name: List[str]) -> dict:
+        """Get the value of every worker input that is not a dimension of a sweep.
+
+        Inputs that are neither swept nor constant take the default value of the worker class, so
+        two sweeps that hold an input at its default share results whether or not they list it as
+        a constant.
+
+        Args:
+            constant_inputs (dict | None): The inputs that are held constant in the sweep
+            dims_name (List[str]): The names of the dimensions of the sweep
+
+        Returns:
+            dict: The value of each input that is not a dimension
+        """
+        consts = {}
+        if self.worker_class_instance is not None:
+            consts = {p.name: p.default for p in self.worker_class_instance.get_inputs_only()}
+        consts.update(constant_inputs or {})
+        return {name: value for name, value in consts.items() if name not in dims_name}
+
+    def load_cached_sweep_grid(
+        self,
+        bench_cfg_sample_hash: str,
+        dims_name: List[str],
+        result_names: Iterable[str],
+        consts: dict,
+        tag: str,
+        bench_run_cfg: BenchRunCfg,
+    ) -> SweepGrid | None:
+        """Load the latest cached result of the same sweep with any number of repeats as a grid.
+
+        The result cache is keyed by the number of repeats, so without this a sweep with more
+        repeats than a cached one would look up every point in the sample cache again.
+
+        Args:
+            bench_cfg_sample_hash (str): Hash of the benchmark configuration without repeats
+            dims_name (List[str]): The names of the dimensions of the new sweep
+            result_names (Iterable[str]): The names of the result buffers of the new sweep
+            consts (dict): The value of each worker input that is not a dimension
+            tag (str): The tag of the sweep
+            bench_run_cfg (BenchRunCfg): Configuration for how the benchmark is executed
+
+        Returns:
+            SweepGrid | None: The cached results, or None if there are none that fit the sweep
+        """
+        with self.open_cache("benchmark_inputs", bench_run_cfg) as c:
+            cached_hash = c.get(repeats_key(bench_cfg_sample_hash))
+            cached = None if cached_hash is None else c.get(cached_hash)
+        if isinstance(cached, StoredResult):
+            cached = cached.load()
+        if cached is None:
+            return None
+        logging.info(f"reusing the cached results of {cached.bench_cfg.repeats} repeats")
+        return SweepGrid.from_dataset(cached.ds, dims_name, result_names, consts, tag)
+
+    def buffers_to_dataset(self, bench_res: BenchResult, dims_name: List[str]) -> None:
+        """Move the result buffers that were filled during a sweep into the result dataset.
+
+        Args:
+            bench_res (BenchResult): The benchmark result holding the filled result buffers
+            dims_name (List[str]): The dimension names of the buffers, in index order
+        """
+        bench_res.ds = bench_res.ds.assign(
+            {name: (dims_name, buffer) for name, buffer in bench_res.result_buffers.items()}
+        )
+        bench_res.result_buffers = {}
+
     def store_results(
         self,
         job_result: JobFuture,
@@ -990,51 +1574,90 @@ class Bench(BenchPlotServer):
                 result_value = result_dict[rv.name]
                 if bench_run_cfg.print_bench_results:
                     logging.info(f"{rv.name}: {result_value}")
+                self.store_result_value(bench_res, rv, worker_job.index_tuple, result_value)
 
-                if isinstance(
-                    rv,
-                    (
-                        ResultVar,
-                        ResultVideo,
-                        ResultImage,
-                        ResultString,
-                        ResultContainer,
-                        ResultPath,
-                    ),
-                ):
-                    set_xarray_multidim(bench_res.ds[rv.name], worker_job.index_tuple, result_value)
-                elif isinstance(rv, ResultDataSet):
-                    bench_res.dataset_list.append(result_value)
-                    set_xarray_multidim(
-                        bench_res.ds[rv.name],
-                        worker_job.index_tuple,
-                        len(bench_res.dataset_list) - 1,
-                    )
-                elif isinstance(rv, ResultReference):
-                    bench_res.object_index.append(result_value)
-                    set_xarray_multidim(
-                        bench_res.ds[rv.name],
-                        worker_job.index_tuple,
-                        len(bench_res.object_index) - 1,
-                    )
-
-                elif isinstance(rv, ResultVec):
-                    if isinstance(result_value, (list, np.ndarray)):
-                        if len(result_value) == rv.size:
-                            for i in range(rv.size):
-                                set_xarray_multidim(
-                                    bench_res.ds[rv.index_name(i)],
-                                    worker_job.index_tuple,
-                                    result_value[i],
-                                )
-
-                else:
-                    raise RuntimeError("Unsupported result type")
             for rv in bench_res.result_hmaps:
                 bench_res.hmaps[rv.name][worker_job.canonical_input] = result_dict[rv.name]
 
             # bench_cfg.hmap = bench_cfg.hmaps[bench_cfg.result_hmaps[0].name]
 
+    def store_result_value(
+        self,
+        bench_res: BenchResult,
+        rv: ParametrizedSweep,
+        index_tuple: Tuple[int, ...],
+        result_value: Any,
+    ) -> None:
+        """Store a single value of a result variable into the benchmark result buffers.
+
+        Args:
+            bench_res (BenchResult): The benchmark result object to store results in
+            rv (ParametrizedSweep): The result variable the value belongs to
+            index_tuple (Tuple[int, ...]): The position of the value in the n-dimensional dataset
+            result_value (Any): The value returned by the worker
+
+        Raises:
+            RuntimeError: If an unsupported result variable type is encountered
+        """
+        if isinstance(
+            rv,
+            (
+                ResultVar,
+                ResultVideo,
+                ResultImage,
+                ResultString,
+                ResultContainer,
+                ResultPath,
+            ),
+        ):
+            bench_res.result_buffers[rv.name][index_tuple] = result_value
+        elif isinstance(rv, ResultDataSet):
+            bench_res.dataset_list.append(result_value)
+            bench_res.result_buffers[rv.name][index_tuple] = len(bench_res.dataset_list) - 1
+        elif isinstance(rv, ResultReference):
+            bench_res.object_index.append(result_value)
+            bench_res.result_buffers[rv.name][index_tuple] = len(bench_res.object_index) - 1
+
+        elif isinstance(rv, ResultVec):
+            if isinstance(result_value, (list, np.ndarray)):
+                if len(result_value) == rv.size:
+                    for i in range(rv.size):
+                        bench_res.result_buffers[rv.index_name(i)][index_tuple] = result_value[i]
+
+        else:
+            raise RuntimeError("Unsupported result type")
+
+    def store_results_block(
+        self,
+        job_results: List[JobFuture],
+        bench_res: BenchResult,
+        worker_jobs: List[WorkerJob],
+    ) -> None:
+        """Store the results of a block of worker jobs into the benchmark result dataset.
+
+        Scalar result variables are written into the result buffers as a single slab for the whole block.
+        Other result types are stored one point at a time.
+
+        Args:
+            job_results (List[JobFuture]): The futures containing the result of each job
+            bench_res (BenchResult): The benchmark result object to store results in
+            worker_jobs (List[WorkerJob]): The job metadata needed to index each result
+        """
+        results = [jr.result() for jr in job_results]
+        logging.info(f"{job_results[-1].job.job_id}: stored a block of {len(results)} results")
+        slab_index = tuple(np.array([job.index_tuple for job in worker_jobs]).T)
+
+        for rv in bench_res.bench_cfg.result_vars:
+            if type(rv) is ResultVar:
+                bench_res.result_buffers[rv.name][slab_index] = [res[rv.name] for res in results]
+            else:
+                for res, job in zip(results, worker_jobs):
+                    self.store_result_value(bench_res, rv, job.index_tuple, res[rv.name])
+
+        for rv in bench_res.result_hmaps:
+            for res, job in zip(results, worker_jobs):
+                bench_res.hmaps[rv.name][job.canonical_input] = res[rv.name]
+
     def init_sample_cache(self, run_cfg: BenchRunCfg) -> FutureCache:
         """Initialize the sample cache for storing benchmark function results.
 
@@ -1055,7 +1678,166 @@ class Bench(BenchPlotServer):
             tag_index=True,
             size_limit=self.cache_size,
             cache_results=run_cfg.cache_samples,
+            max_workers=run_cfg.max_workers,
+            executor_pool=self.executor_pool,
+            write_batch_size=run_cfg.cache_write_batch_size,
+            cache_backend=run_cfg.cache_backend,
+            memory_size_limit=run_cfg.cache_memory_size_limit,
+            memory_max_items=run_cfg.cache_memory_max_items,
+        )
+
+    def open_cache(self, name: str, run_cfg: BenchRunCfg = None) -> CacheBackend:
+        """Open one of the caches that benchmark results and history are stored in.
+
+        Args:
+            name (str): The name of the cache
+            run_cfg (BenchRunCfg, optional): Selects the cache backend and the size of its memory
+                tier. If None, the cache is opened on disk. Defaults to None.
+
+        Returns:
+            CacheBackend: The opened cache, to be used as a context manager
+        """
+        if run_cfg is None:
+            return open_cache(name, size_limit=self.cache_size)
+        return open_cache(
+            name,
+            run_cfg.cache_backend,
+            size_limit=self.cache_size,
+            memory_size_limit=run_cfg.cache_memory_size_limit,
+            memory_max_items=run_cfg.cache_memory_max_items,
+        )
+
+    def collect_artifacts(self, run_cfg: BenchRunCfg = None) -> int:
+        """Delete the stored artifacts that no cached sample, result or history refers to.
+
+        The caches are first trimmed to their size limits, so that the artifacts of the entries
+        they evict are deleted as well.  Use StorageManager to account for every file in cachedir.
+
+        Args:
+            run_cfg (BenchRunCfg, optional): Selects the cache backend. If None, the caches on
+                disk are used. Defaults to None.
+
+        Returns:
+            int: The number of bytes that were freed
+        """
+        if self.sample_cache is not None:
+            self.sample_cache.flush()
+        backend = CacheBackends.DISK if run_cfg is None else run_cfg.cache_backend
+        manager = StorageManager(
+            self.cache_size, file_dirs=[ARTIFACT_DIR], cache_backend=backend, media_dirs=[]
+        )
+        return manager.gc()
+
+    def sweep_keys(self, bench_cfg: BenchCfg, run_cfg: BenchRunCfg) -> Tuple[str, List[str]]:
+        """Get the keys that a sweep stores its result and samples under.
+
+        Args:
+            bench_cfg (BenchCfg): The configuration of the sweep, with the inputs at the level it is run at
+            run_cfg (BenchRunCfg): Configuration for how the sweep is run
+
+        Returns:
+            Tuple[str, List[str]]: The key of the result in benchmark_inputs and the keys of the
+                samples in sample_cache
+        """
+        bench_cfg = deepcopy(bench_cfg)
+        bench_cfg.param.update(run_cfg.param.values())
+        _, job_table, dims_name = self.setup_dataset(bench_cfg, run_cfg.time_event)
+        constant_inputs = self.define_const_inputs(bench_cfg.const_vars)
+        job_table.setup_keys(
+            JobKeys(dims_name, constant_inputs, bench_cfg.tag),
+            constant_inputs,
+            bench_cfg.hash_persistent(False),
         )
+        return bench_cfg.hash_persistent(True), [key.decode() for key in job_table.keys]
+
+    def warmup(
+        self,
+        tag: str = None,
+        bench_cfg: BenchCfg = None,
+        levels: Iterable[int] = None,
+        run_cfg: BenchRunCfg = None,
+    ) -> List[Future]:
+        """Load cached samples and results into the memory tier of the caches in the background.
+
+        Either every sample and result with a tag is loaded, or the ones of a sweep at each of a
+        range of levels, so that the plot_sweep calls that follow are served from memory instead of
+        reading each entry from disk as it is needed.  Only the TIERED cache backend has a memory
+        tier to load into.  Results whose dataset is stored in a NetCDF file are loaded without
+        their dataset, which is still read from its file when the result is plotted.
+
+        Args:
+            tag (str, optional): Load the entries with this tag. Defaults to None.
+            bench_cfg (BenchCfg, optional): Load the entries of this sweep, as returned by
+                sweep_cfg. Defaults to None.
+            levels (Iterable[int], optional): The levels to load the sweep at. Defaults to the
+                level of the run configuration.
+            run_cfg (BenchRunCfg, optional): Selects the cache backend, the size of the memory tier
+                and the number of threads. Defaults to the run configuration of the bench.
+
+        Returns:
+            List[Future]: The loading tasks, each returns the number of entries it loaded
+        """
+        if run_cfg is None:
+            run_cfg = BenchRunCfg() if self.run_cfg is None else self.run_cfg
+        if run_cfg.cache_backend != CacheBackends.TIERED:
+            logging.info("warmup needs the TIERED cache backend, nothing was loaded")
+            return []
+        if (tag is None) == (bench_cfg is None):
+            raise ValueError("pass either a tag or a bench_cfg to warmup")
+
+        keys = {"sample_cache": [], "benchmark_inputs": []}
+        if bench_cfg is None:
+            for name, names_keys in keys.items():
+                with self.open_cache(name, run_cfg) as c:
+                    names_keys.extend(c.tagged_keys(tag))
+        else:
+            for level in [run_cfg.level] if levels is None else levels:
+                cfg = deepcopy(bench_cfg)
+                if level > 0:
+                    cfg.input_vars = [i.with_level(level) for i in cfg.input_vars]
+                result_key, sample_keys = self.sweep_keys(cfg, run_cfg)
+                keys["benchmark_inputs"].append(result_key)
+                keys["sample_cache"].extend(sample_keys)
+
+        workers = run_cfg.max_workers or os.cpu_count() or 1
+        futures = []
+        executor = ThreadPoolExecutor(workers)
+        for name, names_keys in keys.items():
+            # the levels of a sweep share samples, which only need loading once
+            names_keys = list(dict.fromkeys(names_keys))
+            chunk_size = max(1, -(-len(names_keys) // workers))
+            for i in range(0, len(names_keys), chunk_size):
+                futures.append(
+                    executor.submit(
+                        self.prefetch_cache, name, names_keys[i : i + chunk_size], tag, run_cfg
+                    )
+                )
+        executor.shutdown(wait=False)
+        return futures
+
+    def prefetch_cache(self, name: str, keys: List[str], tag: str, run_cfg: BenchRunCfg) -> int:
+        """Copy entries of a tiered cache from disk into memory.
+
+        Args:
+            name (str): The name of the cache
+            keys (List[str]): The keys of the entries
+            tag (str): Only copy the entries with this tag, or every entry if None
+            run_cfg (BenchRunCfg): Configuration with the size of the memory tier
+
+        Returns:
+            int: The number of entries that were copied
+        """
+        with open_cache(
+            name,
+            CacheBackends.TIERED,
+            size_limit=self.cache_size,
+            memory_size_limit=run_cfg.cache_memory_size_limit,
+            memory_max_items=run_cfg.cache_memory_max_items,
+            tag_index=name == "sample_cache",
+        ) as c:
+            count = c.prefetch(keys, tag)
+        logging.info(f"loaded {count} entries of {name} into memory")
+        return count
 
     def clear_tag_from_sample_cache(self, tag: str, run_cfg: BenchRunCfg) -> None:
         """Clear all samples from the cache that match a specific tag.
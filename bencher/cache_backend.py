@@ -0,0 +1,358 @@
+from __future__ import annotations
+from typing import Any, ContextManager, Iterable, Iterator, List, Protocol
+from collections import OrderedDict
+from contextlib import contextmanager
+from enum import auto
+import logging
+import pickle
+import threading
+
+from diskcache import Cache
+from diskcache.core import ENOVAL
+from strenum import StrEnum
+
+
+class CacheBackend(Protocol):
+    """The interface bencher uses to store samples, results and history.
+
+    It is the subset of the diskcache.Cache interface that bencher relies on, so a diskcache Cache
+    is a valid backend as it is.
+    """
+
+    directory: str
+
+    def get(self, key: str, default: Any = None) -> Any: ...
+
+    def set(self, key: str, value: Any, tag: str = None) -> bool: ...
+
+    def delete(self, key: str) -> bool: ...
+
+    def evict(self, tag: str) -> int: ...
+
+    def clear(self) -> int: ...
+
+    def volume(self) -> int: ...
+
+    def cull(self) -> int: ...
+
+    def transact(self) -> ContextManager: ...
+
+    def close(self) -> None: ...
+
+    def __contains__(self, key: str) -> bool: ...
+
+    def __getitem__(self, key: str) -> Any: ...
+
+    def __setitem__(self, key: str, value: Any) -> None: ...
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[str]: ...
+
+    def __enter__(self) -> CacheBackend: ...
+
+    def __exit__(self, *exc) -> None: ...
+
+
+class CacheBackends(StrEnum):
+    """Enumeration of the available cache backends."""
+
+    DISK = auto()  # persistent between runs, the default
+    MEMORY = auto()  # in process only, lost when the process exits
+    TIERED = auto()  # an in process LRU tier over the disk cache
+
+
+class MemoryCache:
+    """An in-process cache that evicts the least recently used entries.
+
+    Values are stored pickled, like the disk cache does, so that later changes to an object do not
+    change the cached copy and the size of each entry is known.  Entries are evicted when the total
+    size exceeds size_limit bytes or the number of entries exceeds max_items.
+
+    Attributes:
+        directory (str): A name for the cache, used for logging
+        size_limit (int): The maximum total size of the pickled values in bytes, or None
+        max_items (int): The maximum number of entries, or None
+    """
+
+    def __init__(self, name: str = "memory", size_limit: int = None, max_items: int = None):
+        self.directory = f"memory:{name}"
+        self.size_limit = size_limit
+        self.max_items = max_items
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.RLock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            self.entries.move_to_end(key)
+        return pickle.loads(entry[0])
+
+    def set(self, key: str, value: Any, tag: str = None) -> bool:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.delete(key)
+            self.entries[key] = (data, tag)
+            self.size += len(data)
+            self.trim()
+        return True
+
+    def trim(self) -> None:
+        """Evict the least recently used entries until the cache is within its limits."""
+        with self.lock:
+            while self.entries and (
+                (self.size_limit is not None and self.size > self.size_limit)
+                or (self.max_items is not None and len(self.entries) > self.max_items)
+            ):
+                _, (data, _) = self.entries.popitem(last=False)
+                self.size -= len(data)
+
+    def delete(self, key: str) -> bool:
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return False
+            self.size -= len(entry[0])
+            return True
+
+    def evict(self, tag: str) -> int:
+        with self.lock:
+            keys = [k for k, (_, t) in self.entries.items() if t == tag]
+            for k in keys:
+                self.delete(k)
+            return len(keys)
+
+    def clear(self) -> int:
+        with self.lock:
+            count = len(self.entries)
+            self.entries.clear()
+            self.size = 0
+            return count
+
+    def volume(self) -> int:
+        return self.size
+
+    def cull(self) -> int:
+        count = len(self.entries)
+        self.trim()
+        return count - len(self.entries)
+
+    @contextmanager
+    def transact(self):
+        with self.lock:
+            yield
+
+    def close(self) -> None:
+        """Does nothing, the entries are kept for the rest of the process."""
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, default=ENOVAL)
+        if value is ENOVAL:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        with self.lock:
+            return iter(list(self.entries))
+
+    def __enter__(self) -> MemoryCache:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TieredCache:
+    """A memory cache in front of a disk cache.
+
+    Writes go to both tiers.  Reads are served from memory when possible, and values read from
+    disk are copied into memory so that repeated reads avoid the disk.  The disk tier is the
+    source of truth for the size and length of the cache.
+
+    Attributes:
+        memory (MemoryCache): The fast tier
+        disk (Cache): The persistent tier
+    """
+
+    def __init__(self, memory: MemoryCache, disk: Cache):
+        self.memory = memory
+        self.disk = disk
+        self.directory = disk.directory
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.memory.get(key, default=ENOVAL)
+        if value is ENOVAL:
+            value, tag = self.disk.get(key, default=ENOVAL, tag=True)
+            if value is ENOVAL:
+                return default
+            self.memory.set(key, value, tag=tag)
+        return value
+
+    def set(self, key: str, value: Any, tag: str = None) -> bool:
+        self.memory.set(key, value, tag=tag)
+        return self.disk.set(key, value, tag=tag)
+
+    def delete(self, key: str) -> bool:
+        self.memory.delete(key)
+        return self.disk.delete(key)
+
+    def evict(self, tag: str) -> int:
+        self.memory.evict(tag)
+        return self.disk.evict(tag)
+
+    def clear(self) -> int:
+        self.memory.clear()
+        return self.disk.clear()
+
+    def volume(self) -> int:
+        return self.disk.volume()
+
+    def cull(self) -> int:
+        self.memory.cull()
+        return self.disk.cull()
+
+    def transact(self) -> ContextManager:
+        return self.disk.transact()
+
+    def close(self) -> None:
+        self.disk.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.memory or key in self.disk
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, default=ENOVAL)
+        if value is ENOVAL:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self.disk)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.disk)
+
+    def tagged_keys(self, tag: str) -> List[str]:
+        """Get the keys of the entries with a tag without reading their values.
+
+        Args:
+            tag (str): The tag
+
+        Returns:
+            List[str]: The keys of the entries with the tag
+        """
+        # diskcache has no public way to select by tag, the query uses the tag index when there is one
+        rows = self.disk._sql(  # pylint: disable=protected-access
+            "SELECT key FROM Cache WHERE tag = ?", (tag,)
+        ).fetchall()
+        return [key for (key,) in rows]
+
+    def prefetch(self, keys: Iterable[str], tag: str = None) -> int:
+        """Copy entries from disk into memory, so that reading them later does not touch the disk.
+
+        Entries that can not be read are skipped.
+
+        Args:
+            keys (Iterable[str]): The keys of the entries
+            tag (str, optional): Only copy the entries with this tag. Defaults to None.
+
+        Returns:
+            int: The number of entries that were copied
+        """
+        count = 0
+        for key in keys:
+            if key in self.memory:
+                continue
+            try:
+                value, entry_tag = self.disk.get(key, default=ENOVAL, tag=True)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # entries pickled by other versions of a class can fail to load
+                logging.warning(f"could not read {self.directory} entry {key}: {e}")
+                continue
+            if value is not ENOVAL and (tag is None or entry_tag == tag):
+                self.memory.set(key, value, tag=entry_tag)
+                count += 1
+        return count
+
+    def __enter__(self) -> TieredCache:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# memory caches live for the whole process so that they are shared by every Bench and sweep
+memory_caches = {}
+
+
+def memory_cache(name: str, size_limit: int = None, max_items: int = None) -> MemoryCache:
+    """Get the process wide memory cache with a name, creating it on first use.
+
+    Args:
+        name (str): The name of the cache
+        size_limit (int, optional): The maximum size of the cache in bytes. Defaults to None.
+        max_items (int, optional): The maximum number of entries in the cache. Defaults to None.
+
+    Returns:
+        MemoryCache: The memory cache, trimmed to the requested limits
+    """
+    if name not in memory_caches:
+        memory_caches[name] = MemoryCache(name, size_limit, max_items)
+    cache = memory_caches[name]
+    cache.size_limit = size_limit
+    cache.max_items = max_items
+    cache.trim()
+    return cache
+
+
+def open_cache(
+    name: str,
+    backend: CacheBackends = CacheBackends.DISK,
+    size_limit: int = int(20e9),
+    memory_size_limit: int = None,
+    memory_max_items: int = None,
+    tag_index: bool = False,
+) -> CacheBackend:
+    """Open one of the caches that bencher stores its data in.
+
+    Args:
+        name (str): The name of the cache, the disk cache is stored in cachedir/<name>
+        backend (CacheBackends, optional): Where the cache is stored. Defaults to CacheBackends.DISK.
+        size_limit (int, optional): The maximum size of the disk cache in bytes. If None the size
+            limit the cache was last opened with is kept. Defaults to 20GB.
+        memory_size_limit (int, optional): The maximum size of the memory cache in bytes. If None
+            the size is not limited. Defaults to None.
+        memory_max_items (int, optional): The maximum number of entries in the memory cache. If
+            None the number of entries is not limited. Defaults to None.
+        tag_index (bool, optional): Whether to add an index of tags to the disk cache, which makes
+            evicting a tag fast.  An index that already exists is kept, so caches can be opened
+            for reading without removing it. Defaults to False.
+
+    Returns:
+        CacheBackend: The opened cache
+    """
+    if backend == CacheBackends.MEMORY:
+        return memory_cache(name, memory_size_limit, memory_max_items)
+    # diskcache saves the settings it is opened with, so settings that are not given are left out to keep the saved ones.  Opening with tag_index=False would drop an existing tag index
+    settings = {"tag_index": True} if tag_index else {}
+    if size_limit is not None:
+        settings["size_limit"] = size_limit
+    disk = Cache(f"cachedir/{name}", **settings)
+    if backend == CacheBackends.TIERED:
+        return TieredCache(memory_cache(name, memory_size_limit, memory_max_items), disk)
+    return disk
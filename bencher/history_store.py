@@ -0,0 +1,230 @@
+from __future__ import annotations
+from typing import Any, List
+from uuid import uuid4
+import os
+
+import xarray as xr
+
+from bencher.cache_backend import CacheBackend, open_cache
+from bencher.result_store import StoredDataset, StoredResult, save_dataset
+
+# the datasets of each run of an over_time benchmark are stored next to the caches in cachedir
+HISTORY_DIR = "cachedir/history_datasets"
+
+# the history each benchmark was last loaded with in this process, so that loading it again after
+# a new run only opens the new partition.  Maps (directory, use_files, key) to the id of the
+# history, its runs, the length of each run along over_time and the loaded dataset
+loaded_histories = {}
+
+
+class HistoryStore:
+    """An append only store of the over_time history of benchmarks, partitioned by run.
+
+    Each run of a benchmark adds one partition holding only the new over_time slice, so saving a
+    run does not read or rewrite the history before it.  The partitions are saved as NetCDF files
+    when possible and opened lazily when the history is loaded.  The cache holds the list of runs
+    of each benchmark and a record of each partition.  The history that was last loaded is kept in
+    memory, so loading it again after a run only opens the partitions that were added since.
+
+    Attributes:
+        cache (CacheBackend): The cache holding the list of runs and the partition records
+        directory (str): The directory the NetCDF files are stored in
+        use_files (bool): Whether partitions are saved as NetCDF files.  If False, or if a
+            partition can not be saved as NetCDF, the dataset is stored in the cache
+    """
+
+    def __init__(
+        self, cache: CacheBackend, directory: str = HISTORY_DIR, use_files: bool = True
+    ) -> None:
+        self.cache = cache
+        self.directory = directory
+        self.use_files = use_files
+
+    def partition_key(self, key: str, run: int) -> str:
+        return f"{key}/{run}"
+
+    def history_id(self, key: str) -> str:
+        """Get the id of the history of a benchmark, which changes when the history is cleared.
+
+        Args:
+            key (str): The hash of the benchmark configuration
+
+        Returns:
+            str: The id of the history
+        """
+        history_id = self.cache.get(f"{key}/id")
+        if history_id is None:
+            history_id = uuid4().hex
+            self.cache[f"{key}/id"] = history_id
+        return history_id
+
+    def runs(self, key: str) -> List[int]:
+        """Get the runs stored for a benchmark, oldest first.
+
+        Args:
+            key (str): The hash of the benchmark configuration
+
+        Returns:
+            List[int]: The run numbers
+        """
+        runs = self.cache.get(key)
+        if isinstance(runs, xr.Dataset):
+            # older versions stored the whole history as a single dataset, so make it the first run
+            self.save_partition(key, 0, runs)
+            runs = [0]
+            self.cache[key] = runs
+        return [] if runs is None else runs
+
+    def save_partition(self, key: str, run: int, ds: xr.Dataset) -> None:
+        path = os.path.join(self.directory, key, f"{run}.nc")
+        if self.use_files and save_dataset(ds, path):
+            self.cache[self.partition_key(key, run)] = StoredDataset(path, ds)
+        else:
+            self.cache[self.partition_key(key, run)] = ds
+
+    def delete_partition(self, key: str, run: int) -> None:
+        partition = self.cache.get(self.partition_key(key, run))
+        if isinstance(partition, StoredDataset):
+            partition.delete()
+        self.cache.delete(self.partition_key(key, run))
+
+    def append(self, key: str, ds: xr.Dataset, max_runs: int = None) -> int:
+        """Add the over_time slice of a new run to the history of a benchmark.
+
+        Args:
+            key (str): The hash of the benchmark configuration
+            ds (xr.Dataset): The results of the new run
+            max_runs (int, optional): The maximum number of runs to keep, the oldest runs are
+                removed first. If None every run is kept. Defaults to None.
+
+        Returns:
+            int: The number of the new run
+        """
+        with self.cache.transact():
+            runs = self.runs(key)
+            run = runs[-1] + 1 if runs else 0
+            self.save_partition(key, run, ds)
+            self.cache[key] = runs + [run]
+        if max_runs is not None:
+            self.retain(key, max_runs)
+        return run
+
+    def retain(self, key: str, max_runs: int) -> None:
+        """Remove the oldest runs of a benchmark so that at most max_runs are kept.
+
+        Args:
+            key (str): The hash of the benchmark configuration
+            max_runs (int): The number of runs to keep
+        """
+        with self.cache.transact():
+            runs = self.runs(key)
+            if len(runs) <= max_runs:
+                return
+            for run in runs[:-max_runs]:
+                self.delete_partition(key, run)
+            self.cache[key] = runs[-max_runs:]
+
+    def clear(self, key: str) -> None:
+        """Remove every run of a benchmark.
+
+        Args:
+            key (str): The hash of the benchmark configuration
+        """
+        with self.cache.transact():
+            for run in self.runs(key):
+                self.delete_partition(key, run)
+            self.cache.delete(key)
+            self.cache.delete(f"{key}/id")
+        loaded_histories.pop((self.directory, self.use_files, key), None)
+
+    def load(self, key: str, runs: List[int] = None) -> xr.Dataset | None:
+        """Load the history of a benchmark by concatenating its runs along over_time.
+
+        The runs that were already loaded by this process are taken from memory, so only the
+        partitions of newer runs are opened.
+
+        Args:
+            key (str): The hash of the benchmark configuration
+            runs (List[int], optional): The runs to load, the ones that are no longer stored are
+                left out. Defaults to every stored run.
+
+        Returns:
+            xr.Dataset: The history, or None if no runs are stored
+        """
+        stored = self.runs(key)
+        runs = stored if runs is None else [run for run in runs if run in stored]
+        history_id = self.history_id(key)
+        memo_key = (self.directory, self.use_files, key)
+        loaded_id, loaded_runs, lengths, loaded = loaded_histories.get(
+            memo_key, (None, [], [], None)
+        )
+
+        # the oldest runs that were loaded may have been removed since, but the rest can be reused
+        kept = 0
+        if loaded_id == history_id:
+            while kept < len(loaded_runs) and runs[: len(loaded_runs) - kept] != loaded_runs[kept:]:
+                kept += 1
+        else:
+            kept = len(loaded_runs)
+        datasets, new_runs, new_lengths = [], loaded_runs[kept:], lengths[kept:]
+        if new_runs:
+            datasets.append(loaded.isel(over_time=slice(sum(lengths[:kept]), None)))
+
+        for run in runs[len(new_runs) :]:
+            partition = self.cache.get(self.partition_key(key, run))
+            if isinstance(partition, StoredDataset):
+                partition = partition.load()
+            if partition is not None:
+                datasets.append(partition)
+                new_runs.append(run)
+                new_lengths.append(partition.sizes["over_time"])
+        if not datasets:
+            loaded_histories.pop(memo_key, None)
+            return None
+        ds = xr.concat(datasets, "over_time")
+        loaded_histories[memo_key] = (history_id, new_runs, new_lengths, ds)
+        return ds.copy(deep=False)
+
+
+class HistoryResult(StoredResult):
+    """The cache record of an over_time BenchResult whose history is stored in a HistoryStore.
+
+    Only the dataset of the run that made the result is saved with the record, together with the
+    runs of the history it was plotted with, so saving a result does not rewrite the history.  The
+    history is loaded again from its partitions when the result is loaded.
+
+    Attributes:
+        key (str): The hash of the benchmark configuration the history is stored under
+        runs (List[int]): The runs of the history when the result was saved
+    """
+
+    def __init__(
+        self, bench_res: Any, path: str, ds: xr.Dataset, key: str, runs: List[int]
+    ) -> None:
+        """Make the cache record of an over_time result.
+
+        Args:
+            bench_res (BenchResult): The result without its dataset
+            path (str): The path of the NetCDF file the dataset of the run was saved to
+            ds (xr.Dataset): The dataset of the run that made the result
+            key (str): The hash of the benchmark configuration the history is stored under
+            runs (List[int]): The runs of the history when the result was saved
+        """
+        super().__init__(bench_res, path, ds)
+        self.key = key
+        self.runs = runs
+
+    def load(self) -> Any:
+        """Load the result with the runs of its history that are still stored.
+
+        Returns:
+            BenchResult: The result, or None if the dataset of its run no longer exists
+        """
+        bench_res = super().load()
+        if bench_res is None:
+            return None
+        with open_cache("history", bench_res.bench_cfg.cache_backend) as c:
+            ds = HistoryStore(c).load(self.key, self.runs)
+        if ds is not None:
+            bench_res.ds = ds
+        return bench_res
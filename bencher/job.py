@@ -1,8 +1,27 @@
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, Iterable, Iterator, List, Tuple
+import asyncio
+from contextlib import suppress
+import concurrent.futures
+import importlib
+import inspect
 import logging
-from diskcache import Cache
-from concurrent.futures import Future, ProcessPoolExecutor
+import threading
+import time
+from itertools import islice
+import numpy as np
+from diskcache.core import ENOVAL
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    as_completed,
+    wait,
+)
+from .cache_backend import CacheBackend, CacheBackends, open_cache
+from .storage_manager import StorageManager
 from .utils import hash_sha1
 from strenum import StrEnum
 from enum import auto
@@ -61,17 +80,28 @@ class JobFuture:
         job (Job): The job this future corresponds to
         res (dict): The result, if available immediately
         future (Future): The future representing the pending job, if executed asynchronously
-        cache: The cache to store results in when they become available
+        cache: The cache to store results in when they become available, a CacheBackend or a
+            CacheWriteBuffer
+        chunk_index (int): The position of this job in the results of a chunked task, if any
     """
 
-    def __init__(self, job: Job, res: dict = None, future: Future = None, cache=None) -> None:
+    def __init__(
+        self,
+        job: Job,
+        res: dict = None,
+        future: Future = None,
+        cache=None,
+        chunk_index: int = None,
+    ) -> None:
         """Initialize a JobFuture with either an immediate result or a future.
 
         Args:
             job (Job): The job this future corresponds to
             res (dict, optional): The immediate result, if available. Defaults to None.
             future (Future, optional): The future representing the pending result. Defaults to None.
-            cache (Cache, optional): The cache to store results in. Defaults to None.
+            cache (CacheBackend | CacheWriteBuffer, optional): The cache to store results in. Defaults to None.
+            chunk_index (int, optional): The position of this job in the results of a task that
+                ran a chunk of jobs. Defaults to None.
 
         Raises:
             AssertionError: If neither res nor future is provided
@@ -85,6 +115,7 @@ class JobFuture:
         )
 
         self.cache = cache
+        self.chunk_index = chunk_index
 
     def result(self) -> dict:
         """Get the job result, waiting for completion if necessary.
@@ -98,6 +129,8 @@ class JobFuture:
         """
         if self.future is not None:
             self.res = self.future.result()
+            if self.chunk_index is not None:
+                self.res = self.res[0][self.chunk_index]
         if self.cache is not None and self.res is not None:
             self.cache.set(self.job.job_key, self.res, tag=self.job.tag)
         return self.res
@@ -108,6 +141,9 @@ def run_job(job: Job) -> dict:
 
     This is a helper function used primarily by executors to run jobs.
 
+    If the function is a coroutine function, the coroutine it returns is run to completion on a
+    new event loop.  Use Executors.ASYNCIO to run coroutine workers concurrently instead.
+
     Args:
         job (Job): The job to execute
 
@@ -115,9 +151,200 @@ def run_job(job: Job) -> dict:
         dict: The result of the job execution
     """
     result = job.function(**job.job_args)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
     return result
 
 
+def run_job_chunk(jobs: List[Job]) -> Tuple[List[dict], float]:
+    """Execute several jobs in a single task and measure the mean time of each call.
+
+    Args:
+        jobs (List[Job]): The jobs to execute
+
+    Returns:
+        Tuple[List[dict], float]: The result of each job and the mean call latency in seconds
+    """
+    start = time.perf_counter()
+    results = [run_job(job) for job in jobs]
+    return results, (time.perf_counter() - start) / len(jobs)
+
+
+def split_result_columns(result_columns: dict, count: int) -> List[dict]:
+    """Split the result columns returned by a vectorised function into one result per job.
+
+    Args:
+        result_columns (dict): A column of values for each result name
+        count (int): The number of jobs in the batch
+
+    Returns:
+        List[dict]: The result of each job
+    """
+    return [{k: v[row] for k, v in result_columns.items()} for row in range(count)]
+
+
+def run_batch_call(call_batch: Callable[..., dict], columns: dict) -> Tuple[List[dict], float]:
+    """Call a vectorised function with columns of arguments and split its results per job.
+
+    Args:
+        call_batch (Callable[..., dict]): A function that takes columns of arguments as keyword
+            arguments and returns a dictionary of result columns
+        columns (dict): An array of values for each argument name
+
+    Returns:
+        Tuple[List[dict], float]: The result of each job and the mean call latency in seconds
+    """
+    start = time.perf_counter()
+    result_columns = call_batch(**columns)
+    if inspect.isawaitable(result_columns):
+        result_columns = asyncio.run(result_columns)
+    count = len(next(iter(columns.values())))
+    return (
+        split_result_columns(result_columns, count),
+        (time.perf_counter() - start) / count,
+    )
+
+
+async def run_batch_call_async(
+    call_batch: Callable[..., dict], columns: dict
+) -> Tuple[List[dict], float]:
+    """The same as run_batch_call, awaiting call_batch on the running event loop of the executor.
+
+    Args:
+        call_batch (Callable[..., dict]): A function that takes columns of arguments as keyword
+            arguments and returns a dictionary of result columns, or a coroutine of one
+        columns (dict): An array of values for each argument name
+
+    Returns:
+        Tuple[List[dict], float]: The result of each job and the mean call latency in seconds
+    """
+    start = time.perf_counter()
+    result_columns = call_batch(**columns)
+    if inspect.isawaitable(result_columns):
+        result_columns = await result_columns
+    count = len(next(iter(columns.values())))
+    return (
+        split_result_columns(result_columns, count),
+        (time.perf_counter() - start) / count,
+    )
+
+
+class ChunkSizer:
+    """Decides how many jobs are sent to a worker in a single task.
+
+    With a fixed chunk size every task holds that many jobs.  With a chunk size of 0 the size is
+    picked automatically: the first task holds a single job to measure the latency of a call, and
+    after that each task holds enough jobs to take about target_task_time seconds.  The measured
+    latency is smoothed so that the size follows workers whose cost changes during a sweep.
+
+    Attributes:
+        chunk_size (int): The fixed chunk size, or 0 for automatic sizing
+        target_task_time (float): The duration in seconds to aim for with automatic sizing
+        max_chunk_size (int): The largest chunk that automatic sizing will pick
+        call_latency (float): The smoothed latency of a single call in seconds
+    """
+
+    def __init__(
+        self, chunk_size: int = 1, target_task_time: float = 0.05, max_chunk_size: int = 256
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.target_task_time = target_task_time
+        self.max_chunk_size = max_chunk_size
+        self.call_latency = None
+
+    @property
+    def auto(self) -> bool:
+        return self.chunk_size == 0
+
+    def size(self) -> int:
+        """Get the number of jobs to put in the next task.
+
+        Returns:
+            int: The chunk size
+        """
+        if not self.auto:
+            return self.chunk_size
+        if self.call_latency is None:
+            return 1
+        if self.call_latency <= 0:
+            return self.max_chunk_size
+        return int(min(max(self.target_task_time / self.call_latency, 1), self.max_chunk_size))
+
+    def record(self, call_latency: float) -> None:
+        """Update the latency estimate with a measurement from a completed task.
+
+        Args:
+            call_latency (float): The mean latency of the calls in the task in seconds
+        """
+        if self.call_latency is None:
+            self.call_latency = call_latency
+        else:
+            self.call_latency = 0.8 * self.call_latency + 0.2 * call_latency
+
+
+class AsyncioExecutor(Executor):
+    """An executor that runs coroutine workers concurrently on a single event loop.
+
+    The event loop runs in a background thread.  Each submitted function is called on the loop
+    and if it returns an awaitable it is awaited there, so up to max_workers coroutines make
+    progress at the same time.  Plain functions are called on the loop as well, which blocks it
+    while they run.  submit() returns a concurrent.futures.Future like the other executors.
+
+    Attributes:
+        max_workers (int): The maximum number of submitted calls that run at the same time
+        loop (asyncio.AbstractEventLoop): The event loop the calls run on
+    """
+
+    def __init__(self, max_workers: int = None) -> None:
+        """Start the event loop thread.
+
+        Args:
+            max_workers (int, optional): The maximum number of calls that run at the same time. If
+                None, defaults to 32.
+        """
+        self.max_workers = 32 if max_workers is None else max_workers
+        self.loop = asyncio.new_event_loop()
+        self.semaphore = asyncio.Semaphore(self.max_workers)
+        self.futures = set()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    async def _run(self, fn: Callable, args: tuple, kwargs: dict):
+        async with self.semaphore:
+            result = fn(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        if self.loop.is_closed():
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future = asyncio.run_coroutine_threadsafe(self._run(fn, args, kwargs), self.loop)
+        with self.lock:
+            self.futures.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: Future) -> None:
+        with self.lock:
+            self.futures.discard(future)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:  # pylint: disable=redefined-outer-name
+        if self.loop.is_closed():
+            return
+        with self.lock:
+            futures = list(self.futures)
+        if cancel_futures:
+            for future in futures:
+                future.cancel()
+        if wait:
+            concurrent.futures.wait(futures)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
 class Executors(StrEnum):
     """Enumeration of available execution strategies for benchmark jobs.
 
@@ -128,24 +355,195 @@ class Executors(StrEnum):
     SERIAL = auto()  # slow but reliable
     MULTIPROCESSING = auto()  # breaks for large number of futures
     SCOOP = auto()  # requires running with python -m scoop your_file.py
-    # THREADS=auto() #not that useful as most bench code is cpu bound
+    THREADS = auto()  # for io bound workers or workers that release the GIL
+    ASYNCIO = auto()  # for async def workers, runs them concurrently on one event loop
 
     @staticmethod
-    def factory(provider: "Executors") -> Future | None:
+    def factory(
+        provider: "Executors",
+        max_workers: int = None,
+        initializer: Callable = None,
+        initargs: tuple = (),
+    ) -> Future | None:
         """Create an executor instance based on the specified execution strategy.
 
         Args:
             provider (Executors): The type of executor to create
+            max_workers (int, optional): The number of workers for pool based executors, or the
+                number of concurrent calls for the asyncio executor. If None, the executor picks its
+                own default. Defaults to None.
+            initializer (Callable, optional): A function called at the start of each worker process.
+                Defaults to None.
+            initargs (tuple, optional): Arguments passed to the initializer. Defaults to ().
 
         Returns:
             Future | None: The executor instance, or None for serial execution
         """
         providers = {
-            Executors.SERIAL: None,
-            Executors.MULTIPROCESSING: ProcessPoolExecutor(),
-            Executors.SCOOP: scoop_future_executor,
+            Executors.SERIAL: lambda: None,
+            Executors.MULTIPROCESSING: lambda: ProcessPoolExecutor(
+                max_workers=max_workers, initializer=initializer, initargs=initargs
+            ),
+            Executors.SCOOP: lambda: scoop_future_executor,
+            Executors.THREADS: lambda: ThreadPoolExecutor(max_workers=max_workers),
+            Executors.ASYNCIO: lambda: AsyncioExecutor(max_workers=max_workers),
         }
-        return providers[provider]
+        return providers[provider]()
+
+
+def preload_modules(modules: List[str]) -> None:
+    """Import modules in a worker process so that the first job it runs does not pay the import cost.
+
+    Args:
+        modules (List[str]): The names of the modules to import
+    """
+    for module in modules:
+        importlib.import_module(module)
+
+
+class ExecutorPool:
+    """Owns an executor that is shared between sweeps so that worker processes persist.
+
+    FutureCache creates and shuts down its own executor for every sweep.  When a FutureCache is
+    given an ExecutorPool it borrows the executor from the pool instead and leaves it running when
+    the sweep finishes, so that consecutive sweeps do not pay the process spawn and import costs
+    again.  The owner of the pool is responsible for calling shutdown(), or using the pool as a
+    context manager.
+
+    Attributes:
+        modules (List[str]): Modules that are imported by each new worker process
+        executor_type (Executors): The type of the current executor
+        max_workers (int): The number of workers of the current executor
+        executor: The current executor instance, created on demand
+    """
+
+    def __init__(self, modules: List[str] = None) -> None:
+        """Initialize an empty ExecutorPool.
+
+        Args:
+            modules (List[str], optional): Modules to import in each new worker process.
+                Defaults to None.
+        """
+        self.modules = [] if modules is None else list(modules)
+        self.executor_type = None
+        self.max_workers = None
+        self.executor = None
+
+    def add_module(self, module: str) -> None:
+        """Import a module in worker processes that are started after this call.
+
+        Args:
+            module (str): The name of the module, such as the module that defines the worker
+        """
+        # the main module is imported by the multiprocessing machinery itself
+        if module not in self.modules and module not in ("__main__", None):
+            self.modules.append(module)
+
+    def get(self, executor_type: Executors, max_workers: int = None) -> Future | None:
+        """Get an executor of the requested type, reusing the running one if it matches.
+
+        Args:
+            executor_type (Executors): The type of executor required
+            max_workers (int, optional): The number of workers of the executor. Defaults to None.
+
+        Returns:
+            Future | None: The executor instance, or None for serial execution
+        """
+        if self.executor is not None:
+            if self.executor_type == executor_type and self.max_workers == max_workers:
+                return self.executor
+            self.shutdown()
+        self.executor = Executors.factory(
+            executor_type, max_workers, initializer=preload_modules, initargs=(self.modules,)
+        )
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        return self.executor
+
+    def shutdown(self) -> None:
+        """Shutdown the executor if one is running."""
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.executor = None
+
+    def __enter__(self) -> ExecutorPool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+class CacheWriteBuffer:
+    """Buffers writes to a cache and commits them together in a single transaction.
+
+    Every Cache.set is its own transaction, so when many fast jobs complete the writes serialise
+    the sweep.  Results are held in memory until max_pending are waiting or max_delay seconds have
+    passed since the oldest one was buffered, and are then written in one transaction with their
+    tags, so the tag index is kept up to date.  The thresholds are checked when a value is set, so
+    flush() must be called when no more values are coming, and before the cache is read by any
+    other means than get().
+
+    Attributes:
+        cache (CacheBackend): The cache the values are written to
+        max_pending (int): The number of buffered values that triggers a flush
+        max_delay (float): The age in seconds of the oldest buffered value that triggers a flush
+        pending (dict): The buffered values and their tags, keyed by cache key
+    """
+
+    def __init__(self, cache: CacheBackend, max_pending: int = 256, max_delay: float = 1.0) -> None:
+        self.cache = cache
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.pending = {}
+        self.oldest = None
+        self.lock = threading.Lock()
+
+    def set(self, key: str, value, tag: str = None) -> None:
+        """Buffer a value, flushing the buffer if it has reached a threshold.
+
+        Args:
+            key (str): The cache key
+            value: The value to store
+            tag (str, optional): The tag to store the value with. Defaults to None.
+        """
+        with self.lock:
+            if not self.pending:
+                self.oldest = time.monotonic()
+            self.pending[key] = (value, tag)
+            full = len(self.pending) >= self.max_pending
+            expired = time.monotonic() - self.oldest >= self.max_delay
+        if full or expired:
+            self.flush()
+
+    def get(self, key: str, default=None):
+        """Get a buffered value, falling back to the cache if the key has no pending write.
+
+        Args:
+            key (str): The cache key
+            default (optional): The value returned if the key is not found. Defaults to None.
+
+        Returns:
+            The value of the key, or default
+        """
+        with self.lock:
+            if key in self.pending:
+                return self.pending[key][0]
+        return self.cache.get(key, default=default)
+
+    def flush(self) -> None:
+        """Write all the buffered values to the cache in a single transaction."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if pending:
+            with self.cache.transact():
+                for key, (value, tag) in pending.items():
+                    self.cache.set(key, value, tag=tag)
+            logging.debug(f"flushed {len(pending)} results to the cache")
+
+    def discard(self) -> None:
+        """Drop all the buffered values without writing them."""
+        with self.lock:
+            self.pending = {}
 
 
 class FutureCache:
@@ -158,10 +556,14 @@ class FutureCache:
     Attributes:
         executor_type (Executors): The execution strategy to use
         executor: The executor instance, created on demand
-        cache (Cache): Cache for storing job results
+        cache (CacheBackend): Cache for storing job results
         overwrite (bool): Whether to overwrite existing cached results
         call_count (int): Counter for job calls
         size_limit (int): Maximum size of the cache in bytes
+        max_workers (int): Number of workers used by pool based executors
+        executor_pool (ExecutorPool): Shared pool that owns the executor, if any
+        write_buffer (CacheWriteBuffer): Batches the writes of job results to the cache
+        lookup_block_size (int): Number of jobs whose cached results are fetched in one transaction
         worker_wrapper_call_count (int): Number of job submissions
         worker_fn_call_count (int): Number of actual function executions
         worker_cache_call_count (int): Number of cache hits
@@ -175,6 +577,13 @@ class FutureCache:
         tag_index: bool = True,
         size_limit: int = int(20e9),  # 20 GB
         cache_results: bool = True,
+        max_workers: int = None,
+        executor_pool: ExecutorPool = None,
+        write_batch_size: int = 1,
+        write_interval: float = 1.0,
+        cache_backend: CacheBackends = CacheBackends.DISK,
+        memory_size_limit: int = None,
+        memory_max_items: int = None,
     ):
         """Initialize a FutureCache with optional caching and execution settings.
 
@@ -185,14 +594,41 @@ class FutureCache:
             tag_index (bool, optional): Whether to enable tag-based indexing in the cache. Defaults to True.
             size_limit (int, optional): Maximum size of the cache in bytes. Defaults to 20GB.
             cache_results (bool, optional): Whether to cache results at all. Defaults to True.
+            max_workers (int, optional): Number of workers used by pool based executors. If None,
+                the pool picks its own default. Defaults to None.
+            executor_pool (ExecutorPool, optional): A pool to borrow the executor from.  The
+                executor is then left running when the cache is closed. Defaults to None.
+            write_batch_size (int, optional): Number of job results that are written to the cache
+                in a single transaction.  Results that are waiting to be written are still found by
+                lookups and are written by flush(), clear_tag() and close(). Defaults to 1.
+            write_interval (float, optional): Maximum time in seconds a result waits to be written,
+                checked when the next result arrives. Defaults to 1.0.
+            cache_backend (CacheBackends, optional): Whether results are cached on disk, in memory
+                or in memory over disk. Defaults to CacheBackends.DISK.
+            memory_size_limit (int, optional): Maximum size in bytes of the memory cache. If None,
+                the size is not limited. Defaults to None.
+            memory_max_items (int, optional): Maximum number of results in the memory cache. If
+                None, the number is not limited. Defaults to None.
         """
         self.executor_type = executor
         self.executor = None
+        self.max_workers = max_workers
+        self.executor_pool = executor_pool
+        self.lookup_block_size = 1024
         if cache_results:
-            self.cache = Cache(f"cachedir/{cache_name}", tag_index=tag_index, size_limit=size_limit)
+            self.cache = open_cache(
+                cache_name,
+                cache_backend,
+                size_limit=size_limit,
+                memory_size_limit=memory_size_limit,
+                memory_max_items=memory_max_items,
+                tag_index=tag_index,
+            )
             logging.info(f"cache dir: {self.cache.directory}")
+            self.write_buffer = CacheWriteBuffer(self.cache, write_batch_size, write_interval)
         else:
             self.cache = None
+            self.write_buffer = None
 
         self.overwrite = overwrite
         self.call_count = 0
@@ -217,35 +653,292 @@ class FutureCache:
         """
         self.worker_wrapper_call_count += 1
 
-        if self.cache is not None:
-            if not self.overwrite and job.job_key in self.cache:
-                logging.info(f"Found job: {job.job_id} in cache, loading...")
-                # logging.info(f"Found key: {job.job_key} in cache")
-                self.worker_cache_call_count += 1
-                return JobFuture(
-                    job=job,
-                    res=self.cache[job.job_key],
-                )
+        cached = self.load_cached(job)
+        if cached is not None:
+            return cached
+        return self.execute(job)
+
+    def execute(self, job: Job) -> JobFuture:
+        """Run a job that is not in the cache, either serially or on the configured executor.
 
+        Args:
+            job (Job): The job to run
+
+        Returns:
+            JobFuture: A future representing the job execution
+        """
         self.worker_fn_call_count += 1
 
-        if self.executor_type is not Executors.SERIAL:
-            if self.executor is None:
-                self.executor = Executors.factory(self.executor_type)
-        if self.executor is not None:
+        executor = self.get_executor()
+        if executor is not None:
             self.overwrite_msg(job, " starting parallel job...")
+            if self.executor_type == Executors.ASYNCIO:
+                # the executor awaits the coroutine returned by the worker on its event loop
+                future = executor.submit(job.function, **job.job_args)
+            else:
+                future = executor.submit(run_job, job)
             return JobFuture(
                 job=job,
-                future=self.executor.submit(run_job, job),
-                cache=self.cache,
+                future=future,
+                cache=self.write_buffer,
             )
         self.overwrite_msg(job, " starting serial job...")
         return JobFuture(
             job=job,
             res=run_job(job),
-            cache=self.cache,
+            cache=self.write_buffer,
         )
 
+    def load_cached(self, job: Job) -> JobFuture | None:
+        """Load the result of a job from the cache if it is there and overwriting is disabled.
+
+        Args:
+            job (Job): The job to look up
+
+        Returns:
+            JobFuture | None: A JobFuture holding the cached result, or None on a cache miss
+        """
+        if self.cache is not None and not self.overwrite:
+            res = self.write_buffer.get(job.job_key, default=ENOVAL)
+            if res is not ENOVAL:
+                return self.cache_hit(job, res)
+        return None
+
+    def cache_hit(self, job: Job, res: dict) -> JobFuture:
+        """Count a cache hit and wrap the cached result of a job.
+
+        Args:
+            job (Job): The job that was found in the cache
+            res (dict): The cached result
+
+        Returns:
+            JobFuture: A JobFuture holding the cached result
+        """
+        logging.info(f"Found job: {job.job_id} in cache, loading...")
+        # logging.info(f"Found key: {job.job_key} in cache")
+        self.worker_cache_call_count += 1
+        return JobFuture(job=job, res=res)
+
+    def get_many(self, keys: Iterable[str]) -> dict:
+        """Fetch the cached values of several keys in a single transaction.
+
+        Args:
+            keys (Iterable[str]): The cache keys to look up
+
+        Returns:
+            dict: The cached value of each key that is in the cache
+        """
+        found = {}
+        with self.cache.transact():
+            for key in keys:
+                value = self.write_buffer.get(key, default=ENOVAL)
+                if value is not ENOVAL:
+                    found[key] = value
+        return found
+
+    def lookup_many(self, jobs: Iterable[Job]) -> Iterator[Tuple[Job, JobFuture | None]]:
+        """Look up a stream of jobs in the cache, fetching the results of a block of jobs at a time.
+
+        Each job is paired with a JobFuture holding its cached result, or None if it has to be run.
+        Looking up a whole block in one transaction avoids a database round trip per job, which
+        dominates the time taken to re-run a mostly cached sweep.
+
+        Args:
+            jobs (Iterable[Job]): The jobs to look up
+
+        Yields:
+            Tuple[Job, JobFuture | None]: Each job and its cached result, in the order of jobs
+        """
+        jobs = iter(jobs)
+        while block := list(islice(jobs, self.lookup_block_size)):
+            if self.cache is None or self.overwrite:
+                found = {}
+            else:
+                found = self.get_many(job.job_key for job in block)
+            for job in block:
+                self.worker_wrapper_call_count += 1
+                if job.job_key in found:
+                    yield job, self.cache_hit(job, found[job.job_key])
+                else:
+                    yield job, None
+
+    def get_executor(self) -> Future | None:
+        """Get the executor, creating it or borrowing it from the executor pool on first use.
+
+        Returns:
+            Future | None: The executor instance, or None for serial execution
+        """
+        if self.executor_type is not Executors.SERIAL:
+            if self.executor is None:
+                if self.executor_pool is not None:
+                    self.executor = self.executor_pool.get(self.executor_type, self.max_workers)
+                else:
+                    self.executor = Executors.factory(self.executor_type, self.max_workers)
+        return self.executor
+
+    def submit_chunk(self, jobs: List[Job]) -> List[JobFuture]:
+        """Run several jobs that are not in the cache as a single executor task.
+
+        Sending a chunk of jobs in one task amortises the per-task inter-process overhead over all
+        the jobs in the chunk.  The task returns a list of results that is unpacked back into one
+        JobFuture per job.
+
+        Args:
+            jobs (List[Job]): The jobs to run
+
+        Returns:
+            List[JobFuture]: A future for each job, sharing the future of the task
+        """
+        self.worker_fn_call_count += len(jobs)
+        executor = self.get_executor()
+        if executor is None:
+            return [JobFuture(job=job, res=run_job(job), cache=self.write_buffer) for job in jobs]
+        for job in jobs:
+            self.overwrite_msg(job, f" starting parallel job in a chunk of {len(jobs)}...")
+        future = executor.submit(run_job_chunk, jobs)
+        return [
+            JobFuture(job=job, future=future, cache=self.write_buffer, chunk_index=i)
+            for i, job in enumerate(jobs)
+        ]
+
+    def submit_batch_call(
+        self, jobs: List[Job], call_batch: Callable[..., dict]
+    ) -> List[JobFuture]:
+        """Run the jobs that are not in the cache with a single call of a vectorised function.
+
+        The arguments of the jobs that miss the cache are gathered into columns, one array per
+        argument name, and passed to call_batch as a single task on the configured executor, or in
+        the calling process for serial execution.  call_batch returns a dictionary of result
+        columns which is split back into one result per job, so the cache is still populated per
+        job.  The jobs that miss the cache are counted as worker calls and the rest as cache hits,
+        the same as for jobs that are run one at a time.
+
+        Args:
+            jobs (List[Job]): The jobs to run
+            call_batch (Callable[..., dict]): A function that takes columns of arguments as keyword
+                arguments and returns a dictionary of result columns
+
+        Returns:
+            List[JobFuture]: A future holding the result of each job, in the same order as jobs
+        """
+        job_futures = []
+        misses = []
+        for _, cached in self.lookup_many(jobs):
+            if cached is None:
+                misses.append(len(job_futures))
+            job_futures.append(cached)
+
+        if misses:
+            self.worker_fn_call_count += len(misses)
+            logging.info(
+                f"{jobs[misses[-1]].job_id} starting a batch call of {len(misses)} jobs..."
+            )
+            arg_names = jobs[misses[0]].job_args.keys()
+            columns = {k: np.asarray([jobs[i].job_args[k] for i in misses]) for k in arg_names}
+            executor = self.get_executor()
+            if executor is None:
+                results, _ = run_batch_call(call_batch, columns)
+                for row, i in enumerate(misses):
+                    job_futures[i] = JobFuture(
+                        job=jobs[i], res=results[row], cache=self.write_buffer
+                    )
+            else:
+                if self.executor_type == Executors.ASYNCIO:
+                    future = executor.submit(run_batch_call_async, call_batch, columns)
+                else:
+                    future = executor.submit(run_batch_call, call_batch, columns)
+                for row, i in enumerate(misses):
+                    job_futures[i] = JobFuture(
+                        job=jobs[i], future=future, cache=self.write_buffer, chunk_index=row
+                    )
+        return job_futures
+
+    def submit_many(
+        self, jobs: Iterable[Job], max_in_flight: int = None, chunk_size: int = 1
+    ) -> Iterator[JobFuture]:
+        """Submit a stream of jobs and yield their JobFutures as they complete.
+
+        Jobs are pulled from the iterable lazily, a block at a time so that their cached results
+        can be fetched together.  Cache hits and serially executed jobs are yielded straight away.
+        When an executor is in use, at most max_in_flight futures are pending at any one time and
+        completed futures are harvested as they finish, so the memory used by a sweep does not grow
+        with the number of points and results can be stored while the workers are still busy.
+
+        Args:
+            jobs (Iterable[Job]): The jobs to submit
+            max_in_flight (int, optional): The maximum number of pending futures. If None, all jobs
+                are submitted up front. Defaults to None.
+            chunk_size (int, optional): The number of jobs sent to a worker in a single task. If 0,
+                the chunk size is picked automatically from the measured per-call latency. Serial
+                and asyncio execution always run jobs one at a time. Defaults to 1.
+
+        Yields:
+            JobFuture: A future for each job, in order of completion
+        """
+        # concurrent coroutines are cheap so there is no task overhead to amortise with chunks
+        sizer = ChunkSizer(1 if self.executor_type == Executors.ASYNCIO else chunk_size)
+        pending = {}
+        # SCOOP futures can not be passed to concurrent.futures.wait, so they are waited for one at a time in the order they were submitted
+        in_order = self.executor_type == Executors.SCOOP
+
+        def harvest(future: Future) -> List[JobFuture]:
+            if sizer.auto:
+                # a failed task raises again when the result of its JobFutures is read
+                with suppress(Exception):
+                    sizer.record(future.result()[1])
+            return pending.pop(future)
+
+        def next_done() -> Iterable[Future]:
+            if in_order:
+                oldest = next(iter(pending))
+                with suppress(Exception):
+                    oldest.result()
+                return [oldest]
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            return done
+
+        for job_futures in self.dispatch(jobs, sizer):
+            future = job_futures[0].future
+            if future is None:
+                yield from job_futures
+                continue
+            pending[future] = job_futures
+            if sizer.auto and sizer.call_latency is None:
+                # measure the latency of the first chunk before sizing the next ones
+                yield from harvest(future)
+            elif max_in_flight is not None and len(pending) >= max_in_flight:
+                for future_done in next_done():
+                    yield from harvest(future_done)
+        for future in list(pending) if in_order else as_completed(pending):
+            yield from harvest(future)
+
+    def dispatch(self, jobs: Iterable[Job], sizer: ChunkSizer) -> Iterator[List[JobFuture]]:
+        """Look up the jobs in the cache in blocks and submit only the misses, grouped into chunks.
+
+        Args:
+            jobs (Iterable[Job]): The jobs to submit
+            sizer (ChunkSizer): Decides how many jobs go in each chunk
+
+        Yields:
+            List[JobFuture]: A single cached or submitted JobFuture, or the JobFutures of a task
+                that runs a chunk of jobs
+        """
+        chunked = sizer.chunk_size != 1 and self.get_executor() is not None
+        chunk = []
+        for job, cached in self.lookup_many(jobs):
+            if cached is not None:
+                yield [cached]
+                continue
+            if not chunked:
+                yield [self.execute(job)]
+                continue
+            chunk.append(job)
+            if len(chunk) >= sizer.size():
+                yield self.submit_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield self.submit_chunk(chunk)
+
     def overwrite_msg(self, job: Job, suffix: str) -> None:
         """Log a message about overwriting or using cache.
 
@@ -262,9 +955,15 @@ class FutureCache:
         self.worker_fn_call_count = 0
         self.worker_cache_call_count = 0
 
+    def flush(self) -> None:
+        """Write the job results that are waiting in the write buffer to the cache."""
+        if self.write_buffer is not None:
+            self.write_buffer.flush()
+
     def clear_cache(self) -> None:
         """Clear all entries from the cache."""
-        if self.cache:
+        if self.cache is not None:
+            self.write_buffer.discard()
             self.cache.clear()
 
     def clear_tag(self, tag: str) -> None:
@@ -274,28 +973,42 @@ class FutureCache:
             tag (str): The tag identifying entries to remove from the cache
         """
         logging.info(f"clearing the sample cache for tag: {tag}")
+        # buffered results are not in the tag index yet
+        self.flush()
         removed_vals = self.cache.evict(tag)
         logging.info(f"removed: {removed_vals} items from the cache")
 
     def close(self) -> None:
-        """Close the cache and shutdown the executor if they exist."""
-        if self.cache:
+        """Close the cache and shutdown the executor if they exist.
+
+        An executor borrowed from an ExecutorPool is left running for the next sweep.
+        """
+        if self.cache is not None:
+            self.flush()
             self.cache.close()
         if self.executor:
-            self.executor.shutdown()
+            if self.executor_pool is None:
+                self.executor.shutdown()
             self.executor = None
 
     def stats(self) -> str:
         """Get statistics about cache usage.
 
+        The size of the cache is reported together with the size of the files that cache entries
+        can refer to, as measured by StorageManager.du().
+
         Returns:
             str: A string with cache size information
         """
         logging.info(f"job calls: {self.worker_wrapper_call_count}")
         logging.info(f"cache calls: {self.worker_cache_call_count}")
         logging.info(f"worker calls: {self.worker_fn_call_count}")
-        if self.cache:
-            return f"cache size :{int(self.cache.volume() / 1000000)}MB / {int(self.size_limit / 1000000)}MB"
+        if self.cache is not None:
+            files = StorageManager(cache_names=[]).du()["total"]
+            return (
+                f"cache size :{int(self.cache.volume() / 1000000)}MB / "
+                f"{int(self.size_limit / 1000000)}MB, files: {int(files / 1000000)}MB"
+            )
         return ""
 
 
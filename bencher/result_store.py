@@ -0,0 +1,192 @@
+from __future__ import annotations
+from typing import Any
+from contextlib import suppress
+from numbers import Number
+import logging
+import os
+import warnings
+
+import numpy as np
+import xarray as xr
+
+# the datasets of cached results are stored next to the caches in cachedir
+DATASET_DIR = "cachedir/benchmark_datasets"
+
+# the types of attribute that can be stored in a NetCDF file
+NETCDF_ATTR_TYPES = (str, Number, np.ndarray, np.number, list, tuple, bytes)
+
+
+def dataset_path(key: str, directory: str = DATASET_DIR) -> str:
+    """Get the path of the file that the dataset of a cached result is stored in.
+
+    Args:
+        key (str): The key of the cached result
+        directory (str, optional): The directory the datasets are stored in. Defaults to DATASET_DIR.
+
+    Returns:
+        str: The path of the NetCDF file
+    """
+    return os.path.join(directory, f"{key}.nc")
+
+
+def save_dataset(ds: xr.Dataset, path: str) -> bool:
+    """Save a dataset to a NetCDF file so that it can be opened lazily later.
+
+    The file is written next to its final path and then moved into place, so a dataset that is
+    open from an older version of the file is not affected.  Attributes that NetCDF can not store,
+    and the units of times which NetCDF uses to encode them, are left out.  Not every dataset can
+    be stored as NetCDF, for example datasets holding python objects, and those are not saved.
+
+    Args:
+        ds (xr.Dataset): The dataset to save
+        path (str): The path of the NetCDF file
+
+    Returns:
+        bool: True if the dataset was saved, False if it can not be stored as NetCDF
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    ds = ds.copy(deep=False)
+    encoding = {}
+    for name, var in ds.variables.items():
+        var.attrs = {k: v for k, v in var.attrs.items() if isinstance(v, NETCDF_ATTR_TYPES)}
+        if var.dtype.kind in "mM":
+            var.attrs.pop("units", None)
+            var.attrs.pop("calendar", None)
+            # NetCDF3 has no 64 bit integers, and 32 bit offsets overflow after about half an hour
+            # of microseconds, so times are stored as floats
+            var.encoding = {}
+            units = "microseconds" if var.dtype.kind == "m" else "microseconds since 1970-01-01"
+            encoding[name] = {"dtype": "float64", "units": units}
+    try:
+        with warnings.catch_warnings():
+            # xarray picks finer units than it was asked for so that times are stored exactly
+            warnings.filterwarnings("ignore", message="Times can't be serialized faithfully")
+            ds.to_netcdf(tmp_path, engine="scipy", encoding=encoding)
+    except (TypeError, ValueError, OverflowError) as e:
+        logging.info(f"dataset can not be stored as NetCDF, pickling it instead: {e}")
+        with suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def open_lazy_dataset(path: str) -> xr.Dataset:
+    """Open a dataset saved by save_dataset without reading its data variables.
+
+    The file is memory mapped and the values of each variable are only read when they are used.
+
+    Args:
+        path (str): The path of the NetCDF file
+
+    Returns:
+        xr.Dataset: The lazily loaded dataset
+    """
+    return xr.open_dataset(path, engine="scipy", mmap=True)
+
+
+def delete_dataset(key: str, directory: str = DATASET_DIR) -> None:
+    """Delete the stored dataset of a cached result if there is one.
+
+    Args:
+        key (str): The key of the cached result
+        directory (str, optional): The directory the datasets are stored in. Defaults to DATASET_DIR.
+    """
+    with suppress(FileNotFoundError):
+        os.remove(dataset_path(key, directory))
+
+
+class StoredDataset:
+    """A reference to a dataset saved by save_dataset.
+
+    NetCDF stores some coordinates differently, for example int64 as int32, so the coordinates are
+    restored with their original dtype and attributes when the dataset is opened.
+
+    Attributes:
+        path (str): The path of the NetCDF file holding the dataset
+        coords (Dict[str, Tuple[np.dtype, dict]]): The dtype and attributes of each coordinate
+        time_coords (Dict[str, np.ndarray]): The exact values of each time coordinate
+    """
+
+    def __init__(self, path: str, ds: xr.Dataset) -> None:
+        """Make a reference to a saved dataset.
+
+        Args:
+            path (str): The path of the NetCDF file the dataset was saved to
+            ds (xr.Dataset): The dataset that was saved
+        """
+        self.path = path
+        self.coords = {name: (c.dtype, dict(c.attrs)) for name, c in ds.coords.items()}
+        # times are stored as floats which can round them, so the exact times are kept
+        self.time_coords = {
+            name: c.values for name, c in ds.coords.items() if c.dtype.kind in "mM" and c.ndim == 1
+        }
+
+    def load(self) -> xr.Dataset | None:
+        """Open the dataset lazily.
+
+        Returns:
+            xr.Dataset: The dataset, or None if its file no longer exists
+        """
+        if not os.path.exists(self.path):
+            logging.info(f"the stored dataset is missing: {self.path}")
+            return None
+        ds = open_lazy_dataset(self.path)
+        ds = ds.assign_coords(
+            {
+                name: ds.coords[name].astype(dtype)
+                for name, (dtype, _) in self.coords.items()
+                if ds.coords[name].dtype != dtype
+            }
+        )
+        ds = ds.assign_coords(
+            {
+                name: (ds.coords[name].dims, values)
+                for name, values in self.time_coords.items()
+                if ds.coords[name].shape == values.shape
+            }
+        )
+        for name, (_, attrs) in self.coords.items():
+            ds.coords[name].attrs = attrs
+        return ds
+
+    def delete(self) -> None:
+        """Delete the file holding the dataset."""
+        with suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
+class StoredResult:
+    """The cache record of a BenchResult whose dataset is stored in a separate NetCDF file.
+
+    The record holds everything apart from the dataset so that loading it is fast, and the dataset
+    is opened lazily when the result is loaded.
+
+    Attributes:
+        bench_res (BenchResult): The result without its dataset
+        dataset (StoredDataset): The saved dataset of the result
+    """
+
+    def __init__(self, bench_res: Any, path: str, ds: xr.Dataset) -> None:
+        """Make the cache record of a result.
+
+        Args:
+            bench_res (BenchResult): The result without its dataset
+            path (str): The path of the NetCDF file the dataset was saved to
+            ds (xr.Dataset): The dataset of the result
+        """
+        self.bench_res = bench_res
+        self.dataset = StoredDataset(path, ds)
+
+    def load(self) -> Any:
+        """Load the result and open its dataset lazily.
+
+        Returns:
+            BenchResult: The result, or None if its dataset file no longer exists
+        """
+        ds = self.dataset.load()
+        if ds is None:
+            return None
+        self.bench_res.ds = ds
+        return self.bench_res
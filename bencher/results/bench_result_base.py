@@ -31,6 +31,7 @@ from collections import defaultdict
 import pandas as pd
 
 from bencher.bench_cfg import BenchCfg
+from bencher.sequential_repeats import REPEAT_COUNT
 from bencher.plotting.plt_cnt_cfg import PltCntCfg
 
 # todo add plugins
@@ -84,6 +85,8 @@ class BenchResultBase:
         self.bench_cfg = bench_cfg
         # self.wrap_long_time_labels(bench_cfg)  # todo remove
         self.ds = xr.Dataset()
+        # numpy arrays that results are written into while a sweep is running, keyed by dataset variable name.  They are moved into self.ds once the sweep has finished
+        self.result_buffers = {}
         self.object_index = []
         self.hmaps = defaultdict(dict)
         self.result_hmaps = bench_cfg.result_hmaps
@@ -204,7 +207,11 @@ class BenchResultBase:
         match reduce:
             case ReduceType.REDUCE:
                 ds_reduce_mean = ds_out.mean(dim="repeat", keep_attrs=True)
-                ds_reduce_std = ds_out.std(dim="repeat", keep_attrs=False)
+                # points with early stopped repeats have NaN in the repeats that were not run, which
+                # mean and std skip.  The repeat count has no repeat dimension so it has no std
+                ds_reduce_std = ds_out.drop_vars(REPEAT_COUNT, errors="ignore").std(
+                    dim="repeat", keep_attrs=False
+                )
                 ds_reduce_std = rename_ds(ds_reduce_std, "std")
                 ds_out = xr.merge([ds_reduce_mean, ds_reduce_std])
                 ds_out = xr.merge(
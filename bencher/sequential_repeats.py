@@ -0,0 +1,92 @@
+from __future__ import annotations
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from bencher.worker_job import JobTable
+
+# the name of the data variable that holds the number of repeats each point was measured
+REPEAT_COUNT = "repeat_count"
+
+
+def standard_error(data: np.ndarray) -> np.ndarray:
+    """Calculate the standard error of the mean over the last axis, ignoring NaN values.
+
+    Args:
+        data (np.ndarray): The samples, with the repeats along the last axis
+
+    Returns:
+        np.ndarray: The standard error of each point, NaN where there are fewer than 2 samples
+    """
+    count = np.sum(~np.isnan(data), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sq_dev = (data - np.nanmean(data, axis=-1, keepdims=True)) ** 2
+        variance = np.nansum(sq_dev, axis=-1) / (count - 1)
+        return np.where(count > 1, np.sqrt(variance / count), np.nan)
+
+
+class SequentialRepeats:
+    """Plans the repeats of a sweep so that each point stops once its results are precise enough.
+
+    The repeats are dispatched in rounds, one repeat of every active point per round.  After each
+    round from min_repeats on, points where the standard error of the mean of every result
+    variable is below tolerance become inactive, so no more repeats of them are dispatched.  The
+    repeats that are not run are left as NaN in the result buffers.
+
+    Attributes:
+        job_table (JobTable): The points of the sweep
+        repeat_axis (int): The position of the repeat dimension
+        tolerance (float): The standard error each point has to reach
+        min_repeats (int): The number of repeats every point is measured at least
+        active (np.ndarray): Which points need more repeats, over the dimensions other than repeat
+    """
+
+    def __init__(
+        self, job_table: JobTable, tolerance: float, min_repeats: int, repeat_dim: str = "repeat"
+    ) -> None:
+        self.job_table = job_table
+        self.repeat_axis = job_table.dims_name.index(repeat_dim)
+        self.tolerance = tolerance
+        self.min_repeats = min_repeats
+        other_dims = list(job_table.dims_size)
+        other_dims.pop(self.repeat_axis)
+        self.active = np.ones(other_dims, dtype=bool)
+
+    def rounds(
+        self, result_buffers: Dict[str, np.ndarray], result_names: List[str]
+    ) -> Iterator[np.ndarray]:
+        """Yield the rows of the job table to dispatch in each round.
+
+        The results of a round must be stored in result_buffers before the next round is requested.
+
+        Args:
+            result_buffers (Dict[str, np.ndarray]): The result buffers of the sweep
+            result_names (List[str]): The result variables whose standard error is checked
+
+        Yields:
+            np.ndarray: The rows of the points to dispatch in a round
+        """
+        repeat_index = self.job_table.indices[:, self.repeat_axis]
+        for repeat in range(self.job_table.dims_size[self.repeat_axis]):
+            rows = np.flatnonzero(repeat_index == repeat)
+            others = np.delete(self.job_table.indices[rows], self.repeat_axis, axis=1)
+            yield rows[self.active[tuple(others.T)]]
+
+            if repeat + 1 >= self.min_repeats:
+                for name in result_names:
+                    data = np.moveaxis(result_buffers[name], self.repeat_axis, -1)[
+                        ..., : repeat + 1
+                    ]
+                    # NaN means the worker did not return the result, so more repeats will not help
+                    self.active &= standard_error(data) >= self.tolerance
+            if not self.active.any():
+                return
+
+    def counts(self) -> np.ndarray:
+        """Count the repeats that were measured at each point.
+
+        Returns:
+            np.ndarray: The number of repeats of each point, over the dimensions other than repeat
+        """
+        status = self.job_table.status.reshape(self.job_table.dims_size)
+        return np.sum(status == JobTable.DONE, axis=self.repeat_axis)
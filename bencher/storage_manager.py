@@ -0,0 +1,233 @@
+from __future__ import annotations
+from collections import Counter, defaultdict
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict, List, Tuple
+import argparse
+import logging
+import os
+
+from bencher.artifact_store import ARTIFACT_DIR, ArtifactStore
+from bencher.cache_backend import CacheBackend, CacheBackends, open_cache
+from bencher.history_store import HISTORY_DIR
+from bencher.result_store import DATASET_DIR
+
+# the caches whose entries can refer to files
+CACHE_NAMES = ["sample_cache", "benchmark_inputs", "history", "checkpoints"]
+
+# the directories of the cached result files that bencher manages, which gc can delete from
+FILE_DIRS = [ARTIFACT_DIR, DATASET_DIR, HISTORY_DIR]
+
+# the directories gen_path writes to as cachedir/<folder>.  Their files are counted but never
+# deleted, because reports and plots can refer to them as well as cache entries
+MEDIA_DIRS = ["cachedir/vid", "cachedir/img", "cachedir/generic", "cachedir/rrd"]
+
+
+def find_cache_names() -> List[str]:
+    """Find the caches in cachedir whose entries can refer to files.
+
+    Returns:
+        List[str]: CACHE_NAMES and the <name>/sample_cache caches of CachedParams
+    """
+    cached_params = sorted(Path("cachedir").glob("*/sample_cache/cache.db"))
+    return CACHE_NAMES + [f"{path.parent.parent.name}/sample_cache" for path in cached_params]
+
+
+def dir_prefix(directory: str) -> str:
+    """Get the prefix of the absolute paths of the files in a directory.
+
+    Args:
+        directory (str): The directory
+
+    Returns:
+        str: The absolute path of the directory with a trailing slash
+    """
+    return Path(directory).absolute().as_posix() + "/"
+
+
+class StorageManager:
+    """Accounts for the disk space used by the caches and the files their entries refer to.
+
+    The caches only count the size of their own entries, but the entries of path, image and video
+    results and of stored datasets refer to files that can be much larger.  The storage manager
+    adds those files to the total and keeps the total within size_limit.  Files that no cache entry
+    refers to are deleted first, then the least recently used files are deleted together with the
+    cache entries that refer to them, so that no entry is left pointing to a missing file.  Only
+    the files in file_dirs, which hold the results that bencher stores, are deleted.  The files in
+    media_dirs are counted in the total but left alone, so a total that the caches and media files
+    keep over size_limit is logged as a warning.
+
+    Files are deleted while they are not referred to, so a collection should not run while a sweep
+    is writing files that are not cached yet.  The caches are opened with the size limits they
+    were created with, size_limit only applies to the total.
+
+    Attributes:
+        size_limit (int): The maximum total size in bytes of the caches and files, enforced by gc
+        cache_names (List[str]): The caches whose entries can refer to files
+        file_dirs (List[str]): The directories of the files that are accounted for and collected
+        media_dirs (List[str]): The directories of the files that are accounted for but not deleted
+        cache_backend (CacheBackends): Where the caches are stored
+    """
+
+    def __init__(
+        self,
+        size_limit: int = int(100e9),
+        cache_names: List[str] = None,
+        file_dirs: List[str] = None,
+        cache_backend: CacheBackends = CacheBackends.DISK,
+        media_dirs: List[str] = None,
+    ) -> None:
+        self.size_limit = size_limit
+        self.cache_names = find_cache_names() if cache_names is None else cache_names
+        self.file_dirs = FILE_DIRS if file_dirs is None else file_dirs
+        self.media_dirs = MEDIA_DIRS if media_dirs is None else media_dirs
+        self.cache_backend = cache_backend
+
+    def open_cache(self, name: str) -> CacheBackend:
+        """Open one of the caches, keeping the settings it was created with.
+
+        Args:
+            name (str): The name of the cache
+
+        Returns:
+            CacheBackend: The opened cache, to be used as a context manager
+        """
+        return open_cache(name, self.cache_backend, size_limit=None)
+
+    def files(self, directories: List[str] = None) -> List[Tuple[str, int, float]]:
+        """List the files in some directories.
+
+        Args:
+            directories (List[str], optional): The directories to list. Defaults to file_dirs.
+
+        Returns:
+            List[Tuple[str, int, float]]: The absolute path, size in bytes and time of last use of
+                each file
+        """
+        files = []
+        for directory in self.file_dirs if directories is None else directories:
+            for path in Path(directory).absolute().rglob("*"):
+                with suppress(FileNotFoundError):
+                    stat = path.stat()
+                    if path.is_file():
+                        files.append(
+                            (path.as_posix(), stat.st_size, max(stat.st_atime, stat.st_mtime))
+                        )
+        return files
+
+    def du(self) -> Dict[str, int]:
+        """Measure the disk space used by each cache and each directory of files.
+
+        Returns:
+            Dict[str, int]: The size in bytes of each cache and directory, and their total
+        """
+        usage = {}
+        for name in self.cache_names:
+            with self.open_cache(name) as c:
+                usage[name] = c.volume()
+        directories = self.file_dirs + self.media_dirs
+        file_sizes = defaultdict(int)
+        for path, size, _ in self.files(directories):
+            directory = next(d for d in directories if path.startswith(dir_prefix(d)))
+            file_sizes[directory] += size
+        for directory in directories:
+            usage[directory] = file_sizes[directory]
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def references(self) -> Tuple[Counter, Dict[str, List[Tuple[str, str]]]]:
+        """Trim the caches to their size limits and find the files their entries refer to.
+
+        Returns:
+            Tuple[Counter, Dict[str, List[Tuple[str, str]]]]: The number of references to each
+                file, and the cache name and key of each entry that refers to it
+        """
+        store = ArtifactStore()
+        references = Counter()
+        owners = defaultdict(list)
+        for name in self.cache_names:
+            with self.open_cache(name) as c:
+                c.cull()
+                for key in c:
+                    try:
+                        value = c.get(key)
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        # entries pickled by other versions of a class can fail to load
+                        logging.warning(f"could not read {name} entry {key}: {e}")
+                        continue
+                    entry_refs = store.count_references([value], self.file_dirs)
+                    references.update(entry_refs)
+                    for path in entry_refs:
+                        owners[path].append((name, key))
+        return references, owners
+
+    def gc(self, size_limit: int = None) -> int:
+        """Delete the files no cache entry refers to, then the least recently used files and their
+        cache entries until the total size is within size_limit.
+
+        The caches are culled to their own size limits first.  If the caches and the files in
+        media_dirs still take more than size_limit once every file that can be deleted is gone, a
+        warning is logged.
+
+        Args:
+            size_limit (int, optional): The maximum total size in bytes. Defaults to self.size_limit.
+
+        Returns:
+            int: The number of bytes of files that were deleted
+        """
+        if size_limit is None:
+            size_limit = self.size_limit
+        references, owners = self.references()
+        freed = 0
+        used = []
+        for path, size, last_used in self.files():
+            if references[path] == 0:
+                with suppress(FileNotFoundError):
+                    os.remove(path)
+                    freed += size
+            else:
+                used.append((last_used, path, size))
+        logging.info(f"deleted {freed} bytes of unreferenced files")
+
+        total = self.du()["total"]
+        for _, path, size in sorted(used):
+            if total <= size_limit:
+                break
+            for name, key in owners[path]:
+                with self.open_cache(name) as c:
+                    c.delete(key)
+            with suppress(FileNotFoundError):
+                os.remove(path)
+                freed += size
+                total -= size
+            logging.info(f"evicted {path} and the {len(owners[path])} cache entries that use it")
+        if total > size_limit:
+            logging.warning(
+                f"the total size of {total} bytes is over the limit of {size_limit} bytes because "
+                f"of the caches and the files in {self.media_dirs}, which gc does not delete"
+            )
+        return freed
+
+
+def main(args: List[str] = None) -> None:
+    """Report or limit the disk space used by the bencher caches, as python -m bencher cache du|gc.
+
+    du prints the size of each cache and directory of files, and gc deletes unused files and
+    evicts the least recently used ones until the total is within the size limit.
+
+    Args:
+        args (List[str], optional): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(prog="python -m bencher")
+    commands = parser.add_subparsers(dest="group", required=True)
+    cache = commands.add_parser("cache", help="report or limit the disk space used by the caches")
+    cache.add_argument("command", choices=["du", "gc"])
+    cache.add_argument(
+        "--size-limit", type=float, default=100e9, help="the maximum total size in bytes"
+    )
+    parsed = parser.parse_args(args)
+    manager = StorageManager(int(parsed.size_limit))
+    if parsed.command == "gc":
+        print(f"freed {manager.gc() / 1e6:.1f}MB")
+    for name, size in manager.du().items():
+        print(f"{size / 1e6:10.1f}MB  {name}")
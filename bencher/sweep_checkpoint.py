@@ -0,0 +1,110 @@
+from __future__ import annotations
+import logging
+import pickle
+from time import monotonic
+from typing import Callable
+
+import numpy as np
+
+from bencher.cache_backend import CacheBackend
+from bencher.worker_job import JobTable
+
+
+class SweepCheckpoint:
+    """Periodically saves the partial results of a sweep so that an interrupted sweep can resume.
+
+    A checkpoint holds the result buffers filled so far and which points of the job table are
+    done.  It is saved at most every interval seconds while results are stored, and once more if
+    the sweep stops early.  Running the same sweep again restores the checkpoint so that only the
+    missing points are dispatched.  The checkpoint is deleted when the sweep completes.
+
+    Attributes:
+        cache (CacheBackend): The cache the checkpoint is saved in
+        key (str): The key of the sweep, the hash of its benchmark configuration
+        interval (float): The minimum number of seconds between checkpoints
+        flush (Callable): Called before each checkpoint is saved, to write the samples that are
+            buffered for the sample cache so that no more results are lost than since the last
+            checkpoint, or None
+    """
+
+    def __init__(
+        self, cache: CacheBackend, key: str, interval: float, flush: Callable[[], None] = None
+    ) -> None:
+        self.cache = cache
+        self.key = key
+        self.interval = interval
+        self.flush = flush
+        self.last_save = monotonic()
+        self.enabled = True
+
+    def restore(self, bench_res, job_table: JobTable) -> int:
+        """Restore the results of a previous attempt at the sweep, if there is a checkpoint.
+
+        Args:
+            bench_res (BenchResult): The result of the sweep with freshly initialised buffers
+            job_table (JobTable): The points of the sweep
+
+        Returns:
+            int: The number of points that were restored
+        """
+        saved = self.cache.get(self.key)
+        if saved is None:
+            return 0
+        buffers = saved["result_buffers"]
+        if saved["status"].shape != job_table.status.shape or any(
+            name not in buffers or buffers[name].shape != buffer.shape
+            for name, buffer in bench_res.result_buffers.items()
+        ):
+            logging.info(f"ignoring checkpoint {self.key} because the sweep has changed")
+            return 0
+
+        # points that were in flight when the checkpoint was saved have to be run again
+        done = saved["status"] == JobTable.DONE
+        job_table.status[:] = np.where(done, JobTable.DONE, JobTable.PENDING)
+        bench_res.result_buffers = buffers
+        bench_res.dataset_list = saved["dataset_list"]
+        bench_res.object_index = saved["object_index"]
+        bench_res.hmaps = saved["hmaps"]
+        restored = int(done.sum())
+        logging.info(f"resuming sweep from checkpoint {self.key} with {restored} points done")
+        return restored
+
+    def save(self, bench_res, job_table: JobTable) -> None:
+        """Save the current state of the sweep.
+
+        Args:
+            bench_res (BenchResult): The result of the sweep being filled
+            job_table (JobTable): The points of the sweep
+        """
+        if self.flush is not None:
+            self.flush()
+        if not self.enabled:
+            return
+        try:
+            self.cache[self.key] = dict(
+                status=job_table.status,
+                result_buffers=bench_res.result_buffers,
+                dataset_list=bench_res.dataset_list,
+                object_index=bench_res.object_index,
+                hmaps=bench_res.hmaps,
+            )
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logging.info(
+                f"the sweep can not be checkpointed because its results can not be pickled: {e}"
+            )
+            self.enabled = False
+        self.last_save = monotonic()
+
+    def update(self, bench_res, job_table: JobTable) -> None:
+        """Save the state of the sweep if interval seconds have passed since the last checkpoint.
+
+        Args:
+            bench_res (BenchResult): The result of the sweep being filled
+            job_table (JobTable): The points of the sweep
+        """
+        if monotonic() - self.last_save >= self.interval:
+            self.save(bench_res, job_table)
+
+    def clear(self) -> None:
+        """Delete the checkpoint, once the sweep is complete."""
+        self.cache.delete(self.key)
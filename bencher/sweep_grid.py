@@ -0,0 +1,307 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import xarray as xr
+
+from bencher.worker_job import JobTable
+
+# the default maximum size in bytes of the result buffers that a ResultIndex keeps
+RESULT_INDEX_SIZE_LIMIT = int(1e9)
+
+
+def match_coords(old_values: List[Any], new_values: List[Any]) -> np.ndarray:
+    """Find where each value of a dimension of a new sweep is in the same dimension of an old sweep.
+
+    Float values are matched with a tight relative tolerance because the sample values of a float
+    sweep at different levels are calculated separately and can differ by rounding errors.  There
+    is no absolute tolerance, so distinct values close to zero are not matched.
+
+    Args:
+        old_values (List[Any]): The values of the dimension in the old sweep
+        new_values (List[Any]): The values of the dimension in the new sweep
+
+    Returns:
+        np.ndarray: The index of each new value in old_values, or -1 if it is not there
+    """
+    old_arr = np.asarray(old_values)
+    new_arr = np.asarray(new_values)
+    if old_arr.dtype.kind == "f" and new_arr.dtype.kind in "fiu" and len(old_arr) > 0:
+        close = np.isclose(new_arr[:, None], old_arr[None, :], rtol=1e-12, atol=0)
+        return np.where(close.any(axis=1), close.argmax(axis=1), -1)
+    return np.array(
+        [next((i for i, old in enumerate(old_values) if old == new), -1) for new in new_values],
+        dtype=int,
+    )
+
+
+class SweepGrid:
+    """The coordinates and result buffers of a completed sweep, used to fill a later sweep.
+
+    Sweeps of the same inputs at increasing levels sample grids that contain the grid of the
+    previous level, and sweeps with more repeats contain the repeats of a sweep with fewer, so the
+    points that a new sweep shares with an earlier one can be copied from the earlier results
+    instead of being dispatched again.  A sweep can also be filled from a sweep of more inputs,
+    for example a sweep of x with y held constant from a sweep of x and y, as long as every input
+    that is not swept has the same value in both.
+
+    Attributes:
+        dims_name (List[str]): The names of the dimensions
+        dim_ranges (List[List[Any]]): The values of each dimension
+        buffers (Dict[str, np.ndarray]): The result buffers of the sweep
+        consts (Dict[str, Any]): The value of each worker input that is not a dimension
+        tag (str): The tag of the sweep, only sweeps with the same tag share results
+    """
+
+    def __init__(
+        self,
+        dims_name: List[str],
+        dim_ranges: List[List[Any]],
+        buffers: Dict[str, np.ndarray],
+        consts: Dict[str, Any] = None,
+        tag: str = "",
+    ) -> None:
+        self.dims_name = list(dims_name)
+        self.dim_ranges = dim_ranges
+        self.buffers = buffers
+        self.consts = consts or {}
+        self.tag = tag
+
+    @classmethod
+    def from_dataset(
+        cls,
+        ds: xr.Dataset,
+        dims_name: List[str],
+        result_names: Iterable[str],
+        consts: Dict[str, Any] = None,
+        tag: str = "",
+    ) -> SweepGrid | None:
+        """Make a grid from the dataset of a completed sweep, for example a cached result.
+
+        Args:
+            ds (xr.Dataset): The dataset of the sweep
+            dims_name (List[str]): The names of the dimensions, in the order of the new sweep
+            result_names (Iterable[str]): The names of the result buffers of the new sweep
+            consts (Dict[str, Any], optional): The value of each input that is not a dimension
+            tag (str, optional): The tag of the sweep. Defaults to "".
+
+        Returns:
+            SweepGrid | None: The grid, or None if the dataset does not hold every result over
+                exactly these dimensions
+        """
+        result_names = list(result_names)
+        if any(name not in ds or set(ds[name].dims) != set(dims_name) for name in result_names):
+            return None
+        return cls(
+            dims_name,
+            [ds.coords[dim].values.tolist() for dim in dims_name],
+            {name: ds[name].transpose(*dims_name).values for name in result_names},
+            consts,
+            tag,
+        )
+
+    def __len__(self) -> int:
+        return int(np.prod([len(r) for r in self.dim_ranges]))
+
+    @property
+    def nbytes(self) -> int:
+        """int: The size in bytes of the result buffers"""
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def align(self, job_table: JobTable, consts: Dict[str, Any]) -> tuple | None:
+        """Work out which points of a new sweep are in this grid.
+
+        Args:
+            job_table (JobTable): The points of the new sweep
+            consts (Dict[str, Any]): The value of each input of the new sweep that is not a dimension
+
+        Returns:
+            tuple | None: The index of this grid's value of each dimension that the new sweep holds
+                constant, and the index in this grid of each value of each dimension of the new
+                sweep, or None if the sweeps do not share any points
+        """
+        if consts.keys() - self.consts.keys() - set(self.dims_name):
+            return None
+        for name, value in self.consts.items():
+            if name not in job_table.dims_name and (
+                name not in consts or match_coords([value], [consts[name]])[0] < 0
+            ):
+                return None
+        fixed = {}
+        for dim, values in zip(self.dims_name, self.dim_ranges):
+            if dim not in job_table.dims_name:
+                index = match_coords(values, [consts[dim]])[0] if dim in consts else -1
+                if index < 0:
+                    return None
+                fixed[dim] = index
+        maps = []
+        for dim, values in zip(job_table.dims_name, job_table.dim_ranges):
+            if dim in self.dims_name:
+                maps.append(match_coords(self.dim_ranges[self.dims_name.index(dim)], values))
+            elif dim in self.consts:
+                maps.append(match_coords([self.consts[dim]], values))
+            else:
+                return None
+        return fixed, maps
+
+    def aligned_buffer(self, name: str, fixed: Dict[str, int], dims_name: List[str]) -> np.ndarray:
+        """Get a result buffer with the dimensions of a new sweep, in the order of the new sweep.
+
+        Args:
+            name (str): The name of the result buffer
+            fixed (Dict[str, int]): The index of each dimension that the new sweep holds constant
+            dims_name (List[str]): The dimensions of the new sweep
+
+        Returns:
+            np.ndarray: A view of the buffer, with length 1 for the inputs this grid held constant
+        """
+        buffer = self.buffers[name][tuple(fixed.get(d, slice(None)) for d in self.dims_name)]
+        dims = [d for d in self.dims_name if d not in fixed]
+        for dim in dims_name:
+            if dim not in dims:
+                buffer = buffer[..., np.newaxis]
+                dims.append(dim)
+        return buffer.transpose([dims.index(d) for d in dims_name])
+
+    def prefill(
+        self, result_buffers: Dict[str, np.ndarray], job_table: JobTable, consts: Dict = None
+    ) -> int:
+        """Copy the results of the points this grid shares with a new sweep and mark them done.
+
+        Points of the new sweep that are already done are left as they are.
+
+        Args:
+            result_buffers (Dict[str, np.ndarray]): The result buffers of the new sweep
+            job_table (JobTable): The points of the new sweep
+            consts (Dict, optional): The value of each input of the new sweep that is not a
+                dimension. Defaults to the constant inputs of this grid.
+
+        Returns:
+            int: The number of points that were filled
+        """
+        if not result_buffers.keys() <= self.buffers.keys():
+            return 0
+        aligned = self.align(job_table, self.consts if consts is None else consts)
+        if aligned is None:
+            return 0
+        fixed, maps = aligned
+        new_sel = [np.flatnonzero(m >= 0) for m in maps]
+        if any(len(s) == 0 for s in new_sel):
+            return 0
+        new_ix = np.ix_(*new_sel)
+        old_ix = np.ix_(*[m[s] for m, s in zip(maps, new_sel)])
+        status = job_table.status.reshape(job_table.dims_size)
+        todo = status[new_ix] != JobTable.DONE
+        for name, buffer in result_buffers.items():
+            block = buffer[new_ix]
+            block[todo] = self.aligned_buffer(name, fixed, job_table.dims_name)[old_ix][todo]
+            buffer[new_ix] = block
+        status[new_ix] = JobTable.DONE
+        return int(todo.sum())
+
+
+class ResultIndex:
+    """The completed sweeps of a Bench, used to fill the points of new sweeps without running them.
+
+    A new sweep is filled from the earlier run of the same sweep first, then from every other
+    sweep with the same tag, newest first, until all of its points are done.  The index counts the
+    points that were filled (hits) and the points that were left to run (misses).  The oldest
+    sweeps are dropped when the result buffers of all the sweeps exceed size_limit bytes, so a long
+    session does not keep every sweep it ran in memory.
+
+    Attributes:
+        grids (Dict[str, SweepGrid]): The results of each sweep, by the key of the sweep
+        hits (int): The number of points that were filled from the index
+        misses (int): The number of points that were not in the index
+        size_limit (int): The maximum size in bytes of the result buffers of the sweeps
+    """
+
+    def __init__(self, size_limit: int = RESULT_INDEX_SIZE_LIMIT) -> None:
+        self.grids = {}
+        self.size_limit = size_limit
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.grids
+
+    def __len__(self) -> int:
+        return len(self.grids)
+
+    def copy(self) -> ResultIndex:
+        """Copy the index, so that grids added to the copy are not added to this index.
+
+        Returns:
+            ResultIndex: The copy
+        """
+        index = ResultIndex(self.size_limit)
+        index.grids = dict(self.grids)
+        index.hits = self.hits
+        index.misses = self.misses
+        return index
+
+    def add(self, key: str, grid: SweepGrid) -> None:
+        """Add the results of a sweep, unless an earlier run of the sweep has more points.
+
+        Args:
+            key (str): The key of the sweep
+            grid (SweepGrid): The results of the sweep
+        """
+        if key not in self.grids or len(grid) >= len(self.grids[key]):
+            # move the sweep to the end so that it is used before older sweeps
+            self.grids.pop(key, None)
+            self.grids[key] = grid
+        # the newest sweep is kept even if it is larger than the limit on its own
+        while len(self.grids) > 1 and self.nbytes() > self.size_limit:
+            self.grids.pop(next(iter(self.grids)))
+
+    def nbytes(self) -> int:
+        """Get the size of the result buffers of the sweeps in the index.
+
+        Returns:
+            int: The size in bytes
+        """
+        return sum(grid.nbytes for grid in self.grids.values())
+
+    def prefill(
+        self,
+        result_buffers: Dict[str, np.ndarray],
+        job_table: JobTable,
+        consts: Dict[str, Any],
+        key: str = None,
+        tag: str = "",
+    ) -> int:
+        """Fill the points of a new sweep that are in the index and mark them done.
+
+        Args:
+            result_buffers (Dict[str, np.ndarray]): The result buffers of the new sweep
+            job_table (JobTable): The points of the new sweep
+            consts (Dict[str, Any]): The value of each input of the new sweep that is not a dimension
+            key (str, optional): The key of the new sweep, whose results are used first
+            tag (str, optional): The tag of the new sweep. Defaults to "".
+
+        Returns:
+            int: The number of points that were filled
+        """
+        grids = [self.grids[key]] if key in self.grids else []
+        grids += [grid for k, grid in reversed(self.grids.items()) if k != key]
+        filled = 0
+        for grid in grids:
+            if (job_table.status == JobTable.DONE).all():
+                break
+            if grid.tag == tag:
+                filled += grid.prefill(result_buffers, job_table, consts)
+        self.hits += filled
+        self.misses += int(np.sum(job_table.status != JobTable.DONE))
+        return filled
+
+    def stats(self) -> str:
+        """Describe how many points were filled from the index.
+
+        Returns:
+            str: The number of sweeps in the index and its hits and misses
+        """
+        return (
+            f"result index: sweeps: {len(self)} bytes: {self.nbytes()} hits: {self.hits} "
+            f"misses: {self.misses}"
+        )
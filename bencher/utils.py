@@ -6,7 +6,9 @@ import math
 from colorsys import hsv_to_rgb
 from pathlib import Path
 from uuid import uuid4
-from functools import partial
+from functools import lru_cache, partial
+from enum import Enum
+import struct
 from typing import Callable, Any, List, Tuple
 import logging
 import os
@@ -88,18 +90,106 @@ def get_nearest_coords1D(val: Any, coords: List[Any]) -> Any:
     return val
 
 
+# the version of the hash format.  It is part of every hash so that keys made by an older format are never mistaken for keys made by the current one
+HASH_VERSION = 2
+HASH_PREFIX = f"v{HASH_VERSION}-"
+SCALAR_TYPES = (Enum, bool, int, float, str, bytes, np.bool_, np.integer, np.floating)
+# longer strings and bytes are not memoised, so that the memo does not keep large values alive
+MAX_MEMOISED_LEN = 256
+
+
+def encode_scalar(var: Any) -> bytes:
+    """Encode an immutable scalar value as bytes that identify both its type and its value.
+
+    Args:
+        var (Any): One of the SCALAR_TYPES or None
+
+    Returns:
+        bytes: The canonical encoding of the value
+    """
+    if var is None:
+        return b"N"
+    if isinstance(var, (bool, np.bool_)):
+        return b"B1" if var else b"B0"
+    if isinstance(var, (float, np.floating)):
+        return b"F" + struct.pack("<d", float(var))
+    if isinstance(var, Enum):
+        kind, data = b"E", f"{type(var).__qualname__}.{var.name}".encode()
+    elif isinstance(var, (int, np.integer)):
+        kind, data = b"I", str(int(var)).encode()
+    elif isinstance(var, str):
+        kind, data = b"S", var.encode("utf-8", "surrogatepass")
+    else:
+        kind, data = b"Y", bytes(var)
+    return kind + len(data).to_bytes(8, "little") + data
+
+
+# the same sweep values are hashed for many sample points, so their encodings are memoised.  Floats
+# are not, because equal keys share an entry and -0.0 == 0.0 would get the encoding of whichever
+# was hashed first, and they are cheap to encode anyway
+encode_scalar_memo = lru_cache(maxsize=2**16, typed=True)(encode_scalar)
+
+
+def update_hash(hasher: Any, var: Any) -> None:
+    """Feed a canonical, type-aware serialisation of a value into a hashlib hasher.
+
+    Scalars, containers and numpy arrays are serialised by type and content, so equal values give
+    equal hashes and values that only print the same, such as large arrays that are truncated by
+    repr, do not.  Array buffers are passed to the hasher without being copied into a string.
+    Dictionaries and sets are hashed independently of their order.  Any other object is hashed by
+    its type and str() representation.
+
+    Args:
+        hasher (Any): A hashlib hasher such as hashlib.blake2b()
+        var (Any): The value to hash
+    """
+    if isinstance(var, (float, np.floating)) or (
+        isinstance(var, (str, bytes)) and len(var) > MAX_MEMOISED_LEN
+    ):
+        hasher.update(encode_scalar(var))
+    elif var is None or isinstance(var, SCALAR_TYPES):
+        hasher.update(encode_scalar_memo(var))
+    elif isinstance(var, (list, tuple)):
+        hasher.update(b"L" if isinstance(var, list) else b"T")
+        hasher.update(len(var).to_bytes(8, "little"))
+        for v in var:
+            update_hash(hasher, v)
+    elif isinstance(var, dict):
+        hasher.update(b"D" + len(var).to_bytes(8, "little"))
+        for item_hash in sorted(hash_sha1((k, v)) for k, v in var.items()):
+            hasher.update(item_hash.encode())
+    elif isinstance(var, (set, frozenset)):
+        hasher.update(b"Z" + len(var).to_bytes(8, "little"))
+        for item_hash in sorted(hash_sha1(v) for v in var):
+            hasher.update(item_hash.encode())
+    elif isinstance(var, np.ndarray) and var.dtype != object:
+        hasher.update(b"A" + var.dtype.str.encode() + str(var.shape).encode())
+        hasher.update(np.ascontiguousarray(var).data)
+    elif isinstance(var, np.ndarray):
+        hasher.update(b"O" + str(var.shape).encode())
+        for v in var.flat:
+            update_hash(hasher, v)
+    else:
+        data = f"{type(var).__module__}.{type(var).__qualname__}:{var}".encode("utf-8", "replace")
+        hasher.update(b"R" + len(data).to_bytes(8, "little") + data)
+
+
 def hash_sha1(var: Any) -> str:
     """A hash function that avoids the PYTHONHASHSEED 'feature' which returns a different hash value each time the program is run.
 
-    Converts input to a consistent SHA1 hash string.
+    The value is serialised canonically by update_hash() and hashed with blake2b.  The name is kept
+    for backwards compatibility.  The hash starts with the version of the hash format, so results
+    that were cached with an older format are not found and are recalculated instead.
 
     Args:
         var (Any): The variable to hash
 
     Returns:
-        str: A hexadecimal SHA1 hash of the string representation of the variable
+        str: The hash format version followed by a 40 character hexadecimal digest
     """
-    return hashlib.sha1(str(var).encode("ASCII")).hexdigest()
+    hasher = hashlib.blake2b(digest_size=20)
+    update_hash(hasher, var)
+    return HASH_PREFIX + hasher.hexdigest()
 
 
 def capitalise_words(message: str) -> str:
@@ -11,7 +11,17 @@ from bencher.bench_cfg import BenchRunCfg
 
 
 class ParametrizedSweep(Parameterized):
-    """Parent class for all Sweep types that need a custom hash"""
+    """Parent class for all Sweep types that need a custom hash
+
+    Subclasses can optionally define a vectorised method alongside __call__:
+
+        def __call_batch__(self, **kwargs) -> dict
+
+    It is passed a numpy array for each input variable with one entry per sweep point, and must
+    return a dictionary with an array for each result variable with one entry per point.  When it
+    is defined, Bench evaluates the sweep in blocks of points with a single call per block instead
+    of calling __call__ for every point.
+    """
 
     @staticmethod
     def param_hash(param_type: Parameterized, hash_value: bool = True) -> int:
@@ -1,9 +1,100 @@
-from typing import List, Tuple, Any
+from typing import Iterator, List, Tuple, Any
 from dataclasses import dataclass, field
-from .utils import hash_sha1
+import hashlib
+import numpy as np
+from .utils import hash_sha1, update_hash, HASH_PREFIX
 from bencher.utils import hmap_canonical_input
 
 
+def hash_fragment(name: str, value: Any) -> bytes:
+    """Get the digest of a single named input of a job.
+
+    Args:
+        name (str): The name of the input
+        value (Any): The value of the input
+
+    Returns:
+        bytes: A 20 byte digest
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    update_hash(hasher, (name, value))
+    return hasher.digest()
+
+
+class JobKeys:
+    """Derives the cache keys of the points of a sweep from per-coordinate digests.
+
+    The key of a point is the hash of the digests of each of its (name, value) inputs, ordered by
+    name, followed by the digest of the tag.  The digest of each coordinate of each dimension is
+    calculated the first time it is seen and reused for every other point that shares it, and the
+    digests of the constant inputs and the tag are calculated once, so making the key of a point
+    only joins a few digests and hashes them once.  The keys are the same as those calculated from
+    the complete inputs by key_of().
+
+    Attributes:
+        dims_name (List[str]): The names of the swept dimensions
+        constant_inputs (dict): The inputs that are the same for every point
+        tag (str): The tag of the sweep
+    """
+
+    def __init__(self, dims_name: List[str], constant_inputs: dict = None, tag: str = "") -> None:
+        self.dims_name = list(dims_name)
+        self.constant_inputs = {} if constant_inputs is None else constant_inputs
+        self.tag = tag
+        self.tag_fragment = hash_fragment("", tag)
+        self.dim_fragments = [{} for _ in self.dims_name]
+
+        # each slot of the key is either the digest of a constant or the position of a dimension.  Constants override dimensions with the same name, as they do in WorkerJob.function_input
+        names = sorted(set(self.dims_name) | set(self.constant_inputs))
+        self.slots = [
+            hash_fragment(n, self.constant_inputs[n])
+            if n in self.constant_inputs
+            else self.dims_name.index(n)
+            for n in names
+        ]
+        # the order the dimensions are in when sorted by name, used for canonical_input
+        self.canonical_order = sorted(range(len(self.dims_name)), key=lambda i: self.dims_name[i])
+
+    def key(self, index_tuple: Tuple[int, ...], function_input_vars: List[Any]) -> str:
+        """Get the cache key of a point of the sweep.
+
+        Args:
+            index_tuple (Tuple[int, ...]): The index of the point in each dimension
+            function_input_vars (List[Any]): The value of the point in each dimension
+
+        Returns:
+            str: The cache key of the point
+        """
+        parts = []
+        for slot in self.slots:
+            if isinstance(slot, bytes):
+                parts.append(slot)
+            else:
+                fragments = self.dim_fragments[slot]
+                fragment = fragments.get(index_tuple[slot])
+                if fragment is None:
+                    fragment = hash_fragment(self.dims_name[slot], function_input_vars[slot])
+                    fragments[index_tuple[slot]] = fragment
+                parts.append(fragment)
+        parts.append(self.tag_fragment)
+        return HASH_PREFIX + hashlib.blake2b(b"".join(parts), digest_size=20).hexdigest()
+
+    @staticmethod
+    def key_of(function_input: dict, tag: str = "") -> str:
+        """Get the cache key of a job from its complete inputs, without reusing any digests.
+
+        Args:
+            function_input (dict): The inputs of the job
+            tag (str, optional): The tag of the sweep. Defaults to "".
+
+        Returns:
+            str: The cache key of the job
+        """
+        parts = [hash_fragment(k, v) for k, v in sorted(function_input.items())]
+        parts.append(hash_fragment("", tag))
+        return HASH_PREFIX + hashlib.blake2b(b"".join(parts), digest_size=20).hexdigest()
+
+
 @dataclass
 class WorkerJob:
     """Represents a benchmark worker job with input variables and caching information.
@@ -21,9 +112,7 @@ class WorkerJob:
         tag (str): Tag for grouping related jobs
         function_input (dict): Complete input as a dictionary with dimension names as keys
         canonical_input (Tuple[Any]): Canonical representation of inputs for caching
-        fn_inputs_sorted (List[Tuple[str, Any]]): Sorted representation of function inputs
         function_input_signature_pure (str): Hash of the function inputs and tag
-        function_input_signature_benchmark_context (str): Comprehensive hash including benchmark context
         found_in_cache (bool): Whether this job result was found in cache
         msgs (List[str]): Messages related to this job's execution
     """
@@ -37,31 +126,153 @@ class WorkerJob:
 
     function_input: dict = None
     canonical_input: Tuple[Any] = None
-    fn_inputs_sorted: List[Tuple[str, Any]] = None
     function_input_signature_pure: str = None
-    function_input_signature_benchmark_context: str = None
     found_in_cache: bool = False
     msgs: List[str] = field(default_factory=list)
 
-    def setup_hashes(self) -> None:
+    @property
+    def fn_inputs_sorted(self) -> List[Tuple[str, Any]]:
+        """The function inputs as (name, value) pairs sorted by name"""
+        return sorted(self.function_input.items())
+
+    @property
+    def function_input_signature_benchmark_context(self) -> str:
+        """The hash of the function inputs, tag and the benchmark configuration without repeats"""
+        return hash_sha1((self.function_input_signature_pure, self.bench_cfg_sample_hash))
+
+    def setup_hashes(self, job_keys: JobKeys = None, key: str = None) -> None:
         """Set up the function inputs and calculate hash signatures for caching.
 
         This method prepares the function inputs by combining function input variables
         with dimensions and constant inputs. It also calculates hash signatures used
         for caching results and tracking job execution.
+
+        Args:
+            job_keys (JobKeys, optional): Shared by all the jobs of a sweep to reuse the digests
+                of their inputs. If None, the key is calculated from the complete inputs.
+                Defaults to None.
+            key (str, optional): The key of the job if it has already been calculated by
+                job_keys. Defaults to None.
         """
         self.function_input = dict(zip(self.dims_name, self.function_input_vars))
 
-        self.canonical_input = hmap_canonical_input(self.function_input)
+        if job_keys is None:
+            self.canonical_input = hmap_canonical_input(self.function_input)
+        else:
+            self.canonical_input = tuple(
+                self.function_input_vars[i] for i in job_keys.canonical_order
+            )
 
         if self.constant_inputs is not None:
             self.function_input = self.function_input | self.constant_inputs
 
         # store a tuple of the inputs as keys for a holomap
         # the signature is the hash of the inputs to to the function + meta variables such as repeat and time + the hash of the benchmark sweep as a whole (without the repeats hash)
-        self.fn_inputs_sorted = sorted(self.function_input.items())
-        self.function_input_signature_pure = hash_sha1((self.fn_inputs_sorted, self.tag))
+        if key is not None:
+            self.function_input_signature_pure = key
+        elif job_keys is None:
+            self.function_input_signature_pure = JobKeys.key_of(self.function_input, self.tag)
+        else:
+            self.function_input_signature_pure = job_keys.key(
+                self.index_tuple, self.function_input_vars
+            )
+
+
+class JobTable:
+    """A columnar table of all the points of a sweep.
+
+    Creating a WorkerJob for every point of a large sweep up front uses a lot of memory, so the
+    table stores the index of each point as a row of an int array, its cache key in a fixed width
+    bytes array and its progress in an array of status flags.  Row i is the i-th point of
+    product(*dim_ranges).  A WorkerJob is only created from a row by view() when the point is
+    dispatched.
+
+    Attributes:
+        dims_name (List[str]): The names of the dimensions
+        dim_ranges (List[List[Any]]): The values of each dimension
+        dims_size (Tuple[int, ...]): The number of values of each dimension
+        indices (np.ndarray): The index of each point in each dimension, shape (points, dims)
+        keys (np.ndarray): The cache key of each point, once setup_keys() has been called
+        status (np.ndarray): The status flag of each point
+    """
+
+    PENDING = 0
+    DISPATCHED = 1
+    DONE = 2
+
+    def __init__(self, dims_name: List[str], dim_ranges: List[List[Any]]) -> None:
+        self.dims_name = list(dims_name)
+        self.dim_ranges = [list(r) for r in dim_ranges]
+        self.dims_size = tuple(len(r) for r in self.dim_ranges)
+        points = int(np.prod(self.dims_size))
+        self.indices = np.stack(np.unravel_index(np.arange(points), self.dims_size), axis=1).astype(
+            np.int32
+        )
+        self.keys = None
+        self.status = np.full(points, JobTable.PENDING, dtype=np.uint8)
+        self.job_keys = None
+        self.constant_inputs = None
+        self.bench_cfg_sample_hash = None
+
+    def __len__(self) -> int:
+        return len(self.status)
 
-        self.function_input_signature_benchmark_context = hash_sha1(
-            (self.function_input_signature_pure, self.bench_cfg_sample_hash)
+    def __iter__(self) -> Iterator[Tuple[Tuple[int, ...], Tuple[Any, ...]]]:
+        """Iterate over the (index tuple, values) of each point, in the order of the rows"""
+        for row in range(len(self)):
+            index_tuple = self.index_tuple(row)
+            yield index_tuple, self.values(index_tuple)
+
+    def index_tuple(self, row: int) -> Tuple[int, ...]:
+        return tuple(self.indices[row].tolist())
+
+    def values(self, index_tuple: Tuple[int, ...]) -> Tuple[Any, ...]:
+        return tuple(r[i] for r, i in zip(self.dim_ranges, index_tuple))
+
+    def row(self, index_tuple: Tuple[int, ...]) -> int:
+        return int(np.ravel_multi_index(index_tuple, self.dims_size))
+
+    def setup_keys(
+        self, job_keys: JobKeys, constant_inputs: dict = None, bench_cfg_sample_hash: str = ""
+    ) -> None:
+        """Calculate the cache key of every point.
+
+        Args:
+            job_keys (JobKeys): Makes the keys of the points of this sweep
+            constant_inputs (dict, optional): The inputs that are the same for every point.
+                Defaults to None.
+            bench_cfg_sample_hash (str, optional): Hash of the benchmark configuration without
+                repeats, passed on to each WorkerJob. Defaults to "".
+        """
+        self.job_keys = job_keys
+        self.constant_inputs = constant_inputs
+        self.bench_cfg_sample_hash = bench_cfg_sample_hash
+        self.keys = np.empty(len(self), dtype=f"S{len(HASH_PREFIX) + 40}")
+        for row, (index_tuple, values) in enumerate(self):
+            self.keys[row] = job_keys.key(index_tuple, values).encode()
+
+    def view(self, row: int) -> WorkerJob:
+        """Create the WorkerJob of a point and mark it as dispatched.
+
+        Args:
+            row (int): The row of the point
+
+        Returns:
+            WorkerJob: The job of the point, with its inputs and key set up
+        """
+        index_tuple = self.index_tuple(row)
+        job = WorkerJob(
+            self.values(index_tuple),
+            index_tuple,
+            self.dims_name,
+            self.constant_inputs,
+            self.bench_cfg_sample_hash,
+            self.job_keys.tag,
         )
+        job.setup_hashes(self.job_keys, self.keys[row].decode())
+        self.status[row] = JobTable.DISPATCHED
+        return job
+
+    def mark_done(self, index_tuple: Tuple[int, ...]) -> None:
+        """Mark the point with an index tuple as having its result stored"""
+        self.status[self.row(index_tuple)] = JobTable.DONE
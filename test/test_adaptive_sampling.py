@@ -0,0 +1,113 @@
+import unittest
+
+import numpy as np
+
+import bencher as bch
+from bencher.adaptive_sampling import interval_scores
+
+
+class StepSweep(bch.ParametrizedSweep):
+    """A smooth step that is flat apart from a narrow region around x=0.3"""
+
+    x = bch.FloatSweep(default=0, bounds=[0, 1])
+    y = bch.FloatSweep(default=0, bounds=[0, 1], doc="does not change the result")
+
+    out = bch.ResultVar()
+
+    calls = 0
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        StepSweep.calls += 1
+        self.out = np.tanh((self.x - 0.3) * 40)
+        return super().__call__()
+
+
+def sweep_step(adaptive_samples: int = None, level: int = 0) -> tuple:
+    """Sweep StepSweep over x and measure the error of linearly interpolating the results
+
+    Args:
+        adaptive_samples (int): The sample budget of an adaptive sweep, or None for a uniform sweep
+        level (int): The level of a uniform sweep
+
+    Returns:
+        tuple: the number of worker calls and the largest interpolation error
+    """
+    StepSweep.calls = 0
+    run_cfg = bch.BenchRunCfg(
+        level=level,
+        adaptive_samples=adaptive_samples,
+        auto_plot=False,
+        print_bench_inputs=False,
+        print_bench_results=False,
+    )
+    res = (
+        StepSweep()
+        .to_bench(run_cfg)
+        .plot_sweep("test_adaptive_sampling", input_vars=["x"], plot_callbacks=False)
+    )
+    ds = res.ds.isel(repeat=0)
+    fine = np.linspace(0, 1, 2001)
+    error = np.abs(np.interp(fine, ds["x"].values, ds["out"].values) - np.tanh((fine - 0.3) * 40))
+    return StepSweep.calls, float(error.max())
+
+
+def benchmark_adaptive_sampling() -> dict:
+    """Compare the worker calls and interpolation error of uniform and adaptive sweeps
+
+    Returns:
+        dict: the (worker calls, max error) of uniform sweeps at levels 6 to 9 and of adaptive
+            sweeps with budgets of 17 and 33 samples
+    """
+    timings = {f"uniform_level_{level}": sweep_step(level=level) for level in range(6, 10)}
+    for samples in [17, 33]:
+        timings[f"adaptive_{samples}"] = sweep_step(adaptive_samples=samples)
+    return timings
+
+
+class TestAdaptiveSampling(unittest.TestCase):
+    def test_interval_scores(self):
+        scores = interval_scores(np.array([0.0, 0.0, 0.0, 1.0, 1.0]))
+        self.assertEqual(np.argmax(scores), 2)
+        self.assertEqual(scores[0], 0)
+        np.testing.assert_array_equal(interval_scores(np.ones((4, 3))), np.zeros(3))
+
+    def test_adaptive_sweep_needs_fewer_calls(self):
+        adaptive_calls, adaptive_error = sweep_step(adaptive_samples=17)
+        uniform_calls, uniform_error = sweep_step(level=7)
+        # each point is only calculated once even though the sweep runs in several steps
+        self.assertEqual(adaptive_calls, 17)
+        self.assertEqual(uniform_calls, 33)
+        self.assertLess(adaptive_error, uniform_error)
+
+    def test_flat_dimension_is_not_refined(self):
+        StepSweep.calls = 0
+        run_cfg = bch.BenchRunCfg(adaptive_samples=9, auto_plot=False)
+        bench = StepSweep().to_bench(run_cfg)
+        res = bench.plot_sweep("test_adaptive_flat", input_vars=["x", "y"])
+        self.assertEqual(res.ds.sizes["x"], 9)
+        self.assertEqual(res.ds.sizes["y"], 3)
+        self.assertEqual(StepSweep.calls, 9 * 3)
+        self.assertEqual(len(bench.results), 1)
+
+    def test_only_final_step_is_cached(self):
+        run_cfg = bch.BenchRunCfg(
+            adaptive_samples=9, cache_results=True, clear_cache=True, auto_plot=False
+        )
+        bench = StepSweep().to_bench(run_cfg)
+        res = bench.plot_sweep("test_adaptive_cached", input_vars=["x"], plot_callbacks=False)
+        self.assertEqual(bench.bench_cfg_hashes, [res.bench_cfg.hash_value])
+
+        # the final step is loaded without running the steps again
+        StepSweep.calls = 0
+        run_cfg.clear_cache = False
+        bench = StepSweep().to_bench(run_cfg)
+        cached = bench.plot_sweep("test_adaptive_cached", input_vars=["x"], plot_callbacks=False)
+        self.assertEqual(StepSweep.calls, 0)
+        self.assertEqual(bench.bench_cfg_hashes, [])
+        np.testing.assert_array_equal(cached.ds["x"].values, res.ds["x"].values)
+        np.testing.assert_array_equal(cached.ds["out"].values, res.ds["out"].values)
+
+
+if __name__ == "__main__":
+    print(benchmark_adaptive_sampling())
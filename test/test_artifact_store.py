@@ -0,0 +1,128 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from collections import Counter
+from uuid import uuid4
+
+import bencher as bch
+from bencher.artifact_store import ArtifactStore
+
+
+class FileSweep(bch.ParametrizedSweep):
+    """Writes a file whose contents only depend on x, so every repeat writes the same file"""
+
+    x = bch.IntSweep(default=0, bounds=[0, 2])
+
+    file = bch.ResultPath()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.file = bch.gen_path("test_artifact_store", suffix=".txt")
+        with open(self.file, "w", encoding="utf-8") as f:
+            f.write(f"x={self.x}")
+        return super().__call__()
+
+
+class StaticFileSweep(bch.ParametrizedSweep):
+    """Returns the same file that already exists on every call"""
+
+    x = bch.IntSweep(default=0, bounds=[0, 2])
+
+    file = bch.ResultPath()
+
+    path = None
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.file = StaticFileSweep.path
+        return super().__call__()
+
+
+class AsyncFileSweep(FileSweep):
+    """The same as FileSweep with an async worker"""
+
+    async def __call__(self, **kwargs):  # pylint: disable=invalid-overridden-method
+        await asyncio.sleep(0)
+        return FileSweep.__call__(self, **kwargs)
+
+
+def write_file(directory: str, contents: str) -> str:
+    path = os.path.join(directory, f"{uuid4()}.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(contents)
+    return path
+
+
+class TestArtifactStore(unittest.TestCase):
+    def test_identical_files_are_stored_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = ArtifactStore(os.path.join(directory, "artifacts"))
+            first = write_file(directory, "same")
+            stored = store.put(first)
+            self.assertFalse(os.path.exists(first))
+            self.assertEqual(store.put(write_file(directory, "same")), stored)
+            other = store.put(write_file(directory, "other"))
+            self.assertNotEqual(other, stored)
+            self.assertEqual(list(store.paths()), sorted([stored, other]))
+            self.assertEqual(store.put(stored), stored)
+
+            references = store.count_references([{"file": stored}, [stored, "unrelated"]])
+            self.assertEqual(references, Counter({stored: 2}))
+            self.assertEqual(store.collect(references), len("other"))
+            self.assertEqual(list(store.paths()), [stored])
+
+    def test_sweep_stores_repeats_once(self):
+        run_cfg = bch.BenchRunCfg(
+            repeats=3,
+            dedupe_artifacts=True,
+            cache_samples=True,
+            clear_sample_cache=True,
+            auto_plot=False,
+        )
+        bench = FileSweep().to_bench(run_cfg)
+        res = bench.plot_sweep("test_artifact_store", input_vars=["x"], plot_callbacks=False)
+        paths = res.ds["file"].values
+        self.assertEqual(len(set(paths.flat)), 3)
+        for repeat_paths in paths:
+            self.assertEqual(len(set(repeat_paths)), 1)
+
+        store = ArtifactStore()
+        orphan = store.put(
+            write_file(os.path.dirname(bch.gen_path("test_artifact_store")), str(uuid4()))
+        )
+        bench.collect_artifacts()
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(all(os.path.exists(path) for path in paths.flat))
+
+    def test_async_worker_stores_repeats_once(self):
+        for executor in [bch.Executors.SERIAL, bch.Executors.ASYNCIO]:
+            run_cfg = bch.BenchRunCfg(
+                repeats=3, dedupe_artifacts=True, executor=executor, auto_plot=False
+            )
+            res = (
+                AsyncFileSweep()
+                .to_bench(run_cfg)
+                .plot_sweep("test_artifact_store_async", input_vars=["x"], plot_callbacks=False)
+            )
+            paths = res.ds["file"].values
+            self.assertEqual(len(set(paths.flat)), 3)
+            self.assertTrue(all(path.startswith(ArtifactStore().directory) for path in paths.flat))
+
+    def test_files_outside_the_cache_are_left_in_place(self):
+        with tempfile.TemporaryDirectory() as directory:
+            StaticFileSweep.path = write_file(directory, "static")
+            self.assertEqual(ArtifactStore().put(StaticFileSweep.path), StaticFileSweep.path)
+
+            run_cfg = bch.BenchRunCfg(repeats=2, dedupe_artifacts=True, auto_plot=False)
+            res = (
+                StaticFileSweep()
+                .to_bench(run_cfg)
+                .plot_sweep("test_artifact_store_static", input_vars=["x"], plot_callbacks=False)
+            )
+            self.assertEqual(set(res.ds["file"].values.flat), {StaticFileSweep.path})
+            self.assertTrue(os.path.exists(StaticFileSweep.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
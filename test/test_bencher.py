@@ -14,6 +14,7 @@ from diskcache import Cache
 
 from bencher.example.benchmark_data import ExampleBenchCfgIn, ExampleBenchCfgOut, bench_function
 from bencher import Bench, BenchCfg, BenchRunCfg
+from bencher.bencher import WorkerKwargsFilter
 
 
 def get_hash_isolated_process() -> bytes:
@@ -122,6 +123,20 @@ class TestBencher(unittest.TestCase):
             cfg2.hash_persistent(include_repeats=True),
         )
 
+    def test_bench_cfg_hash_with_consts(self):
+        """the hash of a sweep with constant inputs still depends on the rest of the sweep"""
+        cfgs = [
+            BenchCfg(
+                input_vars=[ExampleBenchCfgIn.param.theta],
+                result_vars=[ExampleBenchCfgOut.param.out_sin],
+                const_vars=[(ExampleBenchCfgIn.param.noisy, True)],
+                repeats=repeats,
+            )
+            for repeats in [1, 2]
+        ]
+        self.assertNotEqual(cfgs[0].hash_persistent(True), cfgs[1].hash_persistent(True))
+        self.assertEqual(cfgs[0].hash_persistent(False), cfgs[1].hash_persistent(False))
+
     def test_bench_cfg_hash_isolated(self):
         """hash values only seem to not match if run in a separate process, so run the hash test in separate processes"""
         self.assertEqual(get_hash_isolated_process(), get_hash_isolated_process())
@@ -381,3 +396,24 @@ class TestBencher(unittest.TestCase):
                 result_vars=[ExampleBenchCfgOut.param.out_sin],
                 const_vars=[(ExampleBenchCfgIn.offset, 0.1)],  # forgot to use param here
             )
+
+    def test_worker_kwargs_filter(self) -> None:
+        table = list(range(1000))
+        received = []
+
+        def worker(**kwargs):
+            received.append(kwargs)
+            return {}
+
+        kwargs = dict(theta=0.5, table=table, repeat=1, over_time=None, time_event=None)
+        WorkerKwargsFilter(worker, BenchCfg())(**kwargs)
+        self.assertEqual(received[-1].keys(), {"theta", "table"})
+        self.assertIs(received[-1]["table"], table, "inputs are passed without a copy")
+        self.assertIn("repeat", kwargs, "the callers arguments are not modified")
+
+        WorkerKwargsFilter(worker, BenchCfg(pass_repeat=True))(**kwargs)
+        self.assertEqual(received[-1].keys(), {"theta", "table", "repeat"})
+
+        WorkerKwargsFilter(worker, BenchCfg(deepcopy_worker_inputs=True))(**kwargs)
+        self.assertEqual(received[-1]["table"], table)
+        self.assertIsNot(received[-1]["table"], table)
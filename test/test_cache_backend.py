@@ -0,0 +1,156 @@
+import unittest
+
+from diskcache import Cache
+
+import bencher as bch
+from bencher.cache_backend import MemoryCache, TieredCache, memory_cache, open_cache
+
+
+class Square(bch.ParametrizedSweep):
+    x = bch.IntSweep(default=0, bounds=[0, 4])
+
+    result = bch.ResultVar()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.result = self.x * self.x
+        return super().__call__()
+
+
+class TestCacheBackend(unittest.TestCase):
+    def test_memory_cache_max_items(self):
+        cache = MemoryCache(max_items=3)
+        for i in range(3):
+            cache.set(f"k{i}", i)
+        # reading k0 makes k1 the least recently used entry
+        self.assertEqual(cache["k0"], 0)
+        cache["k3"] = 3
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn("k1", cache)
+        self.assertEqual([cache.get(f"k{i}") for i in [0, 2, 3]], [0, 2, 3])
+        with self.assertRaises(KeyError):
+            cache["k1"]  # pylint: disable=pointless-statement
+
+    def test_memory_cache_size_limit(self):
+        cache = MemoryCache()
+        cache.set("a", bytes(1000))
+        entry_size = cache.volume()
+        cache.size_limit = 3 * entry_size
+        for k in "bcd":
+            cache.set(k, bytes(1000))
+        self.assertEqual(cache.volume(), 3 * entry_size)
+        self.assertNotIn("a", cache)
+
+    def test_memory_cache_copies_values(self):
+        cache = MemoryCache()
+        value = {"x": [1]}
+        cache.set("k", value)
+        value["x"].append(2)
+        self.assertEqual(cache.get("k"), {"x": [1]})
+
+    def test_memory_cache_evict_tag(self):
+        cache = MemoryCache()
+        cache.set("a", 1, tag="t1")
+        cache.set("b", 2, tag="t2")
+        with cache.transact():
+            self.assertEqual(cache.evict("t1"), 1)
+        self.assertEqual(list(cache.entries), ["b"])
+
+    def test_memory_cache_shared(self):
+        with open_cache("test_shared", bch.CacheBackends.MEMORY) as cache:
+            cache.clear()
+            cache["k"] = 1
+        with open_cache("test_shared", bch.CacheBackends.MEMORY, memory_max_items=5) as cache:
+            self.assertEqual(cache["k"], 1)
+            self.assertEqual(cache.max_items, 5)
+
+    def test_tiered_cache(self):
+        with Cache("cachedir/test_tiered", tag_index=True) as disk:
+            disk.clear()
+            disk.set("on_disk", 1, tag="t")
+
+        memory = memory_cache("test_tiered")
+        memory.clear()
+        with open_cache("test_tiered", bch.CacheBackends.TIERED, tag_index=True) as cache:
+            self.assertIsInstance(cache, TieredCache)
+            self.assertNotIn("on_disk", memory)
+            self.assertEqual(cache.get("on_disk"), 1)
+            # the value read from disk has been copied into memory along with its tag
+            self.assertIn("on_disk", memory)
+
+            cache.set("both", 2, tag="t")
+            self.assertEqual(memory.get("both"), 2)
+            self.assertEqual(cache.evict("t"), 2)
+            self.assertEqual(len(memory), 0)
+            self.assertEqual(len(cache), 0)
+
+    def test_tiered_cache_prefetch(self):
+        with open_cache("test_prefetch", tag_index=True) as disk:
+            disk.clear()
+            disk.set("a", 1, tag="t1")
+            disk.set("b", 2, tag="t2")
+        # opening without asking for a tag index keeps the one the cache has
+        with open_cache("test_prefetch") as disk:
+            self.assertTrue(disk.tag_index)
+
+        memory = memory_cache("test_prefetch")
+        memory.clear()
+        with open_cache("test_prefetch", bch.CacheBackends.TIERED) as cache:
+            self.assertEqual(cache.tagged_keys("t1"), ["a"])
+            self.assertEqual(cache.prefetch(cache.tagged_keys("t1"), tag="t1"), 1)
+            self.assertEqual(list(memory.entries), ["a"])
+            self.assertEqual(cache.prefetch(["a", "b", "missing"]), 1)
+            self.assertEqual(memory.get("b"), 2)
+            cache.clear()
+
+    def test_bench_warmup(self):
+        run_cfg = bch.BenchRunCfg(
+            cache_backend=bch.CacheBackends.TIERED,
+            cache_samples=True,
+            cache_results=True,
+            auto_plot=False,
+        )
+        bench = bch.Bench("test_bench_warmup", Square(), run_cfg=run_cfg)
+        results = {}
+        for level in [2, 3]:
+            run_cfg.level = level
+            results[level] = bench.plot_sweep(
+                input_vars=["x"], tag="test_bench_warmup", run_cfg=run_cfg, plot_callbacks=False
+            )
+
+        bench_cfg, run_cfg = bench.sweep_cfg(
+            input_vars=["x"], tag="test_bench_warmup", run_cfg=run_cfg
+        )
+        for name in ["sample_cache", "benchmark_inputs"]:
+            memory_cache(name).clear()
+        loaded = sum(f.result() for f in bench.warmup(bench_cfg=bench_cfg, levels=[2, 3]))
+        # a result for each level, and the 3 samples of level 3 which include the 2 of level 2
+        self.assertEqual(loaded, 5)
+        for res in results.values():
+            self.assertIn(res.bench_cfg.hash_value, memory_cache("benchmark_inputs"))
+
+        memory_cache("sample_cache").clear()
+        loaded = sum(f.result() for f in bench.warmup(tag="test_bench_warmup"))
+        self.assertGreaterEqual(loaded, 3)
+
+        run_cfg.level = 3
+        res = bench.plot_sweep(
+            input_vars=["x"], tag="test_bench_warmup", run_cfg=run_cfg, plot_callbacks=False
+        )
+        self.assertTrue(res.ds.equals(results[3].ds))
+
+    def test_bench_memory_backend(self):
+        run_cfg = bch.BenchRunCfg(
+            cache_backend=bch.CacheBackends.MEMORY, cache_results=True, auto_plot=False
+        )
+        bench = bch.Bench("test_bench_memory_backend", Square(), run_cfg=run_cfg)
+        res = bench.plot_sweep(input_vars=["x"], plot_callbacks=False)
+
+        with bench.open_cache("benchmark_inputs", run_cfg) as cache:
+            self.assertIsInstance(cache, MemoryCache)
+            self.assertEqual(cache["test_bench_memory_backend"], [res.bench_cfg.hash_value])
+            self.assertTrue(cache[res.bench_cfg.hash_value].ds.equals(res.ds))
+
+
+if __name__ == "__main__":
+    unittest.main()
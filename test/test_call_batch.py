@@ -0,0 +1,93 @@
+import threading
+import unittest
+import numpy as np
+import bencher as bch
+
+
+class PointSweep(bch.ParametrizedSweep):
+    x = bch.FloatSweep(default=0, bounds=[0, 1], samples=7)
+    offset = bch.IntSweep(default=0, bounds=[0, 2])
+
+    out = bch.ResultVar()
+    out_vec = bch.ResultVec(2)
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.batch_sizes = []
+        self.point_calls = 0
+        self.batch_threads = []
+
+    def __call__(self, **kwargs):
+        self.point_calls += 1
+        self.update_params_from_kwargs(**kwargs)
+        self.out = self.x**2 + self.offset
+        self.out_vec = [self.x, -self.x]
+        return super().__call__()
+
+
+class VectorisedSweep(PointSweep):
+    def __call_batch__(self, x, offset):
+        self.batch_sizes.append(len(x))
+        self.batch_threads.append(threading.get_ident())
+        return {"out": x**2 + offset, "out_vec": np.stack([x, -x], axis=1)}
+
+
+class TestCallBatch(unittest.TestCase):
+    def run_sweep(self, worker, run_cfg, tag):
+        return worker.to_bench(run_cfg).plot_sweep(
+            input_vars=["x", "offset"], tag=tag, plot_callbacks=False
+        )
+
+    def test_call_batch_matches_call(self):
+        run_cfg = bch.BenchRunCfg(call_batch_size=8, auto_plot=False)
+        worker = VectorisedSweep()
+        res_batch = self.run_sweep(worker, run_cfg, "call_batch")
+        self.assertEqual(worker.point_calls, 0)
+        self.assertEqual(worker.batch_sizes, [8, 8, 5])
+
+        # a class without __call_batch__ produces the same dataset one point at a time
+        point_worker = PointSweep()
+        res_point = self.run_sweep(point_worker, run_cfg, "call_batch")
+        self.assertEqual(point_worker.point_calls, 21)
+        for var in ["out", "out_vec_x", "out_vec_y"]:
+            np.testing.assert_allclose(res_batch.ds[var].values, res_point.ds[var].values)
+
+    def test_call_batch_sample_cache(self):
+        run_cfg = bch.BenchRunCfg(cache_samples=True, auto_plot=False)
+        worker = VectorisedSweep()
+        bench = worker.to_bench(run_cfg)
+        bench.clear_tag_from_sample_cache("call_batch_cache", run_cfg)
+
+        res = bench.plot_sweep(input_vars=["x", "offset"], tag="call_batch_cache")
+        self.assertEqual(bench.sample_cache.worker_fn_call_count, 21)
+        self.assertEqual(worker.batch_sizes, [21])
+
+        # every point was cached individually so a sweep over a subset is served from the cache
+        bench.clear_call_counts()
+        res_sub = bench.plot_sweep(
+            input_vars=["x"], const_vars=dict(offset=2), tag="call_batch_cache"
+        )
+        self.assertEqual(bench.sample_cache.worker_cache_call_count, 7)
+        self.assertEqual(bench.sample_cache.worker_fn_call_count, 0)
+        np.testing.assert_allclose(
+            res_sub.ds["out"].values.flatten(),
+            res.ds["out"].sel(offset=2).values.flatten(),
+        )
+
+    def test_call_batch_uses_executor(self):
+        run_cfg = bch.BenchRunCfg(
+            executor=bch.Executors.THREADS, cache_samples=True, auto_plot=False
+        )
+        worker = VectorisedSweep()
+        bench = worker.to_bench(run_cfg)
+        bench.clear_tag_from_sample_cache("call_batch_executor", run_cfg)
+        res = bench.plot_sweep(
+            input_vars=["x", "offset"], tag="call_batch_executor", plot_callbacks=False
+        )
+        self.assertEqual(worker.batch_sizes, [21])
+        self.assertNotIn(threading.get_ident(), worker.batch_threads)
+        self.assertEqual(bench.sample_cache.worker_fn_call_count, 21)
+        self.assertEqual(bench.sample_cache.worker_cache_call_count, 0)
+
+        res_serial = self.run_sweep(VectorisedSweep(), bch.BenchRunCfg(auto_plot=False), "serial")
+        np.testing.assert_allclose(res.ds["out"].values, res_serial.ds["out"].values)
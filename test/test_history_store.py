@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+import bencher as bch
+from bencher.cache_backend import MemoryCache
+from bencher.history_store import HistoryResult, HistoryStore
+from bencher.result_store import StoredDataset, dataset_path
+
+
+class LineSweep(bch.ParametrizedSweep):
+    x = bch.FloatSweep(default=0, bounds=[0, 1], samples=50)
+
+    out = bch.ResultVar()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.out = self.x * 2
+        return super().__call__()
+
+
+def run_slice(run: int) -> xr.Dataset:
+    return xr.Dataset(
+        {"out": (("x", "over_time"), np.full((3, 1), float(run)))},
+        coords={"x": [0.0, 0.5, 1.0], "over_time": [pd.Timestamp(2024, 1, 1 + run)]},
+    )
+
+
+class TestHistoryStore(unittest.TestCase):
+    def check_history(self, history: HistoryStore):
+        for run in range(4):
+            self.assertEqual(history.append("key", run_slice(run)), run)
+        self.assertEqual(history.runs("key"), [0, 1, 2, 3])
+        ds = history.load("key")
+        np.testing.assert_array_equal(ds["out"].values[0], [0.0, 1.0, 2.0, 3.0])
+        self.assertEqual(ds["over_time"].dtype, np.dtype("datetime64[ns]"))
+
+        history.append("key", run_slice(4), max_runs=2)
+        self.assertEqual(history.runs("key"), [3, 4])
+        np.testing.assert_array_equal(history.load("key")["out"].values[0], [3.0, 4.0])
+
+        history.clear("key")
+        self.assertEqual(history.runs("key"), [])
+        self.assertIsNone(history.load("key"))
+
+    def test_history_in_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.check_history(HistoryStore(MemoryCache(), directory))
+
+    def test_history_in_cache(self):
+        self.check_history(HistoryStore(MemoryCache(), use_files=False))
+
+    def test_single_dataset_history_is_kept(self):
+        cache = MemoryCache()
+        cache["key"] = xr.concat([run_slice(0), run_slice(1)], "over_time")
+        with tempfile.TemporaryDirectory() as directory:
+            history = HistoryStore(cache, directory)
+            history.append("key", run_slice(2))
+            self.assertEqual(history.runs("key"), [0, 1])
+            np.testing.assert_array_equal(history.load("key")["out"].values[0], [0.0, 1.0, 2.0])
+
+    def test_loaded_runs_are_not_opened_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            history = HistoryStore(MemoryCache(), directory)
+            for run in range(3):
+                history.append("key", run_slice(run))
+            history.load("key")
+            history.append("key", run_slice(3), max_runs=3)
+            with patch.object(
+                StoredDataset, "load", autospec=True, side_effect=StoredDataset.load
+            ) as load:
+                ds = history.load("key")
+            # only the partition of the new run is opened
+            self.assertEqual(load.call_count, 1)
+            np.testing.assert_array_equal(ds["out"].values[0], [1.0, 2.0, 3.0])
+
+            # a cleared history is not mixed up with the runs that were loaded before
+            history.clear("key")
+            history.append("key", run_slice(5))
+            np.testing.assert_array_equal(history.load("key")["out"].values[0], [5.0])
+
+    def test_bytes_written_per_run_are_flat(self):
+        run_cfg = bch.BenchRunCfg(over_time=True, clear_history=True, auto_plot=False)
+        bench = LineSweep().to_bench(run_cfg)
+        written = []
+        for run in range(5):
+            res = bench.plot_sweep(
+                "test_history_bytes",
+                input_vars=["x"],
+                time_src=datetime(2024, 1, 1 + run),
+                plot_callbacks=False,
+            )
+            run_cfg.clear_history = False
+            key = res.bench_cfg.hash_value
+            with bench.open_cache("history", run_cfg) as c:
+                partition = c[f"{key}/{HistoryStore(c).runs(key)[-1]}"]
+            written.append(os.path.getsize(dataset_path(key)) + os.path.getsize(partition.path))
+            self.assertEqual(res.ds.sizes["over_time"], run + 1)
+        self.assertEqual(len(set(written)), 1)
+
+        # the cached result is loaded with the whole history
+        with bench.open_cache("benchmark_inputs", run_cfg) as c:
+            record = c[key]
+        self.assertIsInstance(record, HistoryResult)
+        self.assertEqual(record.load().ds.sizes["over_time"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
+import asyncio
+import os
 import unittest
 import bencher as bch
 import random
-from bencher.job import JobFunctionCache
+from concurrent.futures import ThreadPoolExecutor
+from diskcache import Cache
+from bencher.job import ChunkSizer, FutureCache, Job, JobFunctionCache
 
 from hypothesis import given, strategies as st, settings
 
@@ -18,9 +22,112 @@ class CachedParamExample(bch.CachedParams):
         return self.get_results_values_as_dict()
 
 
+def square(x):
+    return {"result": x * x}
+
+
+class SquareSweep(bch.ParametrizedSweep):
+    x = bch.IntSweep(default=0, bounds=[0, 9])
+
+    result = bch.ResultVar()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.result = self.x * self.x
+        return super().__call__()
+
+
+class PidSweep(bch.ParametrizedSweep):
+    x = bch.IntSweep(default=0, bounds=[0, 3])
+
+    pid = bch.ResultVar()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.pid = os.getpid()
+        return super().__call__()
+
+
+async def async_square(x):
+    await asyncio.sleep(0.01)
+    return {"result": x * x}
+
+
+class AsyncSquareSweep(bch.ParametrizedSweep):
+    """An async worker that records how many calls were running at the same time"""
+
+    x = bch.IntSweep(default=0, bounds=[0, 11])
+
+    result = bch.ResultVar()
+
+    running = 0
+    max_running = 0
+
+    async def __call__(self, **kwargs):  # pylint: disable=invalid-overridden-method
+        self.update_params_from_kwargs(**kwargs)
+        cls = type(self)
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        await asyncio.sleep(0.05)
+        cls.running -= 1
+        # other calls have run while this one was sleeping, so check its inputs were not changed
+        self.result = self.x * self.x
+        return super().__call__()
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Records the largest number of futures that were pending at the same time"""
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.pending = 0
+        self.max_pending = 0
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted += 1
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        future = super().submit(fn, *args, **kwargs)
+        future.add_done_callback(self.on_done)
+        return future
+
+    def on_done(self, _):
+        self.pending -= 1
+
+
+class ResultOnlyFuture:
+    """A future that, like a SCOOP future, only offers result()"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+class ResultOnlyExecutor:
+    """Runs each task when it is submitted and returns a ResultOnlyFuture"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return ResultOnlyFuture(fn(*args, **kwargs))
+
+    def shutdown(self, wait=True):
+        pass
+
+
 class TestJob(unittest.TestCase):
     @settings(deadline=2000)  # Increased from 500ms to 2000ms
-    @given(st.sampled_from([bch.Executors.SERIAL, bch.Executors.MULTIPROCESSING]))
+    @given(
+        st.sampled_from(
+            [
+                bch.Executors.SERIAL,
+                bch.Executors.MULTIPROCESSING,
+                bch.Executors.THREADS,
+                bch.Executors.ASYNCIO,
+            ]
+        )
+    )
     def test_basic(self, executor):
         cp = CachedParamExample()  # clears cache by default
 
@@ -50,7 +157,16 @@ class TestJob(unittest.TestCase):
         self.assertNotEqual(res1["result"], res1cp3["result"])
 
     @settings(deadline=500)
-    @given(st.sampled_from([bch.Executors.SERIAL, bch.Executors.MULTIPROCESSING]))
+    @given(
+        st.sampled_from(
+            [
+                bch.Executors.SERIAL,
+                bch.Executors.MULTIPROCESSING,
+                bch.Executors.THREADS,
+                bch.Executors.ASYNCIO,
+            ]
+        )
+    )
     def test_overwrite(self, executor):
         cp = CachedParamExample()  # clears cache by default
 
@@ -81,8 +197,204 @@ class TestJob(unittest.TestCase):
 
         self.assertNotEqual(res1["result"], res3["result"], f"{res1}")
 
+    def test_submit_many_window(self):
+        executor = CountingExecutor()
+        fc = FutureCache(executor=bch.Executors.MULTIPROCESSING, cache_results=False)
+        fc.executor = executor
+
+        jobs = (Job(f"job {i}", square, {"x": i}) for i in range(50))
+        results = {jf.job.job_args["x"]: jf.result()["result"] for jf in fc.submit_many(jobs, 4)}
+        fc.close()
+
+        self.assertEqual(results, {i: i * i for i in range(50)})
+        self.assertLessEqual(executor.max_pending, 4)
+        self.assertEqual(fc.worker_fn_call_count, 50)
+
+    def test_submit_many_scoop_futures(self):
+        for chunk_size in [0, 1, 7]:
+            fc = FutureCache(executor=bch.Executors.SCOOP, cache_results=False)
+            fc.executor = ResultOnlyExecutor()
+            jobs = (Job(f"job {i}", square, {"x": i}) for i in range(20))
+            results = [
+                jf.result()["result"]
+                for jf in fc.submit_many(jobs, max_in_flight=4, chunk_size=chunk_size)
+            ]
+            # the futures are harvested in the order they were submitted
+            self.assertEqual(results, [i * i for i in range(20)])
+
+    def test_bench_max_in_flight(self):
+        run_cfg = bch.BenchRunCfg(executor=bch.Executors.MULTIPROCESSING, max_in_flight=3)
+        run_cfg.auto_plot = False
+        res = SquareSweep().to_bench(run_cfg).plot_sweep(input_vars=["x"], plot_callbacks=False)
+        self.assertEqual(list(res.ds["result"].values.flatten()), [x * x for x in range(10)])
+
+    def test_submit_many_chunks(self):
+        for chunk_size in [0, 1, 7]:
+            executor = CountingExecutor()
+            fc = FutureCache(executor=bch.Executors.MULTIPROCESSING, cache_results=False)
+            fc.executor = executor
+
+            jobs = (Job(f"job {i}", square, {"x": i}) for i in range(50))
+            results = {
+                jf.job.job_args["x"]: jf.result()["result"]
+                for jf in fc.submit_many(jobs, chunk_size=chunk_size)
+            }
+            fc.close()
+
+            self.assertEqual(results, {i: i * i for i in range(50)})
+            self.assertEqual(fc.worker_fn_call_count, 50)
+            if chunk_size == 7:
+                self.assertEqual(executor.submitted, 8)
+            if chunk_size == 0:
+                # the first job measures the latency, then the remaining jobs fit in one chunk
+                self.assertEqual(executor.submitted, 2)
+
+    def test_submit_many_bulk_lookup(self):
+        fc = FutureCache(
+            executor=bch.Executors.MULTIPROCESSING, overwrite=False, cache_name="test_bulk_lookup"
+        )
+        fc.clear_cache()
+        for i in range(40):
+            fc.cache.set(Job(f"job {i}", square, {"x": i}).job_key, {"result": i * i})
+        self.assertEqual(
+            fc.get_many([Job("", square, {"x": x}).job_key for x in [0, 39, 40]]),
+            {Job("", square, {"x": x}).job_key: {"result": x * x} for x in [0, 39]},
+        )
+
+        executor = CountingExecutor()
+        fc.executor = executor
+        fc.lookup_block_size = 16
+        jobs = (Job(f"job {i}", square, {"x": i}) for i in range(50))
+        results = {
+            jf.job.job_args["x"]: jf.result()["result"] for jf in fc.submit_many(jobs, chunk_size=7)
+        }
+        fc.close()
+
+        self.assertEqual(results, {i: i * i for i in range(50)})
+        self.assertEqual(fc.worker_wrapper_call_count, 50)
+        self.assertEqual(fc.worker_cache_call_count, 40)
+        self.assertEqual(fc.worker_fn_call_count, 10)
+        # only the misses are sent to the workers, in chunks of 7
+        self.assertEqual(executor.submitted, 2)
+
+    def test_write_buffer(self):
+        fc = FutureCache(overwrite=False, cache_name="test_write_buffer", write_batch_size=10)
+        fc.clear_cache()
+        jobs = [Job(f"job {i}", square, {"x": i}, tag="buffered") for i in range(25)]
+        for jf in fc.submit_many(jobs):
+            jf.result()
+
+        # two full batches have been written, the rest are waiting in the buffer
+        self.assertEqual(len(fc.cache), 20)
+        self.assertEqual(len(fc.write_buffer.pending), 5)
+        self.assertEqual(fc.get_many([jobs[-1].job_key]), {jobs[-1].job_key: {"result": 24 * 24}})
+
+        fc.clear_call_counts()
+        for jf in fc.submit_many(jobs):
+            jf.result()
+        self.assertEqual(fc.worker_cache_call_count, 25)
+
+        # buffered results are flushed before the tag is evicted so none of them survive
+        fc.clear_tag("buffered")
+        self.assertEqual(len(fc.cache), 0)
+        self.assertEqual(len(fc.write_buffer.pending), 0)
+
+        fc.submit(jobs[0]).result()
+        fc.close()
+        with Cache("cachedir/test_write_buffer") as cache:
+            self.assertEqual(cache[jobs[0].job_key], {"result": 0})
+
+    def test_chunk_sizer(self):
+        self.assertEqual(ChunkSizer(5).size(), 5)
+        sizer = ChunkSizer(0, target_task_time=0.1, max_chunk_size=50)
+        self.assertEqual(sizer.size(), 1)
+        sizer.record(0.01)
+        self.assertEqual(sizer.size(), 10)
+        sizer.record(0.01)
+        self.assertEqual(sizer.size(), 10)
+        sizer.record(0.0)
+        self.assertEqual(sizer.size(), 12)
+        sizer.record(1.0)
+        self.assertEqual(sizer.size(), 1)
+        sizer = ChunkSizer(0, max_chunk_size=50)
+        sizer.record(0)
+        self.assertEqual(sizer.size(), 50)
+
+    def test_bench_chunk_size(self):
+        run_cfg = bch.BenchRunCfg(executor=bch.Executors.MULTIPROCESSING, chunk_size=0)
+        run_cfg.auto_plot = False
+        res = SquareSweep().to_bench(run_cfg).plot_sweep(input_vars=["x"], plot_callbacks=False)
+        self.assertEqual(list(res.ds["result"].values.flatten()), [x * x for x in range(10)])
+
+    def test_executor_pool_persists(self):
+        run_cfg = bch.BenchRunCfg(executor=bch.Executors.MULTIPROCESSING, max_workers=1)
+        run_cfg.auto_plot = False
+        with bch.ExecutorPool() as pool:
+            bench = bch.Bench("test_pool", PidSweep(), run_cfg=run_cfg, executor_pool=pool)
+            self.assertIn(PidSweep.__module__, pool.modules)
+
+            pids = set()
+            for _ in range(2):
+                res = bench.plot_sweep(input_vars=["x"], plot_callbacks=False)
+                pids.update(res.ds["pid"].values.flatten())
+                self.assertIsNotNone(pool.executor)
+
+            # a single worker process served both sweeps
+            self.assertEqual(len(pids), 1)
+            self.assertNotIn(os.getpid(), pids)
+        self.assertIsNone(pool.executor)
+
+    def test_bench_runner_executor_pool(self):
+        run_cfg = bch.BenchRunCfg(executor=bch.Executors.MULTIPROCESSING, max_workers=1)
+        run_cfg.overwrite_sample_cache = True
+        run_cfg.auto_plot = False
+        bench_run = bch.BenchRunner("test_bench_runner_pool", PidSweep(), run_cfg=run_cfg)
+
+        results = bench_run.run(min_level=2, max_level=3)
+        pids = {p for res in results for p in res.ds["pid"].values.flatten()}
+        self.assertEqual(len(pids), 1)
+
+        bench_run.shutdown()
+        self.assertIsNone(bench_run.executor_pool.executor)
+
+    def test_bench_asyncio(self):
+        AsyncSquareSweep.max_running = 0
+        run_cfg = bch.BenchRunCfg(executor=bch.Executors.ASYNCIO, max_workers=4)
+        run_cfg.auto_plot = False
+        res = (
+            AsyncSquareSweep().to_bench(run_cfg).plot_sweep(input_vars=["x"], plot_callbacks=False)
+        )
+        self.assertEqual(list(res.ds["result"].values.flatten()), [x * x for x in range(12)])
+        # the calls overlapped up to the worker limit instead of running one at a time
+        self.assertEqual(AsyncSquareSweep.max_running, 4)
+
+    def test_bench_async_worker_serial(self):
+        AsyncSquareSweep.max_running = 0
+        run_cfg = bch.BenchRunCfg(auto_plot=False)
+        res = (
+            AsyncSquareSweep().to_bench(run_cfg).plot_sweep(input_vars=["x"], plot_callbacks=False)
+        )
+        self.assertEqual(list(res.ds["result"].values.flatten()), [x * x for x in range(12)])
+        self.assertEqual(AsyncSquareSweep.max_running, 1)
+
+    def test_asyncio_sample_cache(self):
+        fc = FutureCache(executor=bch.Executors.ASYNCIO, overwrite=False, cache_name="test_async")
+        fc.clear_cache()
+        for _ in range(2):
+            jobs = (Job(f"job {i}", async_square, {"x": i}) for i in range(20))
+            results = {jf.job.job_args["x"]: jf.result()["result"] for jf in fc.submit_many(jobs)}
+            self.assertEqual(results, {i: i * i for i in range(20)})
+        fc.close()
+
+        self.assertEqual(fc.worker_fn_call_count, 20)
+        self.assertEqual(fc.worker_cache_call_count, 20)
+
     @settings(deadline=2000)  # Increased from 1000ms to 2000ms
-    @given(st.sampled_from([bch.Executors.SERIAL, bch.Executors.MULTIPROCESSING]))
+    @given(
+        st.sampled_from(
+            [bch.Executors.SERIAL, bch.Executors.MULTIPROCESSING, bch.Executors.THREADS]
+        )
+    )
     def test_bench_runner_parallel(self, executor):
         run_cfg = bch.BenchRunCfg()
         run_cfg.overwrite_sample_cache = True
@@ -0,0 +1,92 @@
+import unittest
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+import xarray as xr
+
+import bencher as bch
+from bencher.bencher import set_xarray_multidim
+
+
+class ManyDimSweep(bch.ParametrizedSweep):
+    """A sweep with more input dimensions than set_xarray_multidim supported"""
+
+    d0 = bch.BoolSweep()
+    d1 = bch.BoolSweep()
+    d2 = bch.BoolSweep()
+    d3 = bch.BoolSweep()
+    d4 = bch.BoolSweep()
+    d5 = bch.BoolSweep()
+    d6 = bch.BoolSweep()
+    d7 = bch.BoolSweep()
+    d8 = bch.BoolSweep()
+    d9 = bch.BoolSweep()
+
+    bits = bch.ResultVar()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.bits = sum(getattr(self, f"d{i}") << i for i in range(10))
+        return super().__call__()
+
+
+def benchmark_result_writes(shape: tuple = (10, 10, 10, 10, 10)) -> dict:
+    """Time storing one value per point of a sweep via xarray and via a numpy buffer
+
+    Args:
+        shape (tuple): The number of samples in each dimension of the sweep
+
+    Returns:
+        dict: the time in seconds taken by each path and the arrays they produced
+    """
+    dims = [f"d{i}" for i in range(len(shape))]
+    index_tuples = list(product(*[range(s) for s in shape]))
+    values = np.random.default_rng(0).random(len(index_tuples))
+
+    data_array = xr.DataArray(np.full(shape, np.nan), dims=dims)
+    start = perf_counter()
+    for index_tuple, value in zip(index_tuples, values):
+        set_xarray_multidim(data_array, index_tuple, value)
+    xarray_time = perf_counter() - start
+
+    buffer = np.full(shape, np.nan)
+    start = perf_counter()
+    for index_tuple, value in zip(index_tuples, values):
+        buffer[index_tuple] = value
+    buffer_time = perf_counter() - start
+
+    return dict(
+        xarray_time=xarray_time,
+        buffer_time=buffer_time,
+        xarray_values=data_array.values,
+        buffer_values=buffer,
+    )
+
+
+class TestResultBuffers(unittest.TestCase):
+    def test_sweep_beyond_nine_dims(self):
+        bench = ManyDimSweep().to_bench(bch.BenchRunCfg(auto_plot=False))
+        res = bench.plot_sweep(input_vars=[f"d{i}" for i in range(10)], plot_callbacks=False)
+        ds = res.ds.isel(repeat=0)
+        self.assertEqual(ds["bits"].ndim, 10)
+        self.assertEqual(int(ds["bits"].count()), 2**10)
+
+        for index_tuple in [(0,) * 10, (1,) * 10, (1, 0, 1, 0, 1, 0, 1, 0, 1, 0)]:
+            # bool coordinates are converted to strings when the result is set up for plotting
+            point = [ds[f"d{i}"].values[j] == "True" for i, j in enumerate(index_tuple)]
+            expected = sum(v << i for i, v in enumerate(point))
+            self.assertEqual(ds["bits"].values[index_tuple], expected)
+
+    def test_buffer_writes_match_xarray(self):
+        timings = benchmark_result_writes((4, 5, 6, 7))
+        np.testing.assert_array_equal(timings["buffer_values"], timings["xarray_values"])
+        self.assertLess(timings["buffer_time"], timings["xarray_time"])
+
+
+if __name__ == "__main__":
+    # storing 10^5 points, which takes several seconds through xarray
+    bench_timings = benchmark_result_writes()
+    print(
+        f"xarray: {bench_timings['xarray_time']:.3f}s numpy buffer: {bench_timings['buffer_time']:.3f}s"
+    )
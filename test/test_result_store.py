@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import xarray as xr
+
+import bencher as bch
+from bencher.example.benchmark_data import ExampleBenchCfgIn, ExampleBenchCfgOut, bench_function
+from bencher.result_store import StoredResult, dataset_path, save_dataset
+
+
+def in_memory(data_array: xr.DataArray) -> bool:
+    return data_array.variable._in_memory  # pylint: disable=protected-access
+
+
+class TestResultStore(unittest.TestCase):
+    def test_save_dataset(self):
+        ds = xr.Dataset(
+            {"out": (("x", "repeat"), np.arange(6, dtype=np.float64).reshape(3, 2))},
+            coords={"x": ["a", "b", "c"], "repeat": np.array([1, 2], dtype=np.int64)},
+        )
+        ds["out"].attrs["units"] = "m"
+        ds.coords["x"].attrs["description"] = None  # not storable in NetCDF
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = dataset_path("key", directory)
+            self.assertTrue(save_dataset(ds, path))
+            self.assertIsNone(ds.coords["x"].attrs["description"], "the dataset is not modified")
+
+            loaded = StoredResult(None, path, ds)
+            loaded.bench_res = bch.BenchResult(bch.BenchCfg())
+            res = loaded.load()
+            self.assertFalse(in_memory(res.ds["out"]), "data is read lazily")
+            xr.testing.assert_identical(res.ds, ds)
+            self.assertEqual(res.ds["repeat"].dtype, np.int64)
+            res.ds.close()
+
+            os.remove(path)
+            self.assertIsNone(loaded.load())
+
+            objects = xr.Dataset({"out": ("x", np.array([object(), object()]))})
+            self.assertFalse(save_dataset(objects, path))
+            self.assertFalse(os.path.exists(path))
+
+            # times further apart than the range of 32 bit microseconds are stored without overflow
+            times = np.array(
+                ["2024-01-01T00:00:00.000001", "2024-01-02T10:00:00"], "datetime64[ns]"
+            )
+            history = xr.Dataset({"out": ("over_time", [1.0, 2.0])}, coords={"over_time": times})
+            history["time"] = ("over_time", times)
+            self.assertTrue(save_dataset(history, path))
+            loaded = StoredResult(bch.BenchResult(bch.BenchCfg()), path, history).load()
+            np.testing.assert_array_equal(loaded.ds["over_time"].values, times)
+            np.testing.assert_allclose(
+                loaded.ds["time"].values.astype(np.int64), times.astype(np.int64), rtol=1e-12
+            )
+            loaded.ds.close()
+
+    def test_cached_result_loads_lazily(self):
+        bench = bch.Bench("test_result_store", bench_function, ExampleBenchCfgIn)
+        for over_time in [False, True]:
+            kwargs = dict(
+                title="test_result_store",
+                input_vars=[ExampleBenchCfgIn.param.theta, ExampleBenchCfgIn.param.noisy],
+                result_vars=[ExampleBenchCfgOut.param.out_sin],
+            )
+            run_cfg = dict(over_time=over_time, cache_results=True, auto_plot=False)
+            res = bench.plot_sweep(**kwargs, run_cfg=bch.BenchRunCfg(clear_cache=True, **run_cfg))
+            calls = bench.sample_cache.worker_wrapper_call_count
+
+            cached = bench.plot_sweep(**kwargs, run_cfg=bch.BenchRunCfg(**run_cfg))
+            self.assertEqual(bench.sample_cache.worker_wrapper_call_count, calls)
+            # the history of an over_time result is concatenated from the partition of each run
+            if not over_time:
+                self.assertFalse(in_memory(cached.ds["out_sin"]))
+            xr.testing.assert_equal(cached.ds["out_sin"], res.ds["out_sin"])
+
+
+if __name__ == "__main__":
+    unittest.main()
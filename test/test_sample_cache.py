@@ -1,9 +1,26 @@
 import unittest
+import time
 import bencher as bch
 from bencher.example.example_sample_cache import UnreliableClass
 from bencher.example.example_sample_cache_context import example_cache_context
 
 
+class SlowSum(bch.ParametrizedSweep):
+    a = bch.IntSweep(default=0, bounds=[0, 4])
+    b = bch.IntSweep(default=0, bounds=[0, 3])
+
+    total = bch.ResultVar()
+    product = bch.ResultVar()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        # give other threads a chance to update their copy of the params while this call is in progress
+        time.sleep(0.001)
+        self.total = self.a + self.b
+        self.product = self.a * self.b
+        return super().__call__()
+
+
 class TestSampleCache(unittest.TestCase):
     def call_bencher(self, bencher, run_cfg):
         bencher.plot_sweep(
@@ -24,8 +41,14 @@ class TestSampleCache(unittest.TestCase):
         self.sample_cache()
         self.sample_cache()
 
-    def sample_cache(self):
+    def test_sample_cache_backends(self):
+        for cache_backend in [bch.CacheBackends.MEMORY, bch.CacheBackends.TIERED]:
+            self.sample_cache(cache_backend)
+            self.sample_cache(cache_backend)
+
+    def sample_cache(self, cache_backend=bch.CacheBackends.DISK):
         run_cfg = bch.BenchRunCfg()
+        run_cfg.cache_backend = cache_backend
         run_cfg.repeats = 1
         run_cfg.executor = bch.Executors.SERIAL  # THE ASSERTS WILL ONLY WORK IF RUN SERIALLY!!!
 
@@ -104,6 +127,28 @@ class TestSampleCache(unittest.TestCase):
         # all 8 previously calculated results already in the cache
         self.assertEqual(bencher.sample_cache.worker_cache_call_count, 8)
 
+    def test_sample_cache_threads(self):
+        run_cfg = bch.BenchRunCfg(executor=bch.Executors.THREADS, max_workers=4)
+        run_cfg.cache_samples = True
+        run_cfg.auto_plot = False
+
+        bench = SlowSum().to_bench(run_cfg)
+        bench.clear_tag_from_sample_cache("threads_tag", run_cfg)
+
+        for expected_fn_calls in [20, 0]:
+            bench.clear_call_counts()
+            res = bench.plot_sweep(input_vars=["a", "b"], tag="threads_tag", plot_callbacks=False)
+
+            self.assertEqual(bench.sample_cache.worker_wrapper_call_count, 20)
+            self.assertEqual(bench.sample_cache.worker_fn_call_count, expected_fn_calls)
+            self.assertEqual(bench.sample_cache.worker_cache_call_count, 20 - expected_fn_calls)
+
+            for a in range(5):
+                for b in range(4):
+                    point = res.ds.sel(a=a, b=b, repeat=1)
+                    self.assertEqual(point["total"], a + b)
+                    self.assertEqual(point["product"], a * b)
+
     def test_sample_cache_context(self):
         """The sample cache function needs to be run twice because the first run can pass when there is no cache, but will fail the second time when the cache exists"""
         example_cache_context()
@@ -0,0 +1,122 @@
+import unittest
+from uuid import uuid4
+
+import numpy as np
+
+import bencher as bch
+from bencher.sequential_repeats import REPEAT_COUNT, standard_error
+
+
+class NoisySweep(bch.ParametrizedSweep):
+    """A result whose noise is proportional to the noise input"""
+
+    noise = bch.FloatSweep(default=0, bounds=[0, 1], samples=3)
+
+    out = bch.ResultVar()
+
+    calls = 0
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        NoisySweep.calls += 1
+        self.out = 1 + self.noise * np.random.default_rng(NoisySweep.calls).normal()
+        return super().__call__()
+
+
+def sweep_noisy(repeats: int, repeats_tolerance: float = None) -> bch.BenchResult:
+    """Sweep NoisySweep over the noise input
+
+    Args:
+        repeats (int): The maximum number of repeats of each point
+        repeats_tolerance (float): The standard error at which points stop being repeated
+
+    Returns:
+        bch.BenchResult: the result of the sweep
+    """
+    NoisySweep.calls = 0
+    run_cfg = bch.BenchRunCfg(
+        repeats=repeats,
+        repeats_tolerance=repeats_tolerance,
+        auto_plot=False,
+        print_bench_inputs=False,
+        print_bench_results=False,
+    )
+    return (
+        NoisySweep()
+        .to_bench(run_cfg)
+        .plot_sweep("test_sequential_repeats", input_vars=["noise"], plot_callbacks=False)
+    )
+
+
+def benchmark_sequential_repeats(repeats: int = 50, tolerance: float = 0.1) -> dict:
+    """Compare the worker calls of fixed and early stopped repeats
+
+    Args:
+        repeats (int): The maximum number of repeats of each point
+        tolerance (float): The standard error at which points stop being repeated
+
+    Returns:
+        dict: the number of worker calls of each approach
+    """
+    timings = {}
+    sweep_noisy(repeats)
+    timings["fixed_calls"] = NoisySweep.calls
+    sweep_noisy(repeats, tolerance)
+    timings["sequential_calls"] = NoisySweep.calls
+    return timings
+
+
+class TestSequentialRepeats(unittest.TestCase):
+    def test_standard_error(self):
+        data = np.array([[1.0, 3.0, np.nan], [2.0, np.nan, np.nan]])
+        np.testing.assert_allclose(standard_error(data), [1.0, np.nan])
+
+    def test_stable_points_stop_early(self):
+        res = sweep_noisy(repeats=20, repeats_tolerance=0.1)
+        counts = res.ds[REPEAT_COUNT].values
+        # the point without noise stops after min_repeats, the noisiest point uses every repeat
+        self.assertEqual(counts[0], 3)
+        self.assertEqual(counts[-1], 20)
+        self.assertEqual(NoisySweep.calls, counts.sum())
+        self.assertEqual(int(res.ds["out"].count()), counts.sum())
+
+        reduced = res.to_dataset(bch.ReduceType.REDUCE)
+        self.assertNotIn("repeat", reduced["out"].dims)
+        self.assertNotIn(f"{REPEAT_COUNT}_std", reduced)
+        self.assertAlmostEqual(float(reduced["out"].values[0]), 1.0)
+        self.assertTrue(np.isfinite(reduced["out_std"].values).all())
+
+    def test_fixed_repeats_do_not_reuse_stopped_sweeps(self):
+        def run_cfg(repeats_tolerance: float = None) -> bch.BenchRunCfg:
+            return bch.BenchRunCfg(
+                repeats=10,
+                repeats_tolerance=repeats_tolerance,
+                cache_samples=True,
+                cache_results=True,
+                reuse_sweep_results=True,
+                auto_plot=False,
+            )
+
+        # a new tag so that no earlier run of the test is cached
+        kwargs = dict(input_vars=["noise"], tag=str(uuid4()), plot_callbacks=False)
+        bench = NoisySweep().to_bench()
+        NoisySweep.calls = 0
+        stopped = bench.plot_sweep("test_sequential_repeats", run_cfg=run_cfg(0.1), **kwargs)
+        ran = int(stopped.ds[REPEAT_COUNT].sum())
+        self.assertLess(ran, 3 * 10)
+
+        # only the repeats that were not run are dispatched, the others come from the sample cache
+        NoisySweep.calls = 0
+        res = bench.plot_sweep("test_sequential_repeats", run_cfg=run_cfg(), **kwargs)
+        self.assertEqual(NoisySweep.calls, 3 * 10 - ran)
+        self.assertEqual(int(res.ds["out"].count()), 3 * 10)
+        self.assertNotIn(REPEAT_COUNT, res.ds)
+
+    def test_repeats_are_fixed_by_default(self):
+        res = sweep_noisy(repeats=5)
+        self.assertEqual(NoisySweep.calls, 3 * 5)
+        self.assertNotIn(REPEAT_COUNT, res.ds)
+
+
+if __name__ == "__main__":
+    print(benchmark_sequential_repeats())
@@ -0,0 +1,92 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from diskcache import Cache
+
+from bencher.cache_backend import open_cache
+from bencher.storage_manager import StorageManager, main
+
+
+def write_file(path: str, size: int, last_used: float) -> str:
+    with open(path, "wb") as f:
+        f.write(b"0" * size)
+    os.utime(path, (last_used, last_used))
+    return path
+
+
+class TestStorageManager(unittest.TestCase):
+    def test_du_and_gc(self):
+        with tempfile.TemporaryDirectory() as directory, open_cache("test_storage_manager") as c:
+            c.clear()
+            old = write_file(os.path.join(directory, "old.png"), 1000, 1e9)
+            new = write_file(os.path.join(directory, "new.png"), 1000, 2e9)
+            unused = write_file(os.path.join(directory, "unused.png"), 500, 2e9)
+            c["old"] = {"image": old}
+            c["new"] = {"image": new, "value": 1.0}
+            manager = StorageManager(
+                cache_names=["test_storage_manager"], file_dirs=[directory], media_dirs=[]
+            )
+
+            usage = manager.du()
+            self.assertEqual(usage[directory], 2500)
+            self.assertEqual(usage["total"], c.volume() + 2500)
+
+            # only the file that is not referred to is deleted while the total is within the limit
+            self.assertEqual(manager.gc(), 500)
+            self.assertFalse(os.path.exists(unused))
+            self.assertTrue(os.path.exists(old))
+
+            # the least recently used file is evicted together with the entry that refers to it
+            self.assertEqual(manager.gc(size_limit=c.volume() + 1000), 1000)
+            self.assertFalse(os.path.exists(old))
+            self.assertNotIn("old", c)
+            self.assertTrue(os.path.exists(new))
+            self.assertIn("new", c)
+            c.clear()
+
+    def test_media_files_are_not_deleted(self):
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            tempfile.TemporaryDirectory() as media,
+            open_cache("test_storage_manager_media") as c,
+        ):
+            c.clear()
+            stored = write_file(os.path.join(directory, "stored.png"), 1000, 1e9)
+            image = write_file(os.path.join(media, "image.png"), 1000, 1e9)
+            c["stored"] = {"image": stored}
+            manager = StorageManager(
+                cache_names=["test_storage_manager_media"],
+                file_dirs=[directory],
+                media_dirs=[media],
+            )
+            self.assertEqual(manager.du()[media], 1000)
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(manager.gc(size_limit=0), 1000)
+            self.assertFalse(os.path.exists(stored))
+            self.assertTrue(os.path.exists(image))
+            c.clear()
+
+    def test_caches_keep_their_size_limit(self):
+        with open_cache("test_storage_manager_limit", size_limit=12345):
+            pass
+        StorageManager(int(1e6), cache_names=["test_storage_manager_limit"], file_dirs=[]).du()
+        with Cache("cachedir/test_storage_manager_limit") as c:
+            self.assertEqual(c.reset("size_limit"), 12345)
+
+    def test_finds_cached_params_caches(self):
+        with Cache("cachedir/test_storage_manager_params/sample_cache") as c:
+            c["key"] = 1
+        self.assertIn("test_storage_manager_params/sample_cache", StorageManager().cache_names)
+
+    def test_cli_du(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main(["cache", "du"])
+        self.assertIn("total", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
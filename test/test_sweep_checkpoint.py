@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+import bencher as bch
+from bencher.cache_backend import MemoryCache
+from bencher.job import CacheWriteBuffer
+from bencher.sweep_checkpoint import SweepCheckpoint
+from bencher.worker_job import JobTable
+
+
+class FlakySweep(bch.ParametrizedSweep):
+    """A sweep whose worker crashes after a number of calls"""
+
+    x = bch.IntSweep(default=0, bounds=[0, 3])
+    y = bch.IntSweep(default=0, bounds=[0, 4])
+
+    out = bch.ResultVar()
+
+    calls = 0
+    crash_after = None
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        if FlakySweep.crash_after is not None and FlakySweep.calls >= FlakySweep.crash_after:
+            raise RuntimeError("worker crashed")
+        FlakySweep.calls += 1
+        self.out = self.x * 10 + self.y
+        return super().__call__()
+
+
+class TestSweepCheckpoint(unittest.TestCase):
+    def run_sweep(self, checkpoint_interval=0):
+        bench = FlakySweep().to_bench(
+            bch.BenchRunCfg(
+                auto_plot=False,
+                cache_backend=bch.CacheBackends.MEMORY,
+                checkpoint_interval=checkpoint_interval,
+            )
+        )
+        return bench.plot_sweep(
+            "test_sweep_checkpoint", input_vars=["x", "y"], plot_callbacks=False
+        )
+
+    def test_resume_after_crash(self):
+        FlakySweep.calls = 0
+        FlakySweep.crash_after = 7
+        with self.assertRaises(RuntimeError):
+            self.run_sweep()
+
+        FlakySweep.crash_after = None
+        res = self.run_sweep()
+        self.assertEqual(FlakySweep.calls, 20, "only the missing points are run again")
+        expected = np.arange(4)[:, None] * 10 + np.arange(5)[None, :]
+        np.testing.assert_array_equal(res.ds["out"].isel(repeat=0).values, expected)
+
+        # the checkpoint is removed once the sweep completes so the next sweep runs every point
+        self.run_sweep()
+        self.assertEqual(FlakySweep.calls, 40)
+
+    def test_no_checkpoint(self):
+        FlakySweep.calls = 0
+        FlakySweep.crash_after = 7
+        with self.assertRaises(RuntimeError):
+            self.run_sweep(None)
+
+        FlakySweep.crash_after = None
+        self.run_sweep(None)
+        self.assertEqual(FlakySweep.calls, 27)
+
+    def test_checkpoint_flushes_buffered_samples(self):
+        cache = MemoryCache()
+        buffer = CacheWriteBuffer(cache, max_pending=100, max_delay=100)
+        buffer.set("sample", 1)
+        res = self.run_sweep(None)
+        checkpoint = SweepCheckpoint(MemoryCache(), "key", 0, buffer.flush)
+        checkpoint.save(res, JobTable(["x"], [[0]]))
+        # the samples of the points in the checkpoint are in the cache before it is saved
+        self.assertEqual(cache.get("sample"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
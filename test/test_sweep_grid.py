@@ -0,0 +1,226 @@
+import unittest
+from time import perf_counter
+from uuid import uuid4
+
+import numpy as np
+
+import bencher as bch
+from bencher.sweep_grid import ResultIndex, SweepGrid, match_coords
+
+
+class LevelSweep(bch.ParametrizedSweep):
+    """A two dimensional float sweep that counts how many times it is called"""
+
+    x = bch.FloatSweep(default=0, bounds=[0, 1])
+    y = bch.FloatSweep(default=0, bounds=[-1, 1])
+
+    out = bch.ResultVar()
+
+    calls = 0
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        LevelSweep.calls += 1
+        self.out = self.x * 10 + self.y
+        return super().__call__()
+
+
+def run_levels(min_level: int, max_level: int, reuse: bool) -> tuple:
+    """Sweep LevelSweep at each level from min_level to max_level on the same Bench
+
+    Args:
+        min_level (int): The first level
+        max_level (int): The last level
+        reuse (bool): Whether sweeps reuse the results of the previous level
+
+    Returns:
+        tuple: the Bench, the result of the last level and the time taken in seconds
+    """
+    bench = LevelSweep().to_bench()
+    start = perf_counter()
+    for level in range(min_level, max_level + 1):
+        run_cfg = bch.BenchRunCfg(
+            level=level,
+            cache_samples=True,
+            reuse_sweep_results=reuse,
+            auto_plot=False,
+            print_bench_inputs=False,
+            print_bench_results=False,
+        )
+        res = bench.plot_sweep(
+            "test_sweep_grid", input_vars=["x", "y"], run_cfg=run_cfg, plot_callbacks=False
+        )
+    return bench, res, perf_counter() - start
+
+
+def benchmark_level_refinement(min_level: int = 2, max_level: int = 7) -> dict:
+    """Time sweeping every level from min_level to max_level with and without reusing results
+
+    Args:
+        min_level (int): The first level
+        max_level (int): The last level
+
+    Returns:
+        dict: the time in seconds and the number of sample cache lookups of each approach
+    """
+    timings = {}
+    for reuse in [False, True]:
+        bench, _, duration = run_levels(min_level, max_level, reuse)
+        name = "reuse" if reuse else "resubmit"
+        timings[f"{name}_time"] = duration
+        timings[f"{name}_lookups"] = bench.sample_cache.worker_wrapper_call_count
+    return timings
+
+
+class SmallSweep(bch.ParametrizedSweep):
+    """A sweep of values too small to be told apart with an absolute tolerance"""
+
+    x = bch.FloatSweep(default=0, bounds=[0, 1e-8])
+
+    out = bch.ResultVar()
+
+    def __call__(self, **kwargs):
+        self.update_params_from_kwargs(**kwargs)
+        self.out = self.x * 1e9
+        return super().__call__()
+
+
+class TestSweepGrid(unittest.TestCase):
+    def test_match_coords(self):
+        coarse = np.linspace(0, 1, 5)
+        fine = np.linspace(0, 1, 9) * (1 + 1e-15)
+        np.testing.assert_array_equal(match_coords(coarse, fine), [0, -1, 1, -1, 2, -1, 3, -1, 4])
+        np.testing.assert_array_equal(match_coords(["a", "b"], ["b", "c", "a"]), [1, -1, 0])
+        np.testing.assert_array_equal(match_coords([1, 2], [1, 2, 3]), [0, 1, -1])
+        small = np.linspace(0, 1e-8, 3)
+        np.testing.assert_array_equal(
+            match_coords(small, np.linspace(0, 1e-8, 5)), [0, -1, 1, -1, 2]
+        )
+
+    def test_result_index_size_limit(self):
+        def grid(size: int) -> SweepGrid:
+            return SweepGrid(["x"], [list(range(size))], {"out": np.zeros(size)})
+
+        index = ResultIndex(size_limit=3 * 8 * 10)
+        for key in "abc":
+            index.add(key, grid(10))
+        self.assertEqual(index.nbytes(), 3 * 8 * 10)
+        # the oldest sweeps are dropped to make room for a new one
+        index.add("d", grid(20))
+        self.assertEqual(list(index.grids), ["c", "d"])
+        index.add("e", grid(100))
+        self.assertEqual(list(index.grids), ["e"])
+
+    def test_small_values_are_not_matched(self):
+        bench = SmallSweep().to_bench()
+        for level in [3, 4]:
+            run_cfg = bch.BenchRunCfg(level=level, reuse_sweep_results=True, auto_plot=False)
+            res = bench.plot_sweep(
+                "test_sweep_grid_small", input_vars=["x"], run_cfg=run_cfg, plot_callbacks=False
+            )
+        np.testing.assert_allclose(res.ds["out"].isel(repeat=0).values, [0, 2.5, 5, 7.5, 10])
+
+    def test_levels_only_dispatch_new_points(self):
+        bench, res, _ = run_levels(2, 4, reuse=True)
+        # the grid of each level contains the previous one, so every point is looked up once
+        self.assertEqual(bench.sample_cache.worker_wrapper_call_count, 5 * 5)
+
+        ds = res.ds.isel(repeat=0)
+        expected = ds["x"].values[:, None] * 10 + ds["y"].values[None, :]
+        np.testing.assert_allclose(ds["out"].transpose("x", "y").values, expected)
+
+        bench, _, _ = run_levels(2, 4, reuse=False)
+        self.assertEqual(bench.sample_cache.worker_wrapper_call_count, 2 * 2 + 3 * 3 + 5 * 5)
+
+    def test_more_repeats_only_dispatch_new_repeats(self):
+        def run_cfg(repeats: int, clear: bool = False) -> bch.BenchRunCfg:
+            # the result of each number of repeats is recalculated from the samples
+            return bch.BenchRunCfg(
+                level=3,
+                repeats=repeats,
+                clear_cache=True,
+                clear_sample_cache=clear,
+                cache_samples=True,
+                cache_results=True,
+                reuse_sweep_results=True,
+                auto_plot=False,
+            )
+
+        kwargs = dict(title="test_sweep_grid_repeats", input_vars=["x"], plot_callbacks=False)
+        bench = LevelSweep().to_bench()
+        bench.plot_sweep(**kwargs, run_cfg=run_cfg(2, clear=True))
+        bench.clear_call_counts()
+        res = bench.plot_sweep(**kwargs, run_cfg=run_cfg(4))
+        # only repeats 3 and 4 of each of the 3 points are looked up
+        self.assertEqual(bench.sample_cache.worker_wrapper_call_count, 3 * 2)
+        self.assertEqual(res.ds.sizes["repeat"], 4)
+        self.assertEqual(res.ds["out"].count(), 3 * 4)
+
+        # a new Bench finds the repeats of the cached result
+        bench = LevelSweep().to_bench()
+        res = bench.plot_sweep(**kwargs, run_cfg=run_cfg(5))
+        self.assertEqual(bench.sample_cache.worker_wrapper_call_count, 3)
+        self.assertEqual(res.ds["out"].count(), 3 * 5)
+
+    def test_subset_sweeps_are_sliced_from_earlier_sweeps(self):
+        bench, _, _ = run_levels(3, 3, reuse=True)
+        run_cfg = bch.BenchRunCfg(
+            level=3, cache_samples=True, reuse_sweep_results=True, auto_plot=False
+        )
+        bench.clear_call_counts()
+        # the points of the first sweep were all run
+        self.assertEqual(bench.result_index.misses, 3 * 3)
+        # y=0.0 is the default and y=1.0 a constant, both are values of y in the first sweep
+        for y in [None, 1.0]:
+            res = bench.plot_sweep(
+                "test_sweep_grid_subset",
+                input_vars=["x"],
+                const_vars=None if y is None else dict(y=y),
+                run_cfg=run_cfg,
+                plot_callbacks=False,
+            )
+            expected = res.ds["x"].values * 10 + (y or 0.0)
+            np.testing.assert_allclose(res.ds["out"].isel(repeat=0).values, expected)
+        self.assertEqual(bench.sample_cache.worker_wrapper_call_count, 0)
+        self.assertEqual(bench.result_index.hits, 3 + 3)
+
+        # y=0.5 was not swept, so the points have to be run
+        bench.plot_sweep(
+            "test_sweep_grid_subset",
+            input_vars=["x"],
+            const_vars=dict(y=0.5),
+            run_cfg=run_cfg,
+            plot_callbacks=False,
+        )
+        self.assertEqual(bench.sample_cache.worker_wrapper_call_count, 3)
+        self.assertEqual(bench.result_index.misses, 3 * 3 + 3)
+
+    def test_bench_runner_reuses_levels(self):
+        run_cfg = bch.BenchRunCfg(auto_plot=False)
+        self.assertTrue(bch.BenchRunner.setup_run_cfg(run_cfg).reuse_sweep_results)
+        runner = bch.BenchRunner("test_sweep_grid_runner", LevelSweep(), run_cfg=run_cfg)
+        results = runner.run(min_level=2, max_level=3)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[-1].ds["out"].count(), 9)
+        runner.shutdown()
+
+    def test_bench_runner_follows_run_cfg(self):
+        # a new tag so that the sample cache holds none of these points yet
+        run_cfg = bch.BenchRunCfg(auto_plot=False, run_tag=str(uuid4()))
+        runner = bch.BenchRunner("test_sweep_grid_runner_cfg", LevelSweep(), run_cfg=run_cfg)
+        runner.run(level=2, cache_results=False)
+        LevelSweep.calls = 0
+        # the sample cache of the second run stores its samples even though the first did not
+        runner.run(level=2, cache_results=True)
+        self.assertEqual(LevelSweep.calls, 2 * 2)
+        runner.shutdown()
+
+        LevelSweep.calls = 0
+        runner = bch.BenchRunner("test_sweep_grid_runner_cfg", LevelSweep(), run_cfg=run_cfg)
+        runner.run(level=2, cache_results=True)
+        self.assertEqual(LevelSweep.calls, 0)
+        runner.shutdown()
+
+
+if __name__ == "__main__":
+    print(benchmark_level_refinement())
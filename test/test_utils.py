@@ -10,8 +10,15 @@ from bencher.utils import (
     listify,
     tabs_in_markdown,
     mult_tuple,
+    hash_sha1,
+    encode_scalar,
+    encode_scalar_memo,
+    HASH_PREFIX,
+    MAX_MEMOISED_LEN,
 )
 from functools import partial
+from hashlib import blake2b
+import numpy as np
 import xarray as xr
 
 
@@ -88,6 +95,46 @@ class TestBencherUtils(unittest.TestCase):
         result = get_nearest_coords(ds, x=2.5, y=5.5)
         self.assertEqual(result, {"x": 3, "y": 6})
 
+    def test_hash_sha1(self):
+        self.assertTrue(hash_sha1(1).startswith(HASH_PREFIX))
+        self.assertEqual(hash_sha1([1, "a", 2.5]), hash_sha1([1, "a", 2.5]))
+        # values that have the same string representation are not the same value
+        self.assertEqual(len({hash_sha1(v) for v in [1, 1.0, True, "1", (1,), [1]]}), 6)
+        self.assertEqual(hash_sha1({"a": 1, "b": 2}), hash_sha1({"b": 2, "a": 1}))
+        self.assertEqual(hash_sha1({1, 2, 3}), hash_sha1({3, 2, 1}))
+        self.assertEqual(hash_sha1(np.float64(0.5)), hash_sha1(0.5))
+        # not limited to ASCII
+        self.assertNotEqual(hash_sha1("café"), hash_sha1("cafe"))
+
+    def test_hash_sha1_does_not_memoise_long_values(self):
+        encode_scalar_memo.cache_clear()
+        long_value = "x" * (MAX_MEMOISED_LEN + 1)
+        self.assertEqual(hash_sha1(long_value), hash_sha1(long_value))
+        self.assertNotEqual(hash_sha1(long_value), hash_sha1(long_value[:-1]))
+        self.assertEqual(encode_scalar_memo.cache_info().currsize, 1)
+
+    def test_hash_sha1_signed_zero(self):
+        encode_scalar_memo.cache_clear()
+        negative = hash_sha1(-0.0)
+        # the hash of 0.0 does not depend on -0.0 being hashed first
+        self.assertEqual(
+            hash_sha1(0.0), HASH_PREFIX + blake2b(encode_scalar(0.0), digest_size=20).hexdigest()
+        )
+        self.assertNotEqual(hash_sha1(0.0), negative)
+        self.assertEqual(hash_sha1(np.float64(-0.0)), negative)
+
+    def test_hash_sha1_arrays(self):
+        a = np.zeros(10000)
+        b = a.copy()
+        b[5000] = 1
+        # the repr of both arrays is truncated to the same string
+        self.assertEqual(str(a), str(b))
+        self.assertNotEqual(hash_sha1(a), hash_sha1(b))
+        self.assertEqual(hash_sha1(b), hash_sha1(b.copy()))
+        self.assertNotEqual(hash_sha1(a), hash_sha1(a.astype(np.float32)))
+        self.assertNotEqual(hash_sha1(a), hash_sha1(a.reshape(100, 100)))
+        self.assertEqual(hash_sha1(b[::2]), hash_sha1(np.ascontiguousarray(b[::2])))
+
     def test_capitalise_words(self):
         self.assertEqual("Camel Case", capitalise_words("camel case"))
 
@@ -0,0 +1,95 @@
+import unittest
+from itertools import product
+from time import perf_counter
+
+from bencher.utils import hash_sha1
+from bencher.worker_job import JobKeys, JobTable, WorkerJob
+
+
+def sweep_points(samples: int = 6, dims: int = 6):
+    dims_name = [f"d{i}" for i in range(dims)]
+    dim_ranges = [[i * 0.5 for i in range(samples)]] * dims
+    dim_ranges_index = [range(samples)] * dims
+    return dims_name, list(zip(product(*dim_ranges_index), product(*dim_ranges)))
+
+
+def benchmark_key_generation(samples: int = 6, dims: int = 6) -> dict:
+    """Measure the throughput of making the cache keys of every point of a sweep
+
+    Args:
+        samples (int): The number of samples in each dimension
+        dims (int): The number of dimensions
+
+    Returns:
+        dict: the keys made per second by hashing the complete inputs of each point, and by
+            combining the per coordinate digests of JobKeys
+    """
+    dims_name, points = sweep_points(samples, dims)
+    constant_inputs = {"const": 1}
+
+    start = perf_counter()
+    for _, function_input_vars in points:
+        function_input = dict(zip(dims_name, function_input_vars)) | constant_inputs
+        hash_sha1((sorted(function_input.items()), "tag"))
+    full_hash_time = perf_counter() - start
+
+    start = perf_counter()
+    job_keys = JobKeys(dims_name, constant_inputs, "tag")
+    for index_tuple, function_input_vars in points:
+        job_keys.key(index_tuple, function_input_vars)
+    fragment_time = perf_counter() - start
+
+    return dict(full_hash=len(points) / full_hash_time, fragments=len(points) / fragment_time)
+
+
+class TestWorkerJob(unittest.TestCase):
+    def test_job_keys_match_complete_inputs(self):
+        dims_name, points = sweep_points(3, 3)
+        constant_inputs = {"const": "a", "d1": 7}
+        job_keys = JobKeys(dims_name, constant_inputs, "tag")
+        keys = set()
+        for index_tuple, function_input_vars in points:
+            job = WorkerJob(function_input_vars, index_tuple, dims_name, constant_inputs, "", "tag")
+            job.setup_hashes(job_keys)
+            fast = (job.function_input_signature_pure, job.canonical_input)
+            job.setup_hashes()
+            self.assertEqual(fast, (job.function_input_signature_pure, job.canonical_input))
+            keys.add(fast[0])
+
+        # d1 is overridden by a constant so only d0 and d2 make the keys unique
+        self.assertEqual(len(keys), 9)
+        self.assertNotEqual(JobKeys.key_of({"a": 1}, "tag"), JobKeys.key_of({"a": 1}, "other_tag"))
+
+    def test_job_table(self):
+        dims_name = ["x", "y", "repeat"]
+        dim_ranges = [[0.0, 0.5, 1.0], ["a", "b"], [1, 2]]
+        table = JobTable(dims_name, dim_ranges)
+        self.assertEqual(len(table), 12)
+        self.assertEqual(table.indices.shape, (12, 3))
+        self.assertEqual(
+            list(table), list(zip(product(*[range(3), range(2), range(2)]), product(*dim_ranges)))
+        )
+
+        job_keys = JobKeys(dims_name, {"c": 1}, "tag")
+        table.setup_keys(job_keys, {"c": 1}, "sample_hash")
+        self.assertEqual(table.keys.dtype.itemsize, len(table.keys[0]))
+
+        job = table.view(7)
+        self.assertEqual(job.index_tuple, (1, 1, 1))
+        self.assertEqual(job.function_input, {"x": 0.5, "y": "b", "repeat": 2, "c": 1})
+        self.assertEqual(job.canonical_input, (2, 0.5, "b"))
+        self.assertEqual(
+            job.function_input_signature_pure, JobKeys.key_of(job.function_input, "tag")
+        )
+        self.assertEqual(table.status[7], JobTable.DISPATCHED)
+        table.mark_done(job.index_tuple)
+        self.assertEqual(table.status[7], JobTable.DONE)
+        self.assertEqual(int((table.status == JobTable.PENDING).sum()), 11)
+
+    def test_key_generation_throughput(self):
+        throughput = benchmark_key_generation(4, 4)
+        self.assertGreater(throughput["fragments"], throughput["full_hash"])
+
+
+if __name__ == "__main__":
+    print(benchmark_key_generation())